@@ -1,7 +1,12 @@
 from .figure import Figure
 from .subplot import Subplot
 from .subplot_time import SubplotTime
-from .csv_reader import CsvReader, matchCsv
+from .csv_reader import CsvReader, matchCsv, matchAnyCsv
 from .excel_reader import ExcelReader
-from .get_path import getFileList, PathList
+from .table_cache import TableCache
+from .read_cache import ReadCache, read_cache
+from .projection import requires
+from . import stream
+from .schema import Schema, schemas
+from .get_path import getFileList, iterFileList, PathList, listing_cache
 from .save_plot import actionSavePNG
@@ -0,0 +1,93 @@
+import io
+import os
+from typing import List, Optional, Tuple
+
+"""
+Byte ranges of csv files aligned to line breaks.
+
+The preamble of a file is the lines before the first data row,
+    which are header and skipped rows.
+A range of data rows is parsed with the preamble prepended,
+    so that the same options for pandas.read_csv can be used.
+
+Quoted fields may include line breaks,
+    so files with quote characters in the head are not split.
+"""
+
+# Size of the head of files scanned for quote characters.
+quote_probe_size = 1024 * 1024
+
+
+def preamble_lines(header=0, skiprows=None) -> Optional[int]:
+    """
+    Number of lines before the first data row.
+    None means that it can not be decided from the options.
+    """
+    if skiprows is None:
+        skiprows = 0
+    if type(skiprows) is not int:
+        return None
+    if header is None:
+        return skiprows
+    if type(header) is not int:
+        return None
+    return skiprows + header + 1
+
+
+def preamble_end(path: str, n_lines: int) -> int:
+    """
+    Byte offset of the first data row.
+    """
+    offset = 0
+    with open(path, "rb") as f:
+        for i in range(n_lines):
+            offset = offset + len(f.readline())
+    return offset
+
+
+def has_quote(path: str, start: int, quotechar: bytes, size: int=quote_probe_size) -> bool:
+    """
+    Whether the quote character appears in data rows of the head of file.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        return quotechar in f.read(size)
+
+
+def split_ranges(path: str, start: int, n_parts: int) -> List[Tuple[int, int]]:
+    """
+    Split bytes from start to the end of file into ranges
+        beginning at the head of lines.
+    """
+    size = os.path.getsize(path)
+    step = max((size - start) // max(n_parts, 1), 1)
+
+    bounds = [start]
+    with open(path, "rb") as f:
+        for i in range(1, n_parts):
+            position = max(start + step * i, bounds[-1])
+            if position >= size:
+                break
+            f.seek(position)
+            # Move to the head of the next line.
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def read_range(path: str, preamble: int, start: int, end: Optional[int]=None) -> io.BytesIO:
+    """
+    Bytes of the preamble and the range.
+    End is None means the end of file.
+    """
+    with open(path, "rb") as f:
+        head = f.read(preamble)
+        f.seek(start)
+        body = f.read() if end is None else f.read(max(end - start, 0))
+    return io.BytesIO(head + body)
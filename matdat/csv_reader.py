@@ -1,15 +1,234 @@
 import pandas as pd
 import chardet
 from chardet.universaldetector import UniversalDetector
+import bz2
+import codecs
+import csv
+import gzip
+import io
+import lzma
+import math
+import os
+import queue
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
+from typing import List, Union
 from func_helper import pip, tee, identity
 import func_helper.func_helper.iterator as it
 from IPython.display import display
 from tqdm import tqdm
 
 from .i_lazy_reader import ILazyReader
+from .time_index import TimeIndex
+from .byte_range import preamble_lines, preamble_end, split_ranges, read_range, has_quote
 
 matchCsv = r"\.[cC](sv|SV)$"
+# Csv files including compressed ones.
+matchAnyCsv = r"\.[cC](sv|SV)(\.(gz|bz2|xz|zst))?$"
+
+# Suffix of compressed file -> name of compression
+compressions = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd"
+}
+# Number of decompressed blocks read ahead.
+read_ahead_depth = 4
+
+# Size of the first block probed as UTF-8.
+probe_size = 64 * 1024
+# Size of blocks read from files.
+block_size = 1024 * 1024
+# Encoding used when bytes can not be decoded by the detected encoding.
+fallback_encoding = "shift-JIS"
+
+# Files smaller than this are not split into byte ranges.
+split_min_bytes = 64 * 1024 * 1024
+# Upper limit of size of a byte range.
+split_max_bytes = 256 * 1024 * 1024
+
+# path -> (inode, size, mtime, encoding)
+_encoding_cache = {}
+
+# Size of the head of file compared for detecting rotation.
+tail_head_size = 4096
+
+# Number of files remembered for tail reading.
+tail_max_entries = 16
+# Remembered chunks are concatenated when they exceed this number.
+tail_max_chunks = 32
+
+# (path, read option) -> state of tail reading, least recently used first
+_tail_cache = OrderedDict()
+_tail_lock = threading.Lock()
+
+
+class ReadAhead(io.RawIOBase):
+    """
+    Read blocks of a decompressing stream in a background thread.
+    Decompression overlaps with parsing in the main thread,
+        because zlib, bz2, lzma, and zstandard release GIL.
+    """
+
+    def __init__(self, stream, size: int=block_size, depth: int=read_ahead_depth):
+        self.stream = stream
+        self.queue = queue.Queue(maxsize=depth)
+        self.block = memoryview(b"")
+        self.eof = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.fill, args=(size,), daemon=True)
+        self.thread.start()
+
+    def fill(self, size: int):
+        try:
+            while not self.stopped.is_set():
+                block = self.stream.read(size)
+                self.put(block)
+                if not block:
+                    return
+        except Exception as e:
+            self.put(e)
+
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while len(self.block) == 0 and not self.eof:
+            item = self.queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if not item:
+                self.eof = True
+            else:
+                self.block = memoryview(item)
+        n = min(len(b), len(self.block))
+        b[:n] = self.block[:n]
+        self.block = self.block[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+            self.stream.close()
+        super().close()
+
+
+class FileRange(io.RawIOBase):
+    """
+    Bytes of the head followed by a range of the file.
+    The range is read from the file lazily.
+    """
+
+    def __init__(self, path: str, head: bytes, start: int, end: int):
+        self.head = memoryview(head)
+        self.file = open(path, "rb")
+        self.file.seek(start)
+        self.remaining = max(end - start, 0)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if len(self.head) > 0:
+            n = min(len(b), len(self.head))
+            b[:n] = self.head[:n]
+            self.head = self.head[n:]
+            return n
+        n = self.file.readinto(memoryview(b)[:min(len(b), self.remaining)])
+        self.remaining = self.remaining - n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self.file.close()
+        super().close()
+
+
+class Decoding(io.TextIOBase):
+    """
+    Text stream decoding blocks of a binary stream as they are read.
+    Every block is decoded before it is parsed.
+    When a block can not be decoded by the encoding,
+        the block and the following ones are decoded by the fallback encoding.
+    Text already parsed is never decoded again.
+    """
+
+    def __init__(self, stream, encoding: str, on_fallback=None, size: int=block_size):
+        self.stream = stream
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.fallen_back = codecs.lookup(encoding).name\
+            == codecs.lookup(fallback_encoding).name
+        self.on_fallback = on_fallback
+        self.size = size
+        self.text = ""
+        self.eof = False
+
+    def readable(self):
+        return True
+
+    def decode(self, block: bytes, final: bool) -> str:
+        pending = self.decoder.getstate()[0]
+        try:
+            return self.decoder.decode(block, final)
+        except UnicodeDecodeError:
+            if self.fallen_back:
+                raise
+        self.decoder = codecs.getincrementaldecoder(fallback_encoding)()
+        self.fallen_back = True
+        if self.on_fallback is not None:
+            self.on_fallback()
+        return self.decoder.decode(pending + block, final)
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        block = self.stream.read(self.size)
+        self.eof = not block
+        self.text = self.text + self.decode(block, self.eof)
+        return True
+
+    def take(self, n: int) -> str:
+        text = self.text[:n]
+        self.text = self.text[n:]
+        return text
+
+    def read(self, size=-1):
+        while (size is None or size < 0 or len(self.text) < size) and self.fill():
+            pass
+        return self.take(len(self.text) if size is None or size < 0 else size)
+
+    def readline(self, size=-1):
+        while "\n" not in self.text and self.fill():
+            pass
+        end = self.text.find("\n") + 1 or len(self.text)
+        return self.take(end if size is None or size < 0 else min(end, size))
+
+    def close(self):
+        if not self.closed:
+            self.stream.close()
+        super().close()
+
+
+def _parse_range(path: str, preamble: int, start: int, end: int, kwd: dict):
+    """
+    Parse a byte range of csv file in a worker process.
+    """
+    return CsvReader.readCsv(read_range(path, preamble, start, end), False, **kwd)
 
 
 class CsvReader(ILazyReader):
@@ -28,6 +247,12 @@ class CsvReader(ILazyReader):
 
     def __init__(self, path: str=None, header: int=0, verbose: bool=False):
         self.is_verbose = verbose
+        self.cache = None
+        self.schema = None
+        self.time_window = None
+        self.split_workers = 1
+        self.split_quoted = None
+        self.tail = False
         if path != None:
             self.setPath(path, header)
 
@@ -41,27 +266,133 @@ class CsvReader(ILazyReader):
         return self
 
     def detect_encoding(self, path: str, header: int):
-        with open(path, mode='rb') as f:
-            detector = UniversalDetector()
-            i = 0
-            lines = []
-            for line in f:
-                if (i >= header or detector.done):
-                    break
-                detector.feed(line)
-                lines.append(line)
-                i = i+1
-            detector.close()
-            encoding = detector.result['encoding'] if detector.result['encoding'] != None else "shift-JIS"
-
-            if self.is_verbose:
-                pip(
-                    enumerate,
-                    it.mapping(lambda t: (t[0], str(t[1], encoding=encoding))),
-                    list,
-                    display
-                )(lines)
+        """
+        Detect encoding of the file.
+
+        1. Return cached encoding if the file has not been modified
+               or data are only appended to the file.
+        2. Probe the first block as strict ASCII or UTF-8.
+        3. Otherwise, guess by chardet from the first {header} lines.
+
+        The encoding is validated while parsing,
+            by decoding blocks of the file before they are parsed.
+        From the first block which can not be decoded,
+            shift-JIS is used and remembered for the file.
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        compressed = CsvReader.compression(path) is not None
+        encoding = CsvReader.cached_encoding(
+            stat, _encoding_cache.get(key), compressed)
+
+        if encoding is None or self.is_verbose:
+            with CsvReader.openRaw(path) as f:
+                head = f.read(probe_size)
+            lines = head.splitlines(True)[:header]
+
+        if encoding is None:
+            encoding = CsvReader.probe_encoding(head)\
+                or CsvReader.guess_encoding(lines)
+        _encoding_cache[key] = (
+            stat.st_ino, stat.st_size, stat.st_mtime_ns, encoding)
+
+        if self.is_verbose:
+            pip(
+                enumerate,
+                it.mapping(lambda t: (t[0], str(
+                    t[1], encoding=encoding, errors="replace"))),
+                list,
+                display
+            )(lines)
+        return encoding
+
+    @staticmethod
+    def cached_encoding(stat, cached, compressed: bool=False):
+        if cached is None:
+            return None
+        inode, size, mtime, encoding = cached
+        if inode != stat.st_ino or stat.st_size < size:
+            return None
+        if (size, mtime) == (stat.st_size, stat.st_mtime_ns):
             return encoding
+        # Appended file
+        return None if compressed else encoding
+
+    @staticmethod
+    def fallback(path: str):
+        """
+        Remember that the file is decoded by the fallback encoding.
+        """
+        stat = os.stat(path)
+        _encoding_cache[os.path.abspath(path)] = (
+            stat.st_ino, stat.st_size, stat.st_mtime_ns, fallback_encoding)
+
+    @staticmethod
+    def probe_encoding(head: bytes):
+        """
+        Return "utf-8" or "utf-8-sig" when the bytes are valid UTF-8
+            (including ASCII), otherwise None.
+        The last character may be cut at the end of the block.
+        """
+        if head.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return None
+
+    @staticmethod
+    def guess_encoding(lines):
+        detector = UniversalDetector()
+        for line in lines:
+            if detector.done:
+                break
+            detector.feed(line)
+        detector.close()
+        return detector.result['encoding'] if detector.result['encoding'] != None else "shift-JIS"
+
+    @staticmethod
+    def compression(path: str):
+        """
+        Name of compression decided by suffix of the path, or None.
+        """
+        suffix = os.path.splitext(path)[1].lower()
+        return compressions.get(suffix, None)
+
+    @staticmethod
+    def openRaw(path: str):
+        """
+        Open the file as a binary stream.
+        Compressed files are decompressed while reading.
+        """
+        compression = CsvReader.compression(path)
+        if compression == "gzip":
+            return gzip.open(path, "rb")
+        elif compression == "bz2":
+            return bz2.open(path, "rb")
+        elif compression == "xz":
+            return lzma.open(path, "rb")
+        elif compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError(
+                    "zstandard package is required for reading .zst files.")
+            return zstandard.ZstdDecompressor().stream_reader(
+                open(path, "rb"), closefd=True)
+        else:
+            return open(path, "rb")
+
+    @staticmethod
+    def openSource(path: str):
+        """
+        Binary stream of the file passed to pandas.read_csv.
+        Compressed files are decompressed in a background thread.
+        """
+        if CsvReader.compression(path) is None:
+            return open(path, "rb")
+        return io.BufferedReader(ReadAhead(CsvReader.openRaw(path)), block_size)
 
     def read(self, header: int=0, **read_csv_kwd):
         """
@@ -91,31 +422,416 @@ class CsvReader(ILazyReader):
             "chunksize": 100000,
             **read_csv_kwd
         }
+        arg = self.schemaOption(arg)
 
-        if (re.search(r"\.csv$", self.path, re.IGNORECASE) != None):
-            self.reader = CsvReader.readCsv(
-                self.path, self.is_verbose, **arg)
+        if (re.search(r"\.csv(\.(gz|bz2|xz|zst))?$", self.path, re.IGNORECASE) != None):
+            def parse():
+                source, skipped = self.source(arg)
+                ranges = self.byteRanges(arg) if source is self.path else None
+                return self.applySchema(
+                    CsvReader.readRanges(
+                        self.path, *ranges, self.split_workers, arg)
+                    if ranges is not None
+                    else CsvReader.renumbered(
+                        CsvReader.readCsv(
+                            source, self.is_verbose,
+                            on_fallback=partial(CsvReader.fallback, self.path), **arg),
+                        skipped)
+                )
+
+            if self.tail and self.time_window is None and not self.isCompressed():
+                # Shallow copies, so that transformers do not modify
+                #   columns and index of the remembered chunks.
+                self.reader = [chunk.copy(deep=False)
+                               for chunk in self.readTail(arg)]
+            elif self.cache is None:
+                self.reader = parse()
+            else:
+                # Chunks are concatenated and cached as one table.
+                self.reader = [self.cache.load(
+                    self.path,
+                    self.cacheOption(
+                        {**arg, "time_window": self.time_window}),
+                    lambda: CsvReader.concat(parse())
+                )]
         else:
             raise SystemError("Invalid file type.")
         return self
 
     @staticmethod
-    def readCsv(path: str, verbose: bool, **kwd):
+    def chunks(reader):
+        return [reader] if type(reader) is pd.DataFrame else reader
+
+    def setSplit(self, workers: int, quoted: bool=None):
         """
-        Wrapper function for pandas.read_csv.
+        Parse a large file by splitting into byte ranges
+            with a process pool.
+
+        Parameters
+        ----------
+        workers: int
+            Number of processes.
+            1 means parsing without splitting.
+        quoted: bool, optional
+            Whether fields of the file are quoted.
+            Quoted fields may include line breaks,
+                so quoted files are parsed without splitting.
+            Default is None, which means that the head of the file
+                is scanned for the quote character.
+        """
+        self.split_workers = workers
+        self.split_quoted = quoted
+        return self
+
+    def byteRanges(self, arg: dict):
+        """
+        Preamble size and byte ranges of data rows.
+        None when the file should not be split.
+        """
+        if self.split_workers <= 1 or self.isCompressed():
+            return None
+        if any(arg.get(k, None) for k in ["nrows", "skipfooter", "iterator"]):
+            return None
+
+        size = os.path.getsize(self.path)
+        n_lines = preamble_lines(
+            arg.get("header", "infer"), arg.get("skiprows", None))
+        if size < split_min_bytes or n_lines is None:
+            return None
+
+        preamble = preamble_end(self.path, n_lines)
+        if self.isQuoted(arg, preamble):
+            return None
+        n_parts = max(
+            self.split_workers,
+            math.ceil((size - preamble) / split_max_bytes)
+        )
+        return (preamble, split_ranges(self.path, preamble, n_parts))
+
+    def isQuoted(self, arg: dict, preamble: int)->bool:
+        if arg.get("quoting", csv.QUOTE_MINIMAL) == csv.QUOTE_NONE:
+            return False
+        if self.split_quoted is not None:
+            return self.split_quoted
+        quotechar = arg.get("quotechar", '"')
+        try:
+            quote = quotechar.encode(arg.get("encoding", None) or "utf-8")
+        except (LookupError, UnicodeEncodeError):
+            return True
+        return has_quote(self.path, preamble, quote)
+
+    @staticmethod
+    def readRanges(path: str, preamble: int, ranges, workers: int, arg: dict):
         """
-        hasMultiByteChar = re.search(r"[^0-9a-zA-Z\._\-\s/\\]", path)
+        Parse byte ranges in parallel and return tables in order of ranges.
+        """
+        kwd = {k: v for k, v in arg.items() if k != "chunksize"}
+        starts = [r[0] for r in ranges]
+        ends = [r[1] for r in ranges]
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            dfs = list(executor.map(
+                _parse_range,
+                repeat(path), repeat(preamble), starts, ends, repeat(kwd)
+            ))
+
+        # Renumber default index as if parsed at once.
+        count = 0
+        for df in dfs:
+            if type(df.index) is pd.RangeIndex:
+                df.index = pd.RangeIndex(count, count + len(df))
+            count = count + len(df)
+        return dfs
+
+    def isCompressed(self)->bool:
+        """
+        Byte ranges, time index, and tail reading are not available
+            for compressed files.
+        """
+        return CsvReader.compression(self.path) is not None
+
+    def setTail(self, tail: bool):
+        """
+        Remember the parsed table and the byte offset of the end of it,
+            and parse only rows appended after the previous read.
+        The whole file is read again when the file is truncated
+            or replaced by another file.
+        Values of the read table must not be modified in place,
+            because they are shared with the remembered table.
+
+        Parameters
+        ----------
+        tail: bool
+        """
+        self.tail = tail
+        return self
+
+    def readTail(self, arg: dict) -> List[pd.DataFrame]:
+        """
+        Chunks of the table including rows appended after the previous read.
+        The first read parses the whole file.
+        In following reads, an incomplete last line is left for the next read,
+            until the size of the file does not change for one read.
+        """
+        kwd = {k: v for k, v in arg.items() if k != "chunksize"}
+        n_lines = preamble_lines(
+            kwd.get("header", "infer"), kwd.get("skiprows", None))
+        if n_lines is None or any(kwd.get(k, None) for k in ["nrows", "skipfooter", "iterator"]):
+            return [CsvReader.concat(self.parseBytes(self.path, kwd))]
+
+        key = (os.path.abspath(self.path), repr(sorted(kwd.items(), key=str)))
+        with _tail_lock:
+            state = _tail_cache.get(key)
+
+        stat = os.stat(self.path)
+        with open(self.path, "rb") as f:
+            preamble = b"".join(f.readline() for i in range(n_lines))
+            appended = CsvReader.isAppended(f, stat, state)
+            if appended:
+                start = state["offset"]
+                chunks = state["chunks"]
+            else:
+                start = len(preamble)
+                chunks = None
+            end = CsvReader.lineEnd(f, start, stat.st_size)
+            f.seek(end)
+            unterminated = f.read(stat.st_size - end)
+            f.seek(0)
+            head = f.read(min(end, tail_head_size))
 
-        engine = "python" if hasMultiByteChar else "c"
-        engine = kwd.pop("engine", engine)
+        def body():
+            return io.BufferedReader(
+                FileRange(self.path, preamble, start, end), block_size)
+
+        if chunks is None:
+            chunks = [CsvReader.concat(self.parseBytes(body(), kwd))]
+        elif end > start:
+            chunks = CsvReader.appendChunk(
+                chunks, CsvReader.concat(self.parseBytes(body(), kwd)))
+
+        # The last line without line break is regarded as complete
+        #   at the first read, or when the file has not grown
+        #   since the previous read.
+        if len(unterminated.strip()) > 0 and (not appended or state["size"] == stat.st_size):
+            last = [CsvReader.continued(chunks, CsvReader.concat(
+                self.parseBytes(preamble + unterminated, kwd)))]
+        else:
+            last = []
+
+        with _tail_lock:
+            _tail_cache[key] = {
+                "inode": stat.st_ino,
+                "size": stat.st_size,
+                "offset": end,
+                "head": head,
+                "chunks": chunks
+            }
+            _tail_cache.move_to_end(key)
+            while len(_tail_cache) > tail_max_entries:
+                _tail_cache.popitem(last=False)
+        return chunks + last
+
+    @staticmethod
+    def lineEnd(f, start: int, size: int) -> int:
+        """
+        Offset next to the last line break between start and size,
+            or start when there is no line break.
+        The file is scanned backward by blocks.
+        """
+        end = size
+        while end > start:
+            block_start = max(end - probe_size, start)
+            f.seek(block_start)
+            i = f.read(end - block_start).rfind(b"\n")
+            if i >= 0:
+                return block_start + i + 1
+            end = block_start
+        return start
+
+    def parseBytes(self, source: Union[str, bytes, io.IOBase], kwd: dict):
+        """
+        Chunks parsed from the path, the bytes, or the binary stream.
+        """
+        return self.applySchema(CsvReader.readCsv(
+            io.BytesIO(source) if type(source) is bytes else source,
+            self.is_verbose, on_fallback=partial(CsvReader.fallback, self.path), **kwd))
+
+    @staticmethod
+    def continued(chunks: List[pd.DataFrame], appended: pd.DataFrame)->pd.DataFrame:
+        """
+        Default index of appended rows continues from the last chunk.
+        """
+        last = chunks[-1]
+        if type(last.index) is pd.RangeIndex and type(appended.index) is pd.RangeIndex:
+            appended.index = pd.RangeIndex(
+                last.index.stop, last.index.stop + len(appended))
+        return appended
+
+    @staticmethod
+    def appendChunk(chunks: List[pd.DataFrame], appended: pd.DataFrame)->List[pd.DataFrame]:
+        """
+        New list of chunks with appended rows.
+        Chunks are concatenated only when they are too many,
+            so that the whole table is not copied at every read.
+        """
+        chunks = chunks + [CsvReader.continued(chunks, appended)]
+        if len(chunks) > tail_max_chunks:
+            return [pd.concat(chunks)]
+        return chunks
+
+    @staticmethod
+    def isAppended(f, stat, state)->bool:
+        """
+        Whether the file is the same one as the previous read
+            and only appended.
+        """
+        if state is None:
+            return False
+        if stat.st_ino != state["inode"] or stat.st_size < state["offset"]:
+            return False
+        f.seek(0)
+        return f.read(len(state["head"])) == state["head"]
+
+    @staticmethod
+    def clearTail():
+        """
+        Forget tables remembered for tail reading.
+        """
+        with _tail_lock:
+            _tail_cache.clear()
+
+    def setTimeWindow(self, columns, lower=None, upper=None):
+        """
+        Read only rows whose time is between lower and upper
+            by using sidecar time index of the file.
+        Rows out of the range may be included.
+
+        Parameters
+        ----------
+        columns: List[str]
+            Names of columns representing time.
+            Values of multiple columns are joined by a space.
+        lower, upper: optional
+            Bounds of time.
+            None means unbounded.
+        """
+        self.time_window = {
+            "columns": columns,
+            "lower": lower,
+            "upper": upper
+        }
+        return self
+
+    def source(self, arg: dict):
+        """
+        Path of the file, or bytes of rows in the time window,
+            and the number of data rows before them.
+        """
+        if self.time_window is None or self.isCompressed():
+            return (self.path, 0)
+
+        index = TimeIndex.load(
+            self.path,
+            self.time_window["columns"],
+            header=arg.get("header", 0),
+            skiprows=arg.get("skiprows", None),
+            encoding=arg["encoding"],
+            sep=arg.get("sep", arg.get("delimiter", ","))
+        )
+
+        if index is None:
+            return (self.path, 0)
+        return (
+            index.slice(
+                self.path,
+                self.time_window["lower"],
+                self.time_window["upper"]
+            ),
+            index.skipped_rows(self.time_window["lower"])
+        )
+
+    @staticmethod
+    def renumbered(reader, skipped: int):
+        """
+        Default index of rows continues from the skipped rows
+            as if the whole file is parsed.
+        """
+        if skipped == 0:
+            return reader
+
+        def shift(df):
+            if type(df.index) is pd.RangeIndex:
+                df.index = pd.RangeIndex(
+                    df.index.start + skipped, df.index.stop + skipped)
+            return df
+        return shift(reader) if type(reader) is pd.DataFrame else map(shift, reader)
+
+    @staticmethod
+    def readCsv(path, verbose: bool, on_fallback=None, **kwd):
+        """
+        Wrapper function for pandas.read_csv.
+
+        The file is opened here and the handle is passed to pandas.
+        Therefore, C engine can be used for paths
+            including multi byte characters.
+        Compressed files are decompressed while parsing.
+        Bytes are decoded by Decoding, and on_fallback is called
+            when the fallback encoding is used.
+        on_fallback must not refer to the reader, because the handle
+            is referred by the C parser out of sight of garbage collector,
+            and the reader would never be released.
+        """
+        engine = kwd.pop("engine", CsvReader.select_engine(kwd))
         if verbose:
             print("engine is:", engine)
             print("kwargs for pandas.read_csv:", kwd)
 
+        handle = CsvReader.openSource(path) if type(path) is str else path
+        encoding = kwd.pop("encoding", None)
+        if encoding is not None:
+            handle = Decoding(handle, encoding, on_fallback)
+        try:
+            reader = pd.read_csv(handle, engine=engine, **kwd)
+        except Exception:
+            handle.close()
+            raise
+
+        if type(reader) is pd.DataFrame:
+            handle.close()
+            return reader
+        return CsvReader.closing(reader, handle)
+
+    @staticmethod
+    def select_engine(kwd: dict)->str:
+        """
+        Use python engine only for options not supported by C engine.
+        """
+        sep = kwd.get("sep", kwd.get("delimiter", ","))
+        if sep is None:
+            return "python"
+        if len(sep) > 1 and sep != r"\s+":
+            return "python"
+        if kwd.get("skipfooter", 0) > 0:
+            return "python"
+        return "c"
+
+    @staticmethod
+    def closing(reader, handle):
+        """
+        Yield chunks and close the file after the last chunk.
+        """
         try:
-            return pd.read_csv(path, engine=engine, **kwd)
-        except:
-            return pd.read_csv(path, engine=engine,  **{**kwd, "encoding": "shift-JIS"})
+            for chunk in reader:
+                yield chunk
+        finally:
+            handle.close()
+
+    @staticmethod
+    def concat(reader):
+        if type(reader) is pd.DataFrame:
+            return reader
+        dfs = list(reader)
+        return dfs[0] if len(dfs) == 1 else pd.concat(dfs)
 
     def getColumns(self):
         display(self.df.columns)
@@ -148,12 +864,34 @@ class CsvReader(ILazyReader):
                 preprocessor(r) for r in _tqdm
             )
 
+        if self.schema is not None:
+            self.df = self.schema.finalize(self.df)
+
         self.indexRange = [
             self.df.index.min(),
             self.df.index.max()
         ]
         return self
 
+    def stream(self, *preprocesses):
+        """
+        Yield chunks preprocessed by some functions
+            without concatenating them.
+
+        Parameters
+        ----------
+        preprocesses: callable[[pandas.DataFrame], pandas.DataFrame]
+        """
+        preprocessor = pip(
+            *preprocesses) if len(preprocesses) > 0 else identity
+
+        reader = [self.reader] if type(
+            self.reader) is pd.DataFrame else self.reader
+        with tqdm(reader) as _tqdm:
+            _tqdm.set_postfix(path=self.path)
+            for r in _tqdm:
+                yield preprocessor(r)
+
     def assembleDataFrame(self, *preprocesses):
         print("Deplicated. Use assemble()")
         return self.assemble(*preprocesses)
@@ -7,6 +7,6 @@ class DataFrameLoader(IDataLoader):
     def __init__(self):
         pass
 
-    def read(self, data, meta={}, transformers=[identity]):
+    def read(self, data, meta={}, transformers=[identity], **read_hint):
         return pip(*transformers)(
             data)
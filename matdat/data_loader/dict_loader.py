@@ -12,6 +12,6 @@ class DictLoader(IDataLoader):
     def __init__(self):
         pass
 
-    def read(self, data, meta={}, transformers=[identity]):
+    def read(self, data, meta={}, transformers=[identity], **read_hint):
         return pip(*transformers)(
             pd.DataFrame(data))
@@ -1,3 +1,10 @@
 class IDataLoader:
-    def read(self, data, meta={}, transformers=[]):
+    def read(self, data, meta={}, transformers=[], **read_hint):
         pass
+
+    def stream(self, data, meta={}, transformers=[], **read_hint):
+        """
+        Generator of chunks of pandas.DataFrame.
+        Loaders without chunked reading yield whole data at once.
+        """
+        yield self.read(data, meta, transformers, **read_hint)
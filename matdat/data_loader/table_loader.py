@@ -2,7 +2,11 @@ from .i_data_loader import IDataLoader
 from ..csv_reader import CsvReader
 from ..excel_reader import ExcelReader
 from ..get_path import PathList
+from ..projection import project
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
 import pandas as pd
+import pickle
 import re
 
 ext = {
@@ -11,26 +15,171 @@ ext = {
 }
 
 
+def _open_table(path, meta={}, cache=None, split_workers=1, time_window=None, schema=None, tail=False):
+    reader = TableLoader.IReader(path)
+    reader.setCache(cache)
+    if tail:
+        reader.setTail(tail)
+    if split_workers > 1:
+        reader.setSplit(split_workers)
+    reader.setSchema(schema)
+    if time_window is not None:
+        reader.setTimeWindow(**time_window)
+    reader.setPath(path)
+    reader.read(**meta)
+    return reader
+
+
+def _load_table(path, meta={}, transformers=[], cache=None, split_workers=1, time_window=None, schema=None, tail=False):
+    """
+    Read one file and apply transformers.
+    Defined at module level so that it can be sent to worker processes.
+    """
+    reader = _open_table(path, meta, cache, split_workers,
+                         time_window, schema, tail)
+    reader.assemble(*transformers)
+    return reader.df
+
+
 class TableLoader(IDataLoader):
-    def __init__(self):
-        pass
+    """
+    Load csv and excel files into one pandas.DataFrame.
+
+    Example
+    -------
+    loader = TableLoader(max_workers=4)
+    df = loader.read(
+        getFileList(matchCsv)(directory),
+        meta={"header": 3},
+        transformers=[f, g]
+    )
 
-    def read(self, path_like, meta={}, transformers=[]):
+    Parameters
+    ----------
+    max_workers: int, optional
+        Number of files loaded concurrently.
+        Default is 1, which loads files one by one.
+    executor: str, optional
+        "thread" or "process".
+        Process pool is used only when meta and transformers are picklable,
+            otherwise thread pool is used.
+        Default is "thread".
+    cache: TableCache, optional
+        On-disk cache of parsed tables.
+        Default is None (not cached).
+    time_index: bool, optional
+        If True, sidecar time index of csv file is used
+            for reading only rows in the time window.
+        Default is False.
+    split_workers: int, optional
+        Number of processes parsing one large csv file
+            split into byte ranges.
+        Default is 1 (not split).
+    tail: bool, optional
+        If True, parsed tables of csv files are remembered,
+            and only rows appended to the files are parsed in the next read.
+        It is useful for files which loggers keep appending to.
+        Tables are remembered in the process, so that process executor
+            does not benefit from it.
+        Default is False.
+    """
+
+    def __init__(self, max_workers: int=1, executor: str="thread", cache=None, time_index: bool=False, split_workers: int=1, tail: bool=False):
+        self.max_workers = max_workers
+        self.executor = executor
+        self.cache = cache
+        self.time_index = time_index
+        self.split_workers = split_workers
+        self.tail = tail
+
+    def read(self, path_like, meta={}, transformers=[], columns=None, time_window=None, schema=None):
+        """
+        Parameters
+        ----------
+        path_like: str, list, tuple, PathList
+        meta: dict, optional
+            Options for pandas.read_csv or pandas.read_excel.
+        transformers: list, optional
+            Functions applied to loaded pandas.DataFrame.
+        columns: set, optional
+            Names of columns required.
+            When it is given, only these columns are parsed.
+            Default is None (all columns).
+        time_window: dict, optional
+            Dict of "columns", "lower", and "upper" of time.
+            It is used when time_index option of the loader is True.
+            Default is None (all rows).
+        schema: Schema, optional
+            Data types of columns applied in parsing.
+            Default is None.
+        """
+        dfs = self.readEach(path_like, meta, transformers,
+                            columns, time_window, schema)
+        return TableLoader.concat(dfs, schema)
+
+    def readEach(self, path_like, meta={}, transformers=[], columns=None, time_window=None, schema=None):
+        """
+        Same as read(), but tables of files are returned as list
+            without concatenating them.
+        """
         paths = TableLoader.toPathList(path_like)
+        meta = project(meta, columns)
 
-        dfs = []
-        for path in paths:
-            reader = TableLoader.IReader(path)
-            reader.setPath(path)
-            reader.read(**meta)
-            reader.assemble(*transformers)
-            dfs.append(reader.df)
+        load = partial(_load_table, meta=meta,
+                       transformers=transformers, cache=self.cache,
+                       split_workers=self.split_workers,
+                       time_window=time_window if self.time_index else None,
+                       schema=schema, tail=self.tail)
 
-        return pd.concat(dfs, sort=True) if len(dfs) > 0 else []
+        if self.max_workers > 1 and len(paths) > 1:
+            Executor = TableLoader.IExecutor(
+                self.executor, meta, transformers, self.cache, schema)
+            with Executor(max_workers=min(self.max_workers, len(paths))) as executor:
+                # executor.map keeps the order of paths.
+                return list(executor.map(load, paths))
+        else:
+            return list(map(load, paths))
+
+    @staticmethod
+    def concat(dfs, schema=None):
+        if len(dfs) == 0:
+            return []
+        df = pd.concat(dfs, sort=True)
+        return df if schema is None else schema.finalize(df)
+
+    def stream(self, path_like, meta={}, transformers=[], columns=None, time_window=None, schema=None):
+        """
+        Yield transformed chunks of files one by one.
+        Whole table is never concatenated.
+        """
+        meta = project(meta, columns)
+        for path in TableLoader.toPathList(path_like):
+            reader = _open_table(
+                path, meta, self.cache, self.split_workers,
+                time_window if self.time_index else None,
+                schema, self.tail)
+            yield from reader.stream(*transformers)
+
+    @staticmethod
+    def IExecutor(executor: str, *payload):
+        if executor == "process" and TableLoader.isPicklable(*payload):
+            return ProcessPoolExecutor
+        elif executor in ["thread", "process"]:
+            return ThreadPoolExecutor
+        else:
+            raise SystemError(f"Invalid executor: {executor}")
+
+    @staticmethod
+    def isPicklable(*objects):
+        try:
+            pickle.dumps(objects)
+            return True
+        except Exception:
+            return False
 
     @staticmethod
     def IReader(path):
-        if (re.search(r"\.csv$", path, re.IGNORECASE) != None):
+        if (re.search(r"\.csv(\.(gz|bz2|xz|zst))?$", path, re.IGNORECASE) != None):
             return CsvReader()
 
         elif (re.search(r"\.xlsx?$", path, re.IGNORECASE) != None):
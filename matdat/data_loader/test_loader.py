@@ -6,7 +6,7 @@ class TestLoader(IDataLoader):
     def __init__(self):
         pass
 
-    def read(self, data, meta={}, transformers=[]):
+    def read(self, data, meta={}, transformers=[], **read_hint):
         return pd.DataFrame({
             "x": [0, 0.5, 1],
             "y": [0, 0.5, 1]
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+"""
+Downsampling of series for plotting.
+
+Functions return sorted indices of points to be kept,
+    so that any columns of the original data can be taken by them.
+"""
+
+
+def as_numeric(values) -> np.ndarray:
+    """
+    Convert datetime-like values to int64 nanoseconds and others to float.
+    """
+    arr = values.values if isinstance(
+        values, (pd.Series, pd.Index)) else np.asarray(values)
+
+    if isinstance(arr, pd.api.extensions.ExtensionArray):
+        arr = np.asarray(arr)
+    if np.issubdtype(arr.dtype, np.datetime64) or np.issubdtype(arr.dtype, np.timedelta64):
+        arr = arr.view("int64").astype("float64")
+        arr[np.asarray(pd.isna(values))] = np.nan
+        return arr
+    return np.asarray(arr, dtype="float64")
+
+
+def numeric_range(lim) -> Optional[Tuple[float, float]]:
+    """
+    Range of x such as xlim in the same unit as as_numeric.
+    Missing bound is NaN.
+    None means that the range can not be converted.
+    """
+    if lim is None or len(lim) == 0:
+        return None
+    try:
+        values = [pd.Timestamp(v) if type(v) is str else v for v in list(lim)[:2]]
+        lo, hi = as_numeric(pd.Series(values + [None] * (2 - len(values))))
+    except (TypeError, ValueError):
+        return None
+    return (float(lo), float(hi))
+
+
+def bucket_of(x: np.ndarray, n_buckets: int, x_range: Optional[Tuple[float, float]]=None) -> np.ndarray:
+    """
+    Bucket number of each point divided equally by x value.
+    Points with NaN x have bucket -1.
+    When x_range is given, points in the range have buckets
+        from 1 to n_buckets, and points below and above the range
+        have bucket 0 and n_buckets + 1.
+    """
+    valid = ~np.isnan(x)
+    if x_range is None:
+        if not valid.any():
+            return np.full(len(x), -1, dtype="int64")
+        lo, hi = np.nanmin(x), np.nanmax(x)
+    else:
+        lo, hi = x_range
+
+    width = (hi - lo) / n_buckets if hi > lo else 1.
+    b = np.full(len(x), -1, dtype="int64")
+    position = (x[valid] - lo) / width
+    inside = np.clip(position.astype("int64"), 0, n_buckets - 1)
+    if x_range is None:
+        b[valid] = inside
+    else:
+        b[valid] = np.where(position < 0, 0,
+                            np.where(position > n_buckets, n_buckets + 1, inside + 1))
+    return b
+
+
+def minmax_indices(x, y, n_buckets: int, x_range: Optional[Tuple[float, float]]=None) -> np.ndarray:
+    """
+    Indices of the first, last, minimum, and maximum points
+        in each bucket of x.
+    Lines drawn by the points have the same envelope as the original
+        when a bucket is not wider than a pixel.
+
+    Parameters
+    ----------
+    x, y: array like
+        Values of the points.
+    n_buckets: int
+        Number of buckets, typically the width of axes in pixel.
+    x_range: tuple, optional
+        Range of x divided into buckets, such as xlim of axes.
+        Points out of the range are reduced in the same way
+            as two more buckets.
+        Default is the range of x.
+    """
+    _x = as_numeric(x)
+    _y = as_numeric(y)
+    n = len(_x)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    b = bucket_of(_x, n_buckets, x_range)
+    keep = b >= 0
+    if not keep.all():
+        index = np.flatnonzero(keep)
+        return index[minmax_indices(_x[keep], _y[keep], n_buckets, x_range)]
+
+    y_low = np.where(np.isnan(_y), np.inf, _y)
+    y_high = np.where(np.isnan(_y), -np.inf, _y)
+
+    if np.all(b[1:] >= b[:-1]):
+        # Monotonic x: buckets are contiguous runs.
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(b)) + 1])
+        ends = np.concatenate([starts[1:], [n]]) - 1
+        group = np.repeat(np.arange(len(starts)), np.diff(
+            np.concatenate([starts, [n]])))
+        low = np.minimum.reduceat(y_low, starts)
+        high = np.maximum.reduceat(y_high, starts)
+        argmin = starts + _first_in_group(y_low == low[group], group, starts)
+        argmax = starts + _first_in_group(y_high == high[group], group, starts)
+    else:
+        order = np.argsort(b, kind="stable")
+        sorted_b = b[order]
+        starts = np.concatenate(
+            [[0], np.flatnonzero(np.diff(sorted_b)) + 1])
+        ends = np.concatenate([starts[1:], [n]]) - 1
+        by_low = np.lexsort((y_low, b))
+        by_high = np.lexsort((-y_high, b))
+        argmin = by_low[starts]
+        argmax = by_high[starts]
+        starts, ends = order[starts], order[ends]
+
+    return np.unique(np.concatenate([starts, ends, argmin, argmax]))
+
+
+def _first_in_group(mask: np.ndarray, group: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Offset of the first True in each contiguous group.
+    """
+    hit = np.flatnonzero(mask)
+    groups, first = np.unique(group[hit], return_index=True)
+    offset = np.zeros(len(starts), dtype="int64")
+    offset[groups] = hit[first] - starts[groups]
+    return offset
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Indices of points selected by Largest-Triangle-Three-Buckets.
+    Points are divided into buckets of the same number of points,
+        and the point making the largest triangle with the selected
+        point of the previous bucket and the mean of the next bucket
+        is selected in each bucket.
+    The first and the last points are always kept.
+    Points with NaN are not selected, so that gaps of lines are closed.
+
+    Parameters
+    ----------
+    x, y: array like
+        Values of the points sorted by x.
+    n_out: int
+        Number of points to be kept, typically the width of axes in pixel.
+    """
+    _x = as_numeric(x)
+    _y = as_numeric(y)
+    valid = ~(np.isnan(_x) | np.isnan(_y))
+    index = np.flatnonzero(valid)
+    n = len(index)
+    if n <= max(n_out, 2) or n_out < 3:
+        return index
+
+    _x = _x[index]
+    _y = _y[index]
+
+    # Bounds of buckets except for the first and the last points.
+    bounds = np.linspace(1, n - 1, n_out - 1).astype("int64")
+    counts = np.diff(bounds)
+    means_x = np.add.reduceat(_x[1:n - 1], bounds[:-1] - 1) / counts
+    means_y = np.add.reduceat(_y[1:n - 1], bounds[:-1] - 1) / counts
+    # Mean of the next bucket is the last point for the last bucket.
+    next_x = np.append(means_x[1:], _x[-1])
+    next_y = np.append(means_y[1:], _y[-1])
+
+    selected = np.empty(n_out, dtype="int64")
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for k in range(n_out - 2):
+        start, end = bounds[k], bounds[k + 1]
+        ax, ay = _x[a], _y[a]
+        area = np.abs(
+            (ax - next_x[k]) * (_y[start:end] - ay)
+            - (ax - _x[start:end]) * (next_y[k] - ay)
+        )
+        a = start + int(np.argmax(area))
+        selected[k + 1] = a
+    return index[selected]
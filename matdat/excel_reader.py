@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Callable, List
 from func_helper import pip, identity
 from .i_lazy_reader import ILazyReader
@@ -8,10 +11,32 @@ DataFrame_transformer = Callable[[pd.DataFrame], pd.DataFrame]
 
 matchExcel = r"^(?!.*\~\$).*\.xlsx?$"
 
+# Options of pandas.read_excel supported by the streaming reader.
+# Other options fall back to pandas.read_excel.
+streaming_options = [
+    "sheet_name", "header", "skiprows", "nrows", "usecols", "names",
+    "dtype", "parse_dates", "chunksize"
+]
+
+
+def _error_codes():
+    from openpyxl.cell.cell import ERROR_CODES
+    return ERROR_CODES
+
+
+def _read_sheet(path: str, sheet, option: dict):
+    """
+    Read all chunks of a sheet in a worker process.
+    """
+    return list(ExcelReader.iterSheet(path, sheet, **option))
+
 
 class ExcelReader(ILazyReader):
     def __init__(self, path: str=None, header: int=0, verbose: bool=False):
         self.is_verbose = verbose
+        self.cache = None
+        self.schema = None
+        self.split_workers = 1
         if path:
             self.setPath(path, header)
 
@@ -24,33 +49,351 @@ class ExcelReader(ILazyReader):
         return self
 
     def read(self, header: int=0, **read_excel_kwargs):
+        """
+        Indicate option in reading excel file.
+
+        Files are read by pandas.read_excel at once as default.
+        When chunksize is given, .xlsx files are read lazily
+            by chunks of rows with read-only mode of openpyxl.
+        When several sheets are selected, chunks of the sheets are
+            concatenated in order of the sheets.
+        Dtypes of each chunk are inferred like pandas.read_excel,
+            and unified over chunks when they are assembled.
+        .xls files and options not supported by the streaming reader
+            are read by pandas.read_excel at once.
+
+        Parameters
+        ----------
+        header: int, optional
+            Default is 0.
+        **read_excel_kwargs:
+            Key words capable to pandas.read_excel.
+            "sheet_name", "header", "skiprows" (int), "nrows",
+                "usecols" (list of names or positions, or callable),
+                "names", "dtype", and "parse_dates" (list of names)
+                are supported in streaming.
+            "chunksize" is number of rows of a chunk.
+            Default is None, which means reading without streaming.
+
+        Returns
+        -------
+        self
+        """
 
         arg = {
             "header": header,
             **read_excel_kwargs
         }
+        arg = self.schemaOption(arg)
         if (re.search(r"\.xlsx?$", self.path, re.IGNORECASE) != None):
-            self.reader = ExcelReader.readExcel(
-                self.path, self.is_verbose, **arg)
+            def parse():
+                return self.applySchema(
+                    self.readStream(arg) if ExcelReader.isStreamable(self.path, arg)
+                    else ExcelReader.readExcel(self.path, self.is_verbose, **arg)
+                )
+
+            if self.cache is None:
+                self.reader = parse()
+            else:
+                self.reader = self.cache.load(
+                    self.path, self.cacheOption(arg),
+                    lambda: ExcelReader.concat(parse())
+                )
         else:
             raise SystemError("Invalid file type.")
         return self
 
     @staticmethod
     def readExcel(path, verbose, **kwargs):
+        kwargs = {k: v for k, v in kwargs.items() if k != "chunksize"}
         if verbose:
             print(f"kwargs for pandas.read_excel: {kwargs}")
 
         return pd.read_excel(path, **kwargs)
 
+    def setSplit(self, workers: int):
+        """
+        Read sheets in parallel with a process pool.
+
+        Parameters
+        ----------
+        workers: int
+            Number of processes.
+            1 means reading sheets one by one.
+        """
+        self.split_workers = workers
+        return self
+
+    @staticmethod
+    def isStreamable(path: str, arg: dict) -> bool:
+        if re.search(r"\.xlsx$", path, re.IGNORECASE) == None:
+            return False
+        if arg.get("chunksize", None) is None:
+            return False
+        if any(k not in streaming_options for k in arg.keys()):
+            return False
+        if type(arg.get("usecols", None)) is str:
+            # Excel column letters like "A:C"
+            return False
+        if arg.get("skiprows", None) is not None and type(arg["skiprows"]) is not int:
+            return False
+        if arg.get("header", 0) is not None and type(arg.get("header", 0)) is not int:
+            return False
+        if type(arg.get("parse_dates", [])) is not list\
+                or any(type(c) is not str for c in arg.get("parse_dates", [])):
+            return False
+        try:
+            import openpyxl
+        except ImportError:
+            return False
+        return True
+
+    def readStream(self, arg: dict):
+        """
+        Generator of chunks of selected sheets.
+        """
+        option = {k: v for k, v in arg.items() if k != "sheet_name"}
+        sheets = ExcelReader.sheetNames(self.path, arg.get("sheet_name", 0))
+
+        if self.is_verbose:
+            print(f"sheets: {sheets}")
+            print(f"kwargs for streaming excel reader: {option}")
+
+        if self.split_workers > 1 and len(sheets) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.split_workers, len(sheets))) as executor:
+                # executor.map keeps the order of sheets.
+                for chunks in executor.map(_read_sheet, repeat(self.path), sheets, repeat(option)):
+                    yield from chunks
+        else:
+            for sheet in sheets:
+                yield from ExcelReader.iterSheet(self.path, sheet, **option)
+
+    @staticmethod
+    def sheetNames(path: str, sheet_name) -> List[str]:
+        """
+        Names of sheets selected by sheet_name of pandas.read_excel.
+        """
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            names = workbook.sheetnames
+        finally:
+            workbook.close()
+
+        selected = names if sheet_name is None\
+            else sheet_name if type(sheet_name) is list\
+            else [sheet_name]
+        return [names[s] if type(s) is int else s for s in selected]
+
+    @staticmethod
+    def iterSheet(path: str, sheet: str, header=0, skiprows=None, nrows=None, usecols=None, names=None, dtype=None, parse_dates=None, chunksize: int=100000):
+        """
+        Yield chunks of rows of a sheet as pandas.DataFrame.
+        Only values of selected columns are kept.
+        """
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook[sheet].iter_rows(values_only=True)
+
+            for i in range(skiprows or 0):
+                next(rows, None)
+
+            labels = None
+            if header is not None:
+                for i in range(header):
+                    next(rows, None)
+                labels = next(rows, None)
+                if labels is None:
+                    yield pd.DataFrame()
+                    return
+                labels = ExcelReader.columnLabels(labels)
+
+            width = None if labels is None else len(labels)
+            positions = None
+            columns = None
+            chunk = []
+            blanks = []
+            count = 0
+            start = 0
+            for row in rows:
+                if width is None:
+                    width = len(row)
+                    labels = list(range(width))
+                if positions is None:
+                    positions = ExcelReader.selectColumns(labels, usecols)
+                    columns = names if names is not None\
+                        else [labels[p] for p in positions]
+
+                values = tuple(row[p] if p < len(row) else None
+                               for p in positions)
+
+                # Blank rows at the end of sheet are dropped.
+                if all(v is None for v in values):
+                    blanks.append(values)
+                    continue
+                for r in blanks + [values]:
+                    chunk.append(r)
+                    count = count + 1
+                    if len(chunk) >= chunksize:
+                        yield ExcelReader.toDataFrame(chunk, columns, dtype, start, parse_dates)
+                        start = start + len(chunk)
+                        chunk = []
+                    if nrows is not None and count >= nrows:
+                        break
+                blanks = []
+                if nrows is not None and count >= nrows:
+                    break
+
+            if len(chunk) > 0 or start == 0:
+                if columns is None:
+                    labels = labels or []
+                    positions = ExcelReader.selectColumns(labels, usecols)
+                    columns = names if names is not None\
+                        else [labels[p] for p in positions]
+                yield ExcelReader.toDataFrame(chunk, columns, dtype, start, parse_dates)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def columnLabels(row) -> list:
+        """
+        Labels of columns named like pandas.read_excel.
+        """
+        labels = []
+        for i, v in enumerate(row):
+            label = f"Unnamed: {i}" if v is None else v
+            if label in labels:
+                k = 1
+                while f"{label}.{k}" in labels:
+                    k = k + 1
+                label = f"{label}.{k}"
+            labels.append(label)
+        return labels
+
+    @staticmethod
+    def selectColumns(labels: list, usecols) -> List[int]:
+        """
+        Positions of columns selected by usecols of pandas.read_excel.
+        """
+        if usecols is None:
+            return list(range(len(labels)))
+        if callable(usecols):
+            return [i for i, label in enumerate(labels) if usecols(label)]
+        if all(type(c) is int for c in usecols):
+            return sorted(c for c in usecols if c < len(labels))
+        missing = [c for c in usecols if c not in labels]
+        if len(missing) > 0:
+            raise ValueError(
+                f"Usecols do not match columns, columns expected but not found: {missing}")
+        return [i for i, label in enumerate(labels) if label in usecols]
+
+    @staticmethod
+    def cellValue(value):
+        """
+        Value of a cell converted like the openpyxl engine of pandas.read_excel.
+        """
+        if value is None:
+            return ""
+        if type(value) is float and value.is_integer():
+            return int(value)
+        if type(value) is str and value in _error_codes():
+            return np.nan
+        return value
+
+    @staticmethod
+    def toDataFrame(rows: list, columns: list, dtype, start: int, parse_dates=None) -> pd.DataFrame:
+        """
+        Parse values of rows by the same parser as pandas.read_excel.
+        """
+        from pandas.io.parsers import TextParser
+        if type(dtype) is dict:
+            dtype = {k: v for k, v in dtype.items() if k in columns}
+        data = [[ExcelReader.cellValue(v) for v in row] for row in rows]
+        if len(data) == 0:
+            df = pd.DataFrame(columns=columns)
+        else:
+            df = TextParser(
+                data,
+                names=columns,
+                header=None,
+                dtype=dtype,
+                parse_dates=[c for c in (parse_dates or []) if c in columns],
+                skip_blank_lines=False
+            ).read()
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    @staticmethod
+    def concat(reader):
+        return reader if type(reader) in [pd.DataFrame, dict]\
+            else ExcelReader.unify(list(reader))
+
+    @staticmethod
+    def unify(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenate chunks with the dtype which pandas.read_excel infers
+            from values of all the chunks.
+        A column missing in a chunk is parsed as float64 in the chunk,
+            and booleans or integers with missing values are float64.
+        """
+        if len(chunks) == 1:
+            return chunks[0]
+        columns = pd.Index([]).append([df.columns for df in chunks]).unique()
+        dtypes = {}
+        for c in columns:
+            present = [df[c] for df in chunks if c in df.columns]
+            missing = len(present) < len(chunks)\
+                or any(v.isna().any() for v in present)
+            valued = {v.dtype for v in present if not v.isna().all()}
+            dtype = ExcelReader.commonDtype(valued, missing)
+            if dtype is not None:
+                dtypes[c] = dtype
+        return pd.concat([
+            df.astype({c: d for c, d in dtypes.items()
+                       if c in df.columns and df[c].dtype != d})
+            for df in chunks
+        ])
+
+    @staticmethod
+    def commonDtype(dtypes: set, missing: bool):
+        if len(dtypes) == 0:
+            return np.dtype("float64") if missing else None
+        kinds = {d.kind for d in dtypes}
+        if len(dtypes) == 1:
+            dtype = next(iter(dtypes))
+            return np.dtype("float64") if missing and dtype.kind in "biu"\
+                else dtype
+        if kinds <= set("iuf") or kinds == set("bf"):
+            return np.dtype("float64")
+        return np.dtype("O")
+
     def assemble(self, *preprocesses: DataFrame_transformer):
         preprocessor = pip(
             *preprocesses
         ) if preprocesses else identity
 
-        self.df = preprocessor(self.reader)
+        self.df = preprocessor(self.reader) if type(self.reader) in [pd.DataFrame, dict]\
+            else ExcelReader.unify([preprocessor(r) for r in self.reader])
+        if self.schema is not None:
+            self.df = self.schema.finalize(self.df)
 
         return self
 
+    def stream(self, *preprocesses: DataFrame_transformer):
+        """
+        Yield chunks preprocessed by some functions
+            without concatenating them.
+        """
+        preprocessor = pip(
+            *preprocesses
+        ) if preprocesses else identity
+
+        if type(self.reader) in [pd.DataFrame, dict]:
+            yield preprocessor(self.reader)
+        else:
+            for r in self.reader:
+                yield preprocessor(r)
+
     def getDataFrame(self):
         return self.df
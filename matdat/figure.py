@@ -1,7 +1,11 @@
 import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from func_helper import pip, identity
 from .save_plot import actionSavePNG
 from .i_subplot import ISubplot
+from .read_cache import ReadCache
+from .load_plan import LoadPlan
 from matpos import Matpos, FigureSizing, Subgrid
 import matpos.matpos.type_set as matpos_type
 from typing import Union, List, Tuple, Optional, Dict
@@ -21,12 +25,17 @@ class Figure:
 
     Parameters
     ----------
-    None
+    read_cache: bool | ReadCache, optional
+        Cache of tables shared by subplots reading the same files.
+        True creates a cache for this figure.
+        Subplots having their own cache keep it.
+        Default is None (not cached).
 
     Methods
     -------
     add_subplot(subplot:ISubplot)
     show(*arg,**kwargs)
+    show_async(*arg,**kwargs)
 
     Example
     -------
@@ -142,14 +151,30 @@ class Figure:
     # ccccccccc
     #
     # dddd
+
+    # ====================================
+    # Prefetch mode
+    #
+    # Data of all subplots are read
+    # concurrently, and each subplot is
+    # plotted as soon as its data is read.
+    # ====================================
+
+    axes = figure.show(size=(4,3), column=2, prefetch=True)
+
+    # In asyncio event loop (e.g. Jupyter notebook)
+    fig, axes = await figure.show_async(size=(4,3), column=2)
     """
     @staticmethod
     def create():
         return Figure()
 
-    def __init__(self, *arg, **kwargs):
+    def __init__(self, *arg, read_cache: Union[bool, ReadCache, None]=None, **kwargs):
         self.subplots = []
         self.axIdentifier = []
+        self.read_cache = ReadCache() if read_cache is True\
+            else read_cache if isinstance(read_cache, ReadCache)\
+            else None
 
     def get_length(self):
         return len(self.subplots)
@@ -166,6 +191,8 @@ class Figure:
         names = name if type(name) in [list, tuple] else [name]
 
         for i, s in enumerate(subplot):
+            if self.read_cache is not None and getattr(s, "read_cache", False) is None:
+                s.set_read_cache(self.read_cache)
             self.subplots.append(s)
             self.axIdentifier.append(
                 names[i]
@@ -179,6 +206,8 @@ class Figure:
     def show(self,
              *arg: Union[Matpos, FigureSizing, dict],
              size=None,
+             prefetch: Union[bool, int]=False,
+             plan: bool=False,
              **kwargs
              )->Tuple[Figure, List[Ax]]:
         """
@@ -207,12 +236,113 @@ class Figure:
             dpi: int
             ** and other parameters compatible to matplotlib.figure.Figure
 
+        prefetch: bool | int, optional
+            If True, data of subplots are read concurrently by threads,
+                and each subplot is plotted as soon as its data is read.
+            Integer is the number of threads.
+            Default is False (read and plot subplots one by one).
+
+        plan: bool, optional
+            If True, files shared by subplots are read once
+                with merged columns and time window.
+            See explain().
+            Default is False.
+
         Return
         ------
         fig: matplotlib.figure.Figure
         axs: dict[str:matplotlib.axes._subplots.Axsubplot]
 
 
+        """
+        if len(arg) > 0 and type(arg[0]) is dict:
+            return self.show(**{"prefetch": prefetch, "plan": plan, **arg[0], **kwargs})
+
+        fig, empty_axes, test = self.__layout(*arg, size=size, **kwargs)
+
+        if plan:
+            self.plan(test).execute()
+
+        if prefetch:
+            axes = Figure.__applyAsCompleted(test, Figure.__workers(
+                prefetch, self.get_length()))(list(zip(empty_axes, self.subplots)))
+        else:
+            axes = pip(
+                Figure.__applyForEach(test),
+                list
+            )(zip(empty_axes, self.subplots))
+
+        return (fig, dict(zip(self.axIdentifier, axes)))
+
+    async def show_async(self,
+                         *arg: Union[Matpos, FigureSizing, dict],
+                         size=None,
+                         max_workers: Optional[int]=None,
+                         plan: bool=False,
+                         **kwargs
+                         )->Tuple[Figure, List[Ax]]:
+        """
+        Awaitable version of show() in prefetch mode.
+        Data of subplots are read in threads,
+            and each subplot is plotted in the event loop
+            as soon as its data is read.
+
+        Parameters
+        ----------
+        Same as show().
+
+        max_workers: int, optional
+            Number of threads reading data.
+            Default is the number of subplots.
+        """
+        fig, empty_axes, test = self.__layout(*arg, size=size, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        if plan:
+            await loop.run_in_executor(None, self.plan(test).execute)
+        axes = [None] * self.get_length()
+
+        with ThreadPoolExecutor(max_workers=Figure.__workers(max_workers or True, self.get_length())) as executor:
+            async def load(k):
+                await loop.run_in_executor(
+                    executor, self.subplots[k].load, test)
+                return k
+
+            for loaded in asyncio.as_completed([load(k) for k in range(self.get_length())]):
+                k = await loaded
+                axes[k] = self.subplots[k].plot(empty_axes[k], test)
+
+        return (fig, dict(zip(self.axIdentifier, axes)))
+
+    def plan(self, test=False)->LoadPlan:
+        """
+        Plan of reading files shared by subplots.
+        """
+        return LoadPlan.build(self.subplots, self.axIdentifier, test)
+
+    def explain(self, test=False):
+        """
+        Show how files are read by show(plan=True).
+
+        Return
+        ------
+        pandas.DataFrame
+            Each row is a group of series reading the same files
+                with the same options.
+            Columns are "source", "files", "columns" (merged columns),
+                "time_window" (merged window), "series"
+                (list of subplot identifier, index of series, and index
+                of data source), and "shared".
+        """
+        return self.plan(test).explain()
+
+    def __layout(self,
+                 *arg: Union[Matpos, FigureSizing, dict],
+                 size=None,
+                 **kwargs
+                 ):
+        """
+        Create figure and empty axes.
         """
         if len(arg) > 0:
             if type(arg[0]) is Matpos:
@@ -229,7 +359,7 @@ class Figure:
                     **kwargs
                 )
             elif type(arg[0]) is dict:
-                return self.show(**arg[0], **kwargs)
+                return self.__layout(**arg[0], **kwargs)
             else:
                 raise SystemError(
                     "Type of positional arguments must be Matpos or dict. Or use keyword arguments.")
@@ -261,17 +391,18 @@ class Figure:
 
         return self.__show_custom(matpos, sgs, padding, test, dpi=dpi, **kwargs)
 
-    def __show_custom(self, matpos: Matpos, subgrids: List[Subgrid], padding={}, test=False, **kwargs)->Tuple[Figure, List[Ax]]:
+    def __show_custom(self, matpos: Matpos, subgrids: List[Subgrid], padding={}, test=False, **kwargs):
         fig, empty_axes = matpos.figure_and_axes(
             subgrids, padding=padding, **kwargs
         )
 
-        axes = pip(
-            Figure.__applyForEach(test),
-            list
-        )(zip(empty_axes, self.subplots))
+        return (fig, empty_axes, test)
 
-        return (fig, dict(zip(self.axIdentifier, axes)))
+    @staticmethod
+    def __workers(prefetch: Union[bool, int], n_subplots: int)->int:
+        if type(prefetch) is int and not type(prefetch) is bool:
+            return max(prefetch, 1)
+        return max(n_subplots, 1)
 
     @staticmethod
     def __applyForEach(test=False):
@@ -290,6 +421,29 @@ class Figure:
             )
         return f
 
+    @staticmethod
+    def __applyAsCompleted(test=False, max_workers=1):
+        """
+        [(pyplot.axsubplot, Subplot)] -> [pyplot.axsubplot]
+
+        Data of subplots are read by threads.
+        Subplots are plotted in the calling thread in order of completion.
+        """
+        def f(axesAndSubplots):
+            axes = [None] * len(axesAndSubplots)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(subplot.load, test): k
+                    for k, (ax, subplot) in enumerate(axesAndSubplots)
+                }
+                for future in as_completed(futures):
+                    future.result()
+                    k = futures[future]
+                    ax, subplot = axesAndSubplots[k]
+                    axes[k] = subplot.plot(ax, test)
+            return axes
+        return f
+
     def save(self, directory, fileName, ext="png"):
         saver = Figure.__IFigureSaver(ext)
         return saver(directory, fileName)()
@@ -1,6 +1,9 @@
 import os
 import glob
+import json
 import re
+import threading
+import time
 from func_helper import pip, tee, identity
 import func_helper.func_helper.iterator as it
 from IPython.display import display
@@ -12,8 +15,18 @@ from IPython.display import display
 
 指定したディレクトリ `dirPath` 以下を再帰的に探索し,
 ディレクトリとファイルパスの一覧を取得する.
+
+探索は os.scandir により行い, glob.glob(dirPath + "**", recursive=True)
+と同じ順序で同じパスを返す (隠しファイル・ディレクトリは除く).
+"^" で始まるパターンのリテラルな接頭辞にマッチし得ないディレクトリは探索しない.
+
+探索結果はプロセス内でキャッシュされ, 探索したディレクトリの
+更新時刻が変わるまで (または TTL の間) 再利用される.
 """
 
+# Characters having special meaning in regular expression.
+_special = set(".^$*+?{}[]|()\\")
+
 
 def getAllSubPath(_directory):
     directory = _directory if re.search(
@@ -22,18 +35,135 @@ def getAllSubPath(_directory):
 
 
 def isMatchAll(patterns):
-    return lambda s: it.reducing(lambda a, b: a and b)(True)(
-        it.mapping(lambda pattern: re.search(pattern, s) != None)(patterns)
+    compiled = [re.compile(pattern) for pattern in patterns]
+    return lambda s: all(pattern.search(s) != None for pattern in compiled)
+
+
+def literalPrefix(pattern) -> str:
+    """
+    Literal prefix of a pattern anchored by "^".
+    Empty string means that the prefix can not be decided.
+
+    Parameters
+    ----------
+    pattern: str, re.Pattern
+        Compiled patterns with flags such as re.IGNORECASE
+            are not pruned, because their prefix is not literal.
+    """
+    if isinstance(pattern, re.Pattern):
+        if pattern.flags & ~re.UNICODE:
+            return ""
+        pattern = pattern.pattern
+    if type(pattern) is not str:
+        return ""
+    if not pattern.startswith("^") or "|" in pattern:
+        return ""
+
+    prefix = []
+    i = 1
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 >= len(pattern) or pattern[i+1].isalnum():
+                break
+            c = pattern[i+1]
+            i = i + 2
+        elif c in _special:
+            break
+        else:
+            i = i + 1
+
+        # The character is optional or repeated.
+        if i < len(pattern) and pattern[i] in "*?{":
+            break
+        prefix.append(c)
+    return "".join(prefix)
+
+
+def canContain(directory: str, prefixes) -> bool:
+    """
+    Whether paths under the directory can start with all prefixes.
+    """
+    head = directory if directory.endswith("/") else directory + "/"
+    return all(
+        head.startswith(prefix) or prefix.startswith(head)
+        for prefix in prefixes
     )
 
 
+def walk(directory: str, prefixes=[], visited=None):
+    """
+    Yield pairs of path and whether it is a directory in pre-order.
+    The kind is None for entries neither directory nor file.
+    Type of entries is taken from os.DirEntry without extra stat calls.
+    Directories which can not contain paths starting with prefixes
+        are not scanned.
+    Modification time of scanned directories is recorded in visited.
+    """
+    try:
+        if visited is not None:
+            visited[directory] = os.stat(directory).st_mtime_ns
+        entries = os.scandir(directory if directory != "" else ".")
+    except OSError:
+        return
+
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            path = directory + entry.name
+            try:
+                is_dir = True if entry.is_dir()\
+                    else False if entry.is_file() else None
+            except OSError:
+                is_dir = None
+            yield (path, is_dir)
+            if is_dir is True and canContain(path, prefixes):
+                yield from walk(path + "/", prefixes, visited)
+
+
+def iterFileList(*patterns):
+    """
+    Lazy version of getFileList.
+    Yield pairs of path matching all patterns and whether it is a directory.
+    """
+    def iterate(dirPath, visited=None):
+        directory = dirPath if re.search(
+            "/$", dirPath) != None else dirPath + "/"
+        isMatch = isMatchAll(patterns)
+        prefixes = [p for p in map(literalPrefix, patterns) if p != ""]
+
+        if not os.path.isdir(directory):
+            return
+        if isMatch(directory):
+            yield (directory, True)
+        if canContain(directory, prefixes):
+            yield from filter(
+                lambda t: isMatch(t[0]), walk(directory, prefixes, visited))
+    return iterate
+
+
 class PathList:
-    def __init__(self, pathList):
+    def __init__(self, pathList, is_dir=None):
+        """
+        Parameters
+        ----------
+        pathList: List[str]
+        is_dir: List[bool], optional
+            Whether each path is a directory.
+            Default is None, then it is checked by os.path.isdir.
+        """
         self.paths = pathList
+        self.is_dir = is_dir
+
+    def kinds(self, is_dir: bool):
+        if self.is_dir is None:
+            return it.filtering(os.path.isdir if is_dir else os.path.isfile)
+        return lambda paths: [p for p, d in zip(paths, self.is_dir) if d is is_dir]
 
     def directories(self, verbose=False):
         return pip(
-            it.filtering(os.path.isdir),
+            self.kinds(True),
             list,
             tee(
                 pip(
@@ -46,7 +176,7 @@ class PathList:
 
     def files(self, verbose=False):
         return pip(
-            it.filtering(os.path.isfile),
+            self.kinds(False),
             list,
             tee(
                 pip(
@@ -58,10 +188,166 @@ class PathList:
         )(self.paths)
 
 
-def getFileList(*patterns):
+class ListingCache:
+    """
+    Process-wide cache of results of getFileList.
+
+    A listing is reused while modification time of all scanned
+        directories is unchanged.
+    Adding, removing, or renaming entries changes modification time of
+        the directory including them.
+
+    Example
+    -------
+    from matdat.get_path import listing_cache
+
+    # Skip checking directories for 60 seconds.
+    listing_cache.ttl = 60
+
+    # Keep listings across sessions.
+    listing_cache.persist("./.matdat_listing.json")
+
+    Parameters
+    ----------
+    ttl: float, optional
+        Seconds in which a listing is reused without checking directories.
+        Default is None, which means that directories are always checked.
+    path: str, optional
+        Json file where listings are saved.
+        Default is None (not saved).
+    """
+
+    def __init__(self, ttl=None, path=None):
+        self.ttl = ttl
+        self.path = None
+        self.listings = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path is not None:
+            self.persist(path)
+
+    @staticmethod
+    def key(dirPath: str, patterns) -> str:
+        return json.dumps([
+            os.path.abspath(dirPath),
+            [[p.pattern, p.flags] if isinstance(p, re.Pattern) else p
+             for p in patterns]
+        ])
+
+    def get(self, dirPath: str, patterns, scan):
+        """
+        Cached listing, or a new listing by scan(visited).
+        """
+        key = ListingCache.key(dirPath, patterns)
+        with self._lock:
+            listing = self.listings.get(key)
+
+        if listing is not None and self.isValid(listing):
+            self.hits = self.hits + 1
+            return listing["paths"]
+
+        self.misses = self.misses + 1
+        visited = {}
+        paths = scan(visited)
+        with self._lock:
+            self.listings[key] = {
+                "paths": paths,
+                "directories": visited,
+                "checked": time.monotonic()
+            }
+        self.save()
+        return paths
+
+    def isValid(self, listing) -> bool:
+        now = time.monotonic()
+        if self.ttl is not None and listing["checked"] is not None\
+                and now - listing["checked"] <= self.ttl:
+            return True
+
+        for directory, mtime in listing["directories"].items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        listing["checked"] = now
+        return True
+
+    def persist(self, path: str):
+        """
+        Load listings saved in the file and save new listings to it.
+        """
+        self.path = path
+        try:
+            with open(path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+
+        with self._lock:
+            for key, listing in saved.items():
+                self.listings.setdefault(key, {
+                    "paths": [tuple(t) for t in listing["paths"]],
+                    "directories": listing["directories"],
+                    # Directories are checked at the first use.
+                    "checked": None
+                })
+        return self
+
+    def save(self):
+        if self.path is None:
+            return self
+        with self._lock:
+            saved = {
+                key: {
+                    "paths": listing["paths"],
+                    "directories": listing["directories"]
+                }
+                for key, listing in self.listings.items()
+            }
+        try:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(saved, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            # Listings are kept only in memory.
+            pass
+        return self
+
+    def clear(self):
+        with self._lock:
+            self.listings = {}
+        self.hits = 0
+        self.misses = 0
+        return self
+
+
+listing_cache = ListingCache()
+
+
+def getFileList(*patterns, cache=listing_cache):
+    """
+    Parameters
+    ----------
+    *patterns: str
+        Regular expressions which paths must match.
+    cache: ListingCache, optional
+        Default is process-wide listing_cache.
+        None means scanning directories every time.
+    """
+    def scan(dirPath):
+        return lambda visited: list(iterFileList(*patterns)(dirPath, visited))
+
+    def toPathList(pairs):
+        return PathList([p for p, d in pairs], [d for p, d in pairs])
+
+    def listing(dirPath):
+        return scan(dirPath)(None) if cache is None\
+            else cache.get(dirPath, patterns, scan(dirPath))
+
     return lambda dirPath: pip(
-        getAllSubPath,
-        it.filtering(isMatchAll(patterns)),
-        list,
-        PathList
+        listing,
+        toPathList
     )(dirPath)
@@ -1,3 +1,6 @@
+import pandas as pd
+
+
 class ILazyReader:
     def __ini__(self):
         pass
@@ -5,11 +8,83 @@ class ILazyReader:
     def setPath(self, path):
         pass
 
+    def setCache(self, cache):
+        """
+        cache: TableCache, optional
+            Cache of parsed tables.
+        """
+        self.cache = cache
+        return self
+
+    def setSchema(self, schema):
+        """
+        schema: Schema, optional
+            Data types of columns applied in parsing.
+        """
+        self.schema = schema
+        return self
+
+    def schemaOption(self, arg: dict) -> dict:
+        """
+        Add data types of resolved schema to options for parsing.
+        """
+        if self.schema is None or type(arg.get("dtype", {})) is not dict:
+            return arg
+        return {
+            **arg,
+            "dtype": {**self.schema.parse_dtype(), **arg.get("dtype", {})}
+        }
+
+    def cacheOption(self, arg: dict) -> dict:
+        """
+        Options identifying a cached table.
+        Settings of the schema are included even before it is resolved.
+        """
+        return {
+            **arg,
+            "schema": None if self.schema is None else self.schema.settings()
+        }
+
+    def applySchema(self, reader):
+        """
+        Apply schema to a table or chunks of table.
+        """
+        if self.schema is None:
+            return reader
+        elif type(reader) in [pd.DataFrame, dict]:
+            return self.schema.apply(reader)
+        else:
+            return map(self.schema.apply, reader)
+
+    def setSplit(self, workers: int):
+        """
+        Readers without splitting into byte ranges parse the file at once.
+        """
+        return self
+
+    def setTail(self, tail: bool):
+        """
+        Readers without tail reading parse the whole file every time.
+        """
+        return self
+
+    def setTimeWindow(self, columns, lower=None, upper=None):
+        """
+        Readers without time index read all rows.
+        """
+        return self
+
     def read(self):
         pass
 
     def assemble(self):
         pass
 
+    def stream(self, *preprocesses):
+        """
+        Generator of preprocessed chunks.
+        """
+        pass
+
     def getDataFrame(self):
         pass
@@ -15,7 +15,10 @@ class ISubplot:
         return self._isTest
 
     @staticmethod
-    def IDataLoader(data_source, isTest):
+    def IDataLoader(data_source, isTest, **loader_option):
+        """
+        loader_option is passed to the loader of files (TableLoader).
+        """
         if isTest:
             return TestLoader()
 
@@ -27,4 +30,4 @@ class ISubplot:
 
         else:
             # path like values of data source
-            return TableLoader()
+            return TableLoader(**loader_option)
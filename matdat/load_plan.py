@@ -0,0 +1,192 @@
+import json
+from typing import List, Optional
+import pandas as pd
+from func_helper import pip, identity
+from .data_loader import TableLoader
+from .read_cache import ReadCache
+
+"""
+Plan of reading files shared by subplots of a figure.
+
+Series of subplots reading the same files with the same options
+    are grouped, and the files are read once for the group.
+Required columns and time windows of the series are merged,
+    and transformers of each series are applied to the shared tables.
+
+Example
+-------
+figure.explain()
+# Groups of series and the merged columns and time window.
+
+figure.show(size=(4,3), column=2, plan=True)
+"""
+
+
+class LoadPlan:
+    def __init__(self, groups: List[dict]):
+        self.groups = groups
+
+    @staticmethod
+    def build(subplots, names, test=False):
+        """
+        Group series of subplots by files and options for reading them.
+
+        Parameters
+        ----------
+        subplots: List[Subplot]
+        names: list
+            Identifiers of subplots in the figure.
+        test: bool, optional
+        """
+        groups = {}
+        for subplot, name in zip(subplots, names):
+            if not hasattr(subplot, "read_requests"):
+                continue
+            subplot.set_test_mode(test)
+            subplot.normalize_xlim()
+            if test:
+                continue
+
+            for i in range(subplot.length):
+                requests = subplot.read_requests(i)
+                keys = [LoadPlan.key(subplot, r) for r in requests]
+                # All data sources of a series must be planned.
+                if any(k is None for k in keys):
+                    continue
+                for key, request in zip(keys, requests):
+                    group = groups.setdefault(key, {
+                        "data": request["data"],
+                        "meta": request["meta"],
+                        "schema": request["hint"]["schema"],
+                        "loader_option": subplot.loader_option,
+                        "consumers": []
+                    })
+                    group["consumers"].append((subplot, name, request))
+
+        for group in groups.values():
+            hints = [r["hint"] for _, _, r in group["consumers"]]
+            group["columns"] = LoadPlan.merge_columns(
+                [h["columns"] for h in hints])
+            group["time_window"] = LoadPlan.merge_windows(
+                [h["time_window"] for h in hints])
+
+        return LoadPlan(list(groups.values()))
+
+    @staticmethod
+    def key(subplot, request: dict) -> Optional[tuple]:
+        """
+        Series reading the same files with the same options share a key.
+        None means that the data source is not planned.
+        """
+        if subplot.stream[request["i"]] is not None:
+            return None
+        files = ReadCache.source_key(request["data"])
+        if files is None:
+            return None
+        return (files, json.dumps([
+            request["meta"],
+            id(request["hint"]["schema"]),
+            subplot.loader_option
+        ], sort_keys=True, default=repr))
+
+    @staticmethod
+    def merge_columns(columns_list: List[Optional[set]]) -> Optional[set]:
+        if any(c is None for c in columns_list):
+            return None
+        return set().union(*columns_list)
+
+    @staticmethod
+    def merge_windows(windows: List[Optional[dict]]) -> Optional[dict]:
+        """
+        Time window including all windows.
+        None means all rows.
+        """
+        if len(windows) == 0 or any(w is None for w in windows):
+            return None
+        if any(w["columns"] != windows[0]["columns"] for w in windows):
+            return None
+
+        lowers = [w["lower"] for w in windows]
+        uppers = [w["upper"] for w in windows]
+        return {
+            "columns": windows[0]["columns"],
+            "lower": None if any(pd.isnull(v) for v in lowers) else min(lowers),
+            "upper": None if any(pd.isnull(v) for v in uppers) else max(uppers)
+        }
+
+    def shared_groups(self) -> List[dict]:
+        """
+        Groups read by multiple series, and groups of the other data
+            sources of the series.
+        """
+        shared = set(
+            (id(subplot), r["i"])
+            for g in self.groups if len(g["consumers"]) > 1
+            for subplot, _, r in g["consumers"]
+        )
+        return [
+            g for g in self.groups
+            if any((id(subplot), r["i"]) in shared for subplot, _, r in g["consumers"])
+        ]
+
+    def explain(self) -> pd.DataFrame:
+        """
+        Groups of series sharing files.
+        Groups read by only one series are not shared,
+            and the series read files by themselves
+            unless the other data sources of the series are shared.
+        """
+        shared = set(map(id, self.shared_groups()))
+        rows = []
+        for group in self.groups:
+            paths = TableLoader.toPathList(group["data"])
+            window = group["time_window"]
+            rows.append({
+                "source": paths[0] if len(paths) == 1
+                else f"{paths[0]} ... ({len(paths)} files)" if len(paths) > 0
+                else "",
+                "files": len(paths),
+                "columns": None if group["columns"] is None
+                else sorted(group["columns"], key=str),
+                "time_window": None if window is None
+                else (window["lower"], window["upper"]),
+                "series": [(name, r["i"], r["j"]) for _, name, r in group["consumers"]],
+                "shared": id(group) in shared
+            })
+        return pd.DataFrame(rows, columns=[
+            "source", "files", "columns", "time_window", "series", "shared"])
+
+    def execute(self):
+        """
+        Read files of shared groups and set the data of series
+            as prefetched data of the subplots.
+        """
+        results = {}
+        for group in self.shared_groups():
+            loader = TableLoader(**group["loader_option"])
+            tables = loader.readEach(
+                group["data"], group["meta"], [],
+                group["columns"], group["time_window"], group["schema"])
+
+            for subplot, name, request in group["consumers"]:
+                transformer = pip(*request["transformers"])\
+                    if request["transformers"] else identity
+                df = TableLoader.concat(
+                    [transformer(LoadPlan.select(table, request["hint"]["columns"]))
+                     for table in tables],
+                    group["schema"])
+                results.setdefault((id(subplot), request["i"]), (subplot, {}))[
+                    1][request["j"]] = df
+
+        for (_, i), (subplot, dfs) in results.items():
+            subplot.prefetched[i] = tuple(dfs[j] for j in range(len(dfs)))
+        return self
+
+    @staticmethod
+    def select(df: pd.DataFrame, columns: Optional[set]) -> pd.DataFrame:
+        """
+        Copy of the table with only required columns.
+        """
+        if columns is None:
+            return df.copy()
+        return df[[c for c in df.columns if c in columns]]
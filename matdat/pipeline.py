@@ -0,0 +1,310 @@
+import pandas as pd
+from typing import Callable, List, Optional, Tuple
+from func_helper import identity
+import func_helper.func_helper.dataframe as dataframe
+
+"""
+Lazy plan of transformers applied to tables.
+
+Transformers are expressed as steps.
+Built-in steps are recognized by the plan and filters are pushed down
+    before building the index,
+    while the other callables are kept as opaque steps.
+Parsing the time column of the index is pushed down to the reader
+    as "parse_dates" option.
+
+Steps are callable as transformers, so that the optimized plan is
+    applied to each chunk of tables in the reader in the same way as
+    functions.
+Unlike closures, steps can be sent to worker processes.
+
+Example
+-------
+pipeline = Pipeline.of(
+    SetIndex(["datetime"]),
+    FilterBetween("depth", 0, 10),
+    user_transformer
+)
+meta, pipeline = pipeline.pushdown({"header": 3})
+# pipeline:
+#   FilterBetween('depth', 0, 10) -> SetIndex(['datetime']) -> Opaque
+
+pipeline = Pipeline.of(
+    SetIndex(["datetime"]),
+    FilterBetween(None, pd.Timestamp("2020-01-01"), None)
+)
+meta, pipeline = pipeline.pushdown({"header": 3})
+# meta: {"header": 3, "parse_dates": ["datetime"]}
+# pipeline:
+#   IndexBetween(['datetime'], Timestamp('2020-01-01 00:00:00'), None)
+"""
+
+
+class Step:
+    def __call__(self, df):
+        return df
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class Opaque(Step):
+    """
+    Arbitrary function transforming table.
+    Steps after it are not reordered.
+    """
+
+    def __init__(self, f: Callable):
+        self.f = f
+
+    def __call__(self, df):
+        return self.f(df)
+
+    def __repr__(self):
+        return f"Opaque({getattr(self.f, '__name__', repr(self.f))})"
+
+
+class SetIndex(Step):
+    """
+    Set time series index made from columns.
+    Values of multiple columns are joined.
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+
+    def __call__(self, df):
+        if len(self.columns) == 0:
+            return df
+        return dataframe.setTimeSeriesIndex(*self.columns)(df)
+
+    def __repr__(self):
+        return f"SetIndex({self.columns})"
+
+
+class FilterBetween(Step):
+    """
+    Select rows whose value of the column is between lower and upper.
+    Bounds are exclusive unless lower_inclusive or upper_inclusive
+        is True, as func_helper.dataframe.filter_between.
+    None column means the index.
+    None bound means unbounded.
+
+    When values are sorted, rows are sliced by binary search
+        without building a boolean mask or copying the table.
+    Otherwise, the mask is used.
+    """
+
+    def __init__(self, column: Optional[str], lower=None, upper=None, lower_inclusive: bool=False, upper_inclusive: bool=False):
+        self.column = column
+        self.lower = lower
+        self.upper = upper
+        self.lower_inclusive = lower_inclusive
+        self.upper_inclusive = upper_inclusive
+
+    def is_noop(self) -> bool:
+        return FilterBetween.is_unbounded(self.lower)\
+            and FilterBetween.is_unbounded(self.upper)
+
+    @staticmethod
+    def is_unbounded(v) -> bool:
+        return v is None or v is pd.NaT
+
+    def __call__(self, df):
+        if self.is_noop():
+            return df
+        sliced = self.slice(df)
+        if sliced is not None:
+            return sliced
+
+        values = df.index if self.column is None else df[self.column]
+        mask = None
+        if not FilterBetween.is_unbounded(self.lower):
+            mask = values >= self.lower if self.lower_inclusive\
+                else values > self.lower
+        if not FilterBetween.is_unbounded(self.upper):
+            below = values <= self.upper if self.upper_inclusive\
+                else values < self.upper
+            mask = below if mask is None else mask & below
+        return df[mask]
+
+    def slice(self, df):
+        """
+        Slice of sorted table, or None when it can not be sliced.
+        """
+        if type(df) is not pd.DataFrame:
+            return None
+        if self.column is None:
+            values = df.index
+        elif self.column in df.columns:
+            values = df[self.column]
+        else:
+            return None
+        if not values.is_monotonic_increasing:
+            return None
+
+        try:
+            start = 0 if FilterBetween.is_unbounded(self.lower)\
+                else values.searchsorted(
+                    self.lower, side="left" if self.lower_inclusive else "right")
+            end = len(values) if FilterBetween.is_unbounded(self.upper)\
+                else values.searchsorted(
+                    self.upper, side="right" if self.upper_inclusive else "left")
+        except (TypeError, ValueError):
+            return None
+        return df.iloc[int(start):max(int(start), int(end))]
+
+    def bounds(self) -> tuple:
+        return (self.lower, self.upper, self.lower_inclusive, self.upper_inclusive)
+
+    def __repr__(self):
+        inclusive = f", {self.lower_inclusive}, {self.upper_inclusive}"\
+            if self.lower_inclusive or self.upper_inclusive else ""
+        return f"FilterBetween({self.column!r}, {self.lower!r}, {self.upper!r}{inclusive})"
+
+
+class IndexBetween(Step):
+    """
+    SetIndex followed by FilterBetween on the index.
+    When the time column is already parsed as datetime,
+        rows are selected by the column before building the index.
+    """
+
+    def __init__(self, index: SetIndex, f: FilterBetween):
+        self.index = index
+        self.f = f
+
+    def __call__(self, df):
+        column = self.index.columns[0]
+        if column in df.columns and pd.api.types.is_datetime64_any_dtype(df[column]):
+            return self.index(
+                FilterBetween(column, *self.f.bounds())(df))
+        return self.f(self.index(df))
+
+    def __repr__(self):
+        return f"IndexBetween({self.index.columns}, {self.f.lower!r}, {self.f.upper!r})"
+
+
+class Pipeline:
+    """
+    Sequence of steps.
+    """
+
+    def __init__(self, steps: List[Step]):
+        self.steps = steps
+
+    @staticmethod
+    def of(*transformers):
+        """
+        Functions are wrapped as opaque steps.
+        Identity functions are removed.
+        """
+        return Pipeline([
+            t if isinstance(t, Step) else Opaque(t)
+            for t in transformers
+            if t is not identity
+        ])
+
+    def __call__(self, df):
+        for step in self.steps:
+            df = step(df)
+        return df
+
+    def __repr__(self):
+        return " -> ".join(map(repr, self.steps)) if len(self.steps) > 0\
+            else "Pipeline()"
+
+    def transformers(self) -> List[Step]:
+        return list(self.steps)
+
+    def pushdown(self, meta: dict) -> Tuple[dict, "Pipeline"]:
+        """
+        Optimize the plan for reading tables with the options.
+
+        1. Filters without bounds are removed.
+        2. Filters of columns not used for the index are applied before
+               building the index, so that the index is built only for
+               selected rows.
+        3. When there is no opaque step, the time column of the index
+               filtered by datetime bounds is added to "parse_dates"
+               option of the reader.
+        4. Filters of the index made from a column parsed as datetime
+               by the reader ("parse_dates" option) are applied to
+               the column before building the index.
+
+        Only steps before the first opaque step are optimized.
+        The time column is not parsed by the reader when opaque steps
+            exist, because they may depend on the type of the column.
+
+        Returns
+        -------
+        meta: dict
+            Options for reading tables.
+        pipeline: Pipeline
+        """
+        steps = [s for s in self.steps
+                 if not (isinstance(s, FilterBetween) and s.is_noop())]
+
+        head = []
+        for s in steps:
+            if isinstance(s, Opaque):
+                break
+            head.append(s)
+        tail = steps[len(head):]
+
+        if len(tail) == 0:
+            meta = Pipeline.parse_index_dates(head, meta)
+        parsed = Pipeline.parsed_dates(meta)
+
+        # Move filters before building the index.
+        optimized = []
+        for s in head:
+            previous = optimized[-1] if len(optimized) > 0 else None
+            if isinstance(s, FilterBetween) and isinstance(previous, SetIndex):
+                if s.column is None and len(previous.columns) == 1\
+                        and previous.columns[0] in parsed:
+                    optimized[-1] = IndexBetween(previous, s)
+                    continue
+                if s.column is not None and s.column not in previous.columns:
+                    optimized[-1:] = [s, previous]
+                    continue
+            optimized.append(s)
+
+        return (meta, Pipeline(optimized + tail))
+
+    @staticmethod
+    def parse_index_dates(steps: List[Step], meta: dict) -> dict:
+        """
+        Read options with "parse_dates" including the time columns
+            of indexes filtered by datetime bounds.
+        """
+        parse_dates = meta.get("parse_dates", None)
+        if parse_dates is not None and type(parse_dates) is not list:
+            return meta
+        typed = [c for k in ["dtype", "converters"]
+                 if type(meta.get(k, None)) is dict
+                 for c in meta[k].keys()]
+
+        columns = []
+        for previous, s in zip(steps[:-1], steps[1:]):
+            if not (isinstance(previous, SetIndex) and isinstance(s, FilterBetween)):
+                continue
+            if s.column is not None or len(previous.columns) != 1:
+                continue
+            column = previous.columns[0]
+            if column in typed or column in (parse_dates or []):
+                continue
+            if all(FilterBetween.is_unbounded(v) or isinstance(v, pd.Timestamp)
+                   for v in [s.lower, s.upper]):
+                columns.append(column)
+
+        if len(columns) == 0:
+            return meta
+        return {**meta, "parse_dates": (parse_dates or []) + columns}
+
+    @staticmethod
+    def parsed_dates(meta: dict) -> List[str]:
+        parse_dates = meta.get("parse_dates", [])
+        if type(parse_dates) is not list:
+            return []
+        return [c for c in parse_dates if type(c) is str]
@@ -6,6 +6,8 @@ import matplotlib.transforms
 from typing import Union, List, Tuple, TypeVar, Callable, NewType, Optional
 from func_helper import pip
 import func_helper.func_helper.iterator as it
+from .factor import Iget_factor
+from ..projection import selector_keys
 
 DataSource = Union[dict, pd.DataFrame, pd.Series]
 Ax = plt.subplot
@@ -15,7 +17,7 @@ Selector = Optional[Union[str, Callable[[DataSource], DataSource]]]
 LiteralOrSequence = Optional[Union[int,float,str,list,tuple,DataSource]]
 LiteralOrSequencer = Optional[Union[LiteralOrSequence, Callable[[DataSource], DataSource]]]
 
-def plot_action(plotter: PlotAction, arg_names, default_kwargs={}):
+def plot_action(plotter: PlotAction, arg_names, default_kwargs={}, batch_plotter=None):
     """
     Generate plot action by hashable object and some parameters, which takes
         matplotlib.pyplot.Axes.subplot and return it.
@@ -23,10 +25,16 @@ def plot_action(plotter: PlotAction, arg_names, default_kwargs={}):
     When some parameters are given as list, duplicate the other parameters
         and make multiple plots.
 
+    When batch=True is given as a parameter and batch_plotter is available,
+        all the duplicated parameters are passed to batch_plotter at once,
+        so that they can be drawn by a single artist.
+    If batch_plotter returns None, plotter is used for each of them.
+
     Parameters
     ----------
     plotter: *arg,**kwargs -> ax -> ax
     default: dict
+    batch_plotter: List[Tuple[list, dict]] -> Optional[ax -> ax], optional
 
     Return
     ------
@@ -51,8 +59,9 @@ def plot_action(plotter: PlotAction, arg_names, default_kwargs={}):
                 }
             kwargs: parameters corresponding to items of option.
             """
-            list_of_entry = to_flatlist(
-                {"data":data_source,**default_kwargs, **setting, **setting_kwargs, **option, **option_kwargs})
+            entry = {"data":data_source,**default_kwargs, **setting, **setting_kwargs, **option, **option_kwargs}
+            batch = entry.pop("batch", False)
+            list_of_entry = to_flatlist(entry)
             # print(list_of_entry)
 
             arg_and_kwarg=generate_arg_and_kwags()(
@@ -62,9 +71,21 @@ def plot_action(plotter: PlotAction, arg_names, default_kwargs={}):
                 list(map(kwarg_filter, list_of_entry))
             )
 
+            if batch and batch_plotter is not None:
+                batch_plot = batch_plotter(arg_and_kwarg)
+                if batch_plot is not None:
+                    return batch_plot
+
             # return plot action
             return lambda ax: it.reducing(
                 lambda acc, e: plotter(*e[0], **e[1])(acc))(ax)(arg_and_kwarg)
+
+        # Declare option keys used as column selectors for projection.
+        preset = {**setting, **setting_kwargs}
+        set_data.selector_keys = [
+            k for k in selector_keys if k in arg_names or k in default_kwargs]
+        set_data.preset_selectors = [
+            preset[k] for k in set_data.selector_keys if k in preset]
         return set_data
     return presetting
 
@@ -230,20 +251,6 @@ def get_values_by_keys(k: list, default=None)->Callable[[dict], list]:
     return lambda d: list(map(lambda key: d.get(key, default), k))
 
 
-def Iget_factor(
-    df: pd.DataFrame,
-    f: Union[str, Callable[[pd.DataFrame], pd.Series]],
-    factor: Optional[Union[list, Callable[[pd.DataFrame], pd.Series]]]
-)->Tuple[pd.Series, list]:
-    d = f(df) if callable(f) else df[f]
-    if type(factor) is list:
-        return (d, factor)
-    elif callable(factor):
-        return factor(d)
-    else:
-        return (d, d.astype('category').cat.categories)
-
-
 def selector_or_literal(df, s):
     if s is None:
         return df.index
@@ -329,6 +336,8 @@ _line_kwargs = {
     **_line2d_kwargs,
     "linestyle": "-",
     "linewidth": 1,
+    "decimate": None,
+    "x_range": None,
 }
 
 _vhlines_kwargs = {
@@ -349,7 +358,12 @@ _scatter_kwargs = {
     "marker": "o",
     "edgecolors": "face",
     "linewidth": None,
-    "linestyle": "-"
+    "linestyle": "-",
+    "density": None,
+    "aggregate": None,
+    "log": None,
+    "x_range": None,
+    "y_range": None,
 }
 
 _fill_kwargs = {
@@ -1,9 +1,8 @@
 from .action import default_kwargs, plot_action, generate_arg_and_kwags, get_value, get_subset, Iget_factor
 from .action import DataSource, AxPlot
+from .factor import factor_codes, aggregate, crosstab
 import pandas as pd
 import numpy as np
-from func_helper import pip
-import func_helper.func_helper.iterator as it
 
 
 def _factor_bar_plotter(
@@ -26,91 +25,66 @@ def _factor_bar_plotter(
         return _bar_plotter(df, x, y, agg, *arg, xfactor=xfactor, norm=norm, vert=vert, legend=legend, **kwargs)
 
     """
-    1. stacking bar plotのstackしていくgroupingをつくる
+    stackのfactorとxのfactorのすべての組み合わせについて,
+        集計値の行列 (stack x x_factor) を一度に計算する.
+    x_factorは全データに基づいて決めるので, すべてのstackで共通になる.
+    aggは先頭の列に適用される.
     """
     stack_series, stack_factor = Iget_factor(df, y, yfactor)
-    stack_group = df.groupby(
-        pd.Categorical(
-            stack_series,
-            ordered=True,
-            categories=stack_factor
-        )
+    x_factor_series, x_factor = Iget_factor(df, x, xfactor)
+
+    stack_bars = crosstab(
+        df[df.columns[0]],
+        factor_codes(df, y, yfactor, stack_series, stack_factor),
+        len(stack_factor),
+        factor_codes(df, x, xfactor, x_factor_series, x_factor),
+        len(x_factor),
+        agg
     )
 
-    """
-    2. stack groupごとにそれぞれfactorごとにgroupingする.
-        * すべてのstack groupごとにx_factorの長さが同じである必要があるので,
-          全データに基づくcommon_x_factorを記録しておく.
-    3.
-
-    ax.bar(ind, bar_lengths_for_each_x_factor)
-    """
-
-    stack_bars = []
-    for stack_name in stack_factor:
-        subset = df.loc[stack_group.groups[stack_name]]
-
-        x_factor_series, x_factor = Iget_factor(subset, x, xfactor)
-
-        x_group = subset.groupby(
-            pd.Categorical(
-                x_factor_series,
-                ordered=True,
-                categories=x_factor
-            )
-        )
+    return _stacked_bar_plotter(
+        stack_bars, stack_factor, x_factor, norm, vert, legend, **kwargs)
 
-        subset_for_x_factor = [
-            subset.loc[x_group.groups[xfname]]
-            for xfname in x_factor
-        ]
 
-        stack_heights = pip(
-            it.mapping(lambda df: df.agg(agg).values),
-            it.mapping(lambda arr: arr[0] if len(arr) > 0 else 0),
-            list
-        )(subset_for_x_factor)
+def _normalized(stack_bars: np.ndarray) -> np.ndarray:
+    """
+    Ratio of each stack to the sum of stacks.
+    Ratio is 0 when the sum is 0.
+    """
+    total = stack_bars.sum(axis=0)
+    return np.divide(
+        stack_bars, total,
+        out=np.zeros_like(stack_bars), where=total != 0)
 
-        stack_bars.append(stack_heights)
 
+def _stacked_bar_plotter(stack_bars: np.ndarray, stack_factor, x_factor, norm, vert, legend, **kwargs)->AxPlot:
     if norm:
-        sum = pip(
-            it.mapping(np.sum),
-            list
-        )(zip(*stack_bars))
-
-        stack_bars = pip(
-            it.mapping(lambda bars: pip(
-                it.mapping(lambda t: 0 if t[1] in [
-                           0, None, np.nan] else t[0]/t[1]),
-                list
-            )(zip(bars, sum))),
-            list
-        )(stack_bars)
+        stack_bars = _normalized(stack_bars)
 
     ind = list(range(len(x_factor)))
     plot_arg = {
         **kwargs,
         "tick_label": kwargs.get("tick_label", x_factor)
     }
+    bottoms = np.concatenate([
+        np.zeros((1, len(x_factor))),
+        np.nancumsum(stack_bars, axis=0)[:-1]
+    ])
 
     def plot(ax):
-        prev_top = stack_bars[0]
-        for i, bar in enumerate(stack_bars):
+        for i, (bar, bottom) in enumerate(zip(stack_bars, bottoms)):
             if vert:
                 if i is 0:
                     ax.bar(ind, bar, **plot_arg)
                 else:
                     ax.bar(
-                        ind, bar, bottom=prev_top, **plot_arg)
-                    prev_top = [a+b for a, b in zip(prev_top, bar)]
+                        ind, bar, bottom=bottom, **plot_arg)
             else:
                 if i is 0:
                     ax.barh(ind, bar, **plot_arg)
                 else:
                     ax.barh(
-                        ind, bar, left=prev_top, **plot_arg)
-                    prev_top = [a+b for a, b in zip(prev_top, bar)]
+                        ind, bar, left=bottom, **plot_arg)
 
         ax.legend(stack_factor, **legend)
         """
@@ -174,85 +148,17 @@ def _bar_plotter(
         **kwargs):
 
     stack_factor = y if type(y) is list else [y]
-    stack_bars = []
-    for stack_name in stack_factor:
-        subset = df
-
-        x_factor_series, x_factor = Iget_factor(subset, x, xfactor)
-
-        x_group = subset.groupby(
-            pd.Categorical(
-                x_factor_series,
-                ordered=True,
-                categories=x_factor
-            )
-        )
 
-        subset_for_x_factor = [
-            subset.loc[x_group.groups[xfname]]
-            for xfname in x_factor
-        ]
-
-        stack_heights = pip(
-            it.mapping(lambda df: agg(df[stack_name])),
-            #it.mapping(lambda arr: arr[0] if len(arr) > 0 else 0),
-            list
-        )(subset_for_x_factor)
-
-        stack_bars.append(stack_heights)
-
-    if norm:
-        sum = pip(
-            it.mapping(np.sum),
-            list
-        )(zip(*stack_bars))
-
-        stack_bars = pip(
-            it.mapping(lambda bars: pip(
-                it.mapping(lambda t: 0 if t[1] in [
-                           0, None, np.nan] else t[0]/t[1]),
-                list
-            )(zip(bars, sum))),
-            list
-        )(stack_bars)
-
-    ind = list(range(len(x_factor)))
-    plot_arg = {
-        **kwargs,
-        "tick_label": kwargs.get("tick_label", x_factor)
-    }
+    x_factor_series, x_factor = Iget_factor(df, x, xfactor)
+    x_codes = factor_codes(df, x, xfactor, x_factor_series, x_factor)
 
-    def plot(ax):
-        prev_top = stack_bars[0]
-        for i, bar in enumerate(stack_bars):
-            if vert:
-                if i is 0:
-                    ax.bar(ind, bar, **plot_arg)
-                else:
-                    ax.bar(
-                        ind, bar, bottom=prev_top, **plot_arg)
-                    prev_top = [a+b for a, b in zip(prev_top, bar)]
-            else:
-                if i is 0:
-                    ax.barh(ind, bar, **plot_arg)
-                else:
-                    ax.barh(
-                        ind, bar, left=prev_top, **plot_arg)
-                    prev_top = [a+b for a, b in zip(prev_top, bar)]
+    stack_bars = np.array([
+        aggregate(df[stack_name], x_codes, len(x_factor), agg)
+        for stack_name in stack_factor
+    ]).reshape((len(stack_factor), len(x_factor)))
 
-        ax.legend(stack_factor, **legend)
-        """
-        if vert:
-            ax.set_xticks(ind)
-            ax.set_xticklabels(x_factor)
-            ax.set_xlim([-1, len(x_factor)])
-        else:
-            ax.set_yticks(ind)
-            ax.set_yticklabels(x_factor)
-            ax.set_ylim([-1, len(x_factor)])
-        """
-        return ax
-    return plot
+    return _stacked_bar_plotter(
+        stack_bars, stack_factor, x_factor, norm, vert, legend, **kwargs)
 
 
 def bar(**presetting):
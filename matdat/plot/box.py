@@ -1,5 +1,6 @@
 from .action import default_kwargs, plot_action, generate_arg_and_kwags, get_value, get_subset, Iget_factor
 from .action import DataSource, AxPlot
+from .factor import Grouping
 from typing import Union, List
 import pandas as pd
 
@@ -34,13 +35,8 @@ def _factor_box_plotter(df: DataSource, x, y, *arg, xfactor=None, **kwargs)->AxP
     Generate box plots grouped by a factor column in DataFrame.
 
     """
-    _factor_series, _factor = Iget_factor(df, x, xfactor)
-    _factor_detector = pd.Categorical(
-        _factor_series, ordered=True, categories=_factor)
-
-    _group = df.groupby(_factor_detector)
-    _data_without_nan = [df.loc[_group.groups[fname]][y].dropna()
-                         for fname in _factor]
+    _group, _factor = Grouping.of(df, x, xfactor)
+    _data_without_nan = _group.split(df[y])
 
     def plot(ax):
         if len(_data_without_nan) is 0:
@@ -1,3 +1,5 @@
+import itertools
+import matplotlib
 from cycler import cycler
 
 _fumipo_color = [
@@ -10,3 +12,22 @@ _fumipo_color = [
 fumipo_theme = (
     cycler(color=_fumipo_color)
 )
+
+
+def color_cycle(ax, patches: bool=False):
+    """
+    Function returning the next color of the property cycle of the axes.
+    Colors are taken in the same order as lines (or scatter plots
+        when patches is True) drawn one by one, and the following
+        plots continue the cycle.
+    Colors of rcParams["axes.prop_cycle"] are used when matplotlib
+        does not provide the cycle of the axes.
+    """
+    cycle = getattr(
+        ax, "_get_patches_for_fill" if patches else "_get_lines", None)
+    next_color = getattr(cycle, "get_next_color", None)
+    if callable(next_color):
+        return next_color
+    colors = itertools.cycle(
+        matplotlib.rcParams["axes.prop_cycle"].by_key().get("color", ["C0"]))
+    return lambda: next(colors)
@@ -0,0 +1,311 @@
+import weakref
+import threading
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Optional, Tuple, Union
+
+"""
+Grouping rows of a table by a factor.
+
+Rows are sorted by categorical codes of the factor once,
+    and values of each level are taken as slices of the sorted values
+    without copying the table for each level.
+
+Categories, codes, and grouping of a column are cached for each table
+    object, so that plot actions using the same table and factor do not
+    compute them again.
+Only columns selected by name and levels given as literals are cached,
+    because functions may select different values from the same table.
+Tables must not be modified in place after they are plotted.
+
+Example
+-------
+grouping, categories = Grouping.of(df, "site", None)
+values_of_each_site = grouping.split(df["depth"])
+"""
+
+
+class FactorCache:
+    """
+    Categories, codes, and groupings of columns of tables.
+    Entries are removed when the table is garbage collected.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, df, key: tuple, compute: Callable):
+        """
+        Cached value for the table and the key, or a new value returned
+            by compute().
+        """
+        try:
+            hash(key)
+            ref = weakref.ref(df)
+        except TypeError:
+            return compute()
+
+        with self._lock:
+            table = self.entries.get(id(df))
+            if table is not None and table[0]() is df and key in table[1]:
+                return table[1][key]
+
+        value = compute()
+
+        with self._lock:
+            table = self.entries.get(id(df))
+            if table is None or table[0]() is not df:
+                table = (ref, {})
+                self.entries[id(df)] = table
+                weakref.finalize(df, self.remove, id(df), ref)
+            table[1][key] = value
+        return value
+
+    def remove(self, table_id: int, ref):
+        with self._lock:
+            table = self.entries.get(table_id)
+            if table is not None and table[0] is ref:
+                del self.entries[table_id]
+
+    def clear(self):
+        with self._lock:
+            self.entries = {}
+        return self
+
+
+factor_cache = FactorCache()
+
+
+def cache_key(*values) -> Optional[tuple]:
+    """
+    Key of values computed from selectors and levels.
+    None when some of them is not a str, None, or a list or tuple of
+        hashable values except for callables.
+    """
+    key = []
+    for v in values:
+        if v is None or type(v) is str:
+            key.append(v)
+        elif type(v) in [list, tuple] and all(_is_literal(e) for e in v):
+            key.append((type(v).__name__, tuple(v)))
+        else:
+            return None
+    return tuple(key)
+
+
+def _is_literal(v) -> bool:
+    if callable(v):
+        return False
+    try:
+        hash(v)
+    except TypeError:
+        return False
+    return True
+
+
+def factor_categories(df, f, d: pd.Series) -> pd.Index:
+    """
+    Sorted unique values of the column.
+    """
+    def compute():
+        return d.astype('category').cat.categories
+
+    key = cache_key(f)
+    if key is None:
+        return compute()
+    return factor_cache.get(df, ("categories", *key), compute)
+
+
+def factor_codes(df, f, factor, d: pd.Series, categories) -> np.ndarray:
+    """
+    Position of each value in categories.
+    Values not in categories have -1.
+    Codes are cached when f and factor are literals.
+    """
+    def compute():
+        return np.asarray(pd.Categorical(
+            d, ordered=True, categories=categories).codes, dtype="int64")
+
+    key = cache_key(f, factor)
+    if key is None:
+        return compute()
+    return factor_cache.get(df, ("codes", *key, tuple(categories)), compute)
+
+
+def Iget_factor(
+    df: pd.DataFrame,
+    f: Union[str, Callable[[pd.DataFrame], pd.Series]],
+    factor: Optional[Union[list, Callable[[pd.DataFrame], pd.Series]]]
+)->Tuple[pd.Series, list]:
+    d = f(df) if callable(f) else df[f]
+    if type(factor) is list:
+        return (d, factor)
+    elif callable(factor):
+        return factor(d)
+    else:
+        return (d, factor_categories(df, f, d))
+
+
+_reductions = {
+    "size": "size",
+    len: "size",
+    "count": "count",
+    "sum": "sum",
+    np.sum: "sum",
+    np.nansum: "sum",
+    "mean": "mean",
+    np.mean: "mean",
+    np.nanmean: "mean",
+    "max": "max",
+    np.max: "max",
+    np.nanmax: "max",
+    "min": "min",
+    np.min: "min",
+    np.nanmin: "min",
+}
+
+
+def aggregate(values: pd.Series, codes: np.ndarray, size: int, agg) -> np.ndarray:
+    """
+    Aggregated values of each group in one pass.
+    Common reductions of numeric values are computed by bincount,
+        skipping NaN like pandas.
+    The other aggregations are computed by a single groupby.
+
+    Parameters
+    ----------
+    values: pandas.Series
+    codes: numpy.ndarray
+        Group number of each value.
+        Values with negative codes are ignored.
+    size: int
+        Number of groups.
+    agg: str, callable
+        Aggregation applied to values of each group.
+    """
+    try:
+        method = _reductions.get(agg, None)
+    except TypeError:
+        method = None
+
+    valid = codes >= 0
+    if method is None or not pd.api.types.is_numeric_dtype(values):
+        result = np.full(size, _empty_value(values, agg), dtype="float64")
+        aggregated = values[valid].groupby(codes[valid]).agg(agg)
+        result[aggregated.index.values] = aggregated.values
+        return result
+
+    v = np.asarray(values, dtype="float64")[valid]
+    c = codes[valid]
+    notnull = ~np.isnan(v)
+    if method == "size":
+        return np.bincount(c, minlength=size).astype("float64")
+
+    counts = np.bincount(c[notnull], minlength=size).astype("float64")
+    if method == "count":
+        return counts
+    if method in ["sum", "mean"]:
+        total = np.bincount(c[notnull], weights=v[notnull], minlength=size)
+        if method == "sum":
+            return total
+        return np.divide(total, counts,
+                         out=np.full(size, np.nan), where=counts > 0)
+
+    reduce = np.maximum if method == "max" else np.minimum
+    result = np.full(size, -np.inf if method == "max" else np.inf)
+    reduce.at(result, c[notnull], v[notnull])
+    result[counts == 0] = np.nan
+    return result
+
+
+def _empty_value(values: pd.Series, agg):
+    """
+    Aggregated value of a group without values.
+    """
+    try:
+        return float(values.iloc[:0].agg(agg))
+    except Exception:
+        return np.nan
+
+
+def crosstab(values: pd.Series, row_codes: np.ndarray, n_rows: int, column_codes: np.ndarray, n_columns: int, agg) -> np.ndarray:
+    """
+    Matrix of aggregated values of each pair of groups.
+    """
+    codes = np.where(
+        (row_codes >= 0) & (column_codes >= 0),
+        row_codes * n_columns + column_codes,
+        -1
+    )
+    return aggregate(values, codes, n_rows * n_columns, agg)\
+        .reshape((n_rows, n_columns))
+
+
+class Grouping:
+    """
+    Rows sorted by codes of groups.
+
+    Parameters
+    ----------
+    codes: numpy.ndarray
+        Group number of each row.
+        Rows with negative codes do not belong to any group.
+    n_groups: int
+    """
+
+    def __init__(self, codes: np.ndarray, n_groups: int):
+        self.n_groups = n_groups
+        # Small integers are sorted by radix sort.
+        small = codes.astype("int16") if n_groups < 2**15 else codes
+        order = np.argsort(small, kind="stable")
+        first = np.searchsorted(small[order], 0, side="left")
+        self.order = order[first:]
+        self.bounds = np.searchsorted(
+            small[self.order], np.arange(n_groups + 1), side="left")
+
+    @staticmethod
+    def of(df: pd.DataFrame, f: Union[str, Callable], factor) -> Tuple["Grouping", list]:
+        """
+        Grouping of rows by the factor and its levels.
+
+        Parameters
+        ----------
+        df: pandas.DataFrame
+        f: str, callable
+            Column name or function selecting the factor.
+        factor: list, callable, optional
+            Levels of the factor.
+            Default is sorted unique values of the factor.
+        """
+        d, categories = Iget_factor(df, f, factor)
+
+        def compute():
+            return Grouping(
+                factor_codes(df, f, factor, d, categories), len(categories))
+
+        key = cache_key(f, factor)
+        if key is None:
+            return (compute(), categories)
+        return (
+            factor_cache.get(
+                df, ("grouping", *key, tuple(categories)), compute),
+            categories
+        )
+
+    def counts(self) -> np.ndarray:
+        return np.diff(self.bounds)
+
+    def split(self, values, dropna=True) -> List[np.ndarray]:
+        """
+        Values of each group.
+        Returned arrays are slices of an array of values sorted by groups.
+        """
+        v = np.asarray(values)[self.order]
+        bounds = self.bounds
+        if dropna:
+            keep = ~pd.isnull(v)
+            if not keep.all():
+                v = v[keep]
+                bounds = np.concatenate([[0], np.cumsum(keep)])[bounds]
+        return [v[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
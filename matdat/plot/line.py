@@ -1,24 +1,212 @@
+import numpy as np
+import matplotlib.colors
+from matplotlib.collections import LineCollection
+from typing import List, Optional, Tuple
 from .action import default_kwargs, plot_action, generate_arg_and_kwags, get_value, get_subset
 from .action import DataSource, AxPlot, Selector
+from .cycler import color_cycle
+from ..decimate import as_numeric, numeric_range, minmax_indices, lttb_indices
 
 
-def _line_plotter(df: DataSource, x: Selector, y: Selector, *arg, **kwargs)->AxPlot:
+def _line_plotter(df: DataSource, x: Selector, y: Selector, *arg, decimate=None, x_range=None, **kwargs)->AxPlot:
 
     if len(df) is 0:
         return lambda ax: ax
 
     _x = get_subset()(df, x)
     _y = get_subset()(df, y)
+    decimate = _decimation(decimate, kwargs)
 
     def plot(ax):
-        ax.plot(_x, _y, **kwargs)
+        if decimate is None:
+            ax.plot(_x, _y, **kwargs)
+        else:
+            index = _decimated(_x, _y, decimate, _pixel_width(ax), x_range)
+            ax.plot(_take(_x, index), _take(_y, index), **kwargs)
         return ax
     return plot
 
 
+def _decimation(decimate, kwargs: dict):
+    """
+    Method of decimation of the line.
+    "auto" is "minmax" for lines without markers, otherwise None,
+        because every point drawn as a marker is visible.
+    """
+    if decimate != "auto":
+        return decimate
+    if kwargs.get("marker", None) not in [None, "", " ", "None", "none"]\
+            or kwargs.get("linestyle", None) in ["", " ", "None", "none"]:
+        return None
+    return "minmax"
+
+
+def _pixel_width(ax) -> int:
+    return max(int(np.ceil(ax.get_window_extent().width)), 1)
+
+
+def _decimated(x, y, method: str, width: int, x_range=None):
+    """
+    Indices of points drawn in the width of pixels.
+    None means all points.
+    Only lines whose x values are sorted are decimated.
+    When x_range is given, the pixels divide the range instead of
+        the range of x.
+    """
+    if len(x) != len(y) or np.ndim(y) != 1:
+        return None
+    try:
+        _x = as_numeric(x)
+        _y = as_numeric(y)
+    except (TypeError, ValueError):
+        return None
+
+    finite = _x[~np.isnan(_x)]
+    if np.any(finite[1:] < finite[:-1]):
+        return None
+
+    _range = _visible_range(finite, x_range)
+    if method == "minmax":
+        return minmax_indices(_x, _y, width, _range)
+    elif method == "lttb":
+        if _range is None:
+            return lttb_indices(_x, _y, width)
+        # Buckets of lttb have the same number of points,
+        #   so that points in the range are divided into the width.
+        inside = np.count_nonzero((finite >= _range[0]) & (finite <= _range[1]))
+        return lttb_indices(
+            _x, _y, int(min(width * len(finite) / max(inside, 1), len(finite))))
+    else:
+        raise ValueError(
+            f"decimate must be 'minmax' or 'lttb', but {method} is given.")
+
+
+def _visible_range(x: np.ndarray, lim):
+    """
+    Numeric range of lim.
+    Missing bounds are filled by the range of x.
+    """
+    x_range = numeric_range(lim)
+    if x_range is None or len(x) == 0:
+        return None
+    lo = x[0] if np.isnan(x_range[0]) else x_range[0]
+    hi = x[-1] if np.isnan(x_range[1]) else x_range[1]
+    return (lo, hi) if hi > lo else None
+
+
+def _take(values, index):
+    if index is None:
+        return values
+    if hasattr(values, "iloc"):
+        return values.iloc[index]
+    if hasattr(values, "take"):
+        return values.take(index)
+    return np.asarray(values)[index]
+
+
+def _line_batch_plotter(arg_and_kwarg: List[Tuple[list, dict]])->Optional[AxPlot]:
+    """
+    Draw all lines as a LineCollection.
+    None is returned when some of lines have markers,
+        or when y values are not numeric.
+    Lines without color take colors from the cycle of the axes
+        in the same order as lines drawn separately.
+    """
+    if any(kwargs.get("marker", "") not in ["", "None", "none"]
+           for _, kwargs in arg_and_kwarg):
+        return None
+
+    entries = [(arg, kwargs) for arg, kwargs in arg_and_kwarg
+               if len(arg[0]) is not 0]
+    try:
+        xys = _extract_lines([arg for arg, _ in entries])
+    except (TypeError, ValueError):
+        return None
+
+    def plot(ax):
+        if len(entries) == 0:
+            return ax
+
+        ax.xaxis.update_units(np.asarray(xys[0][0]))
+        # x shared by lines is converted once.
+        converted = {}
+        segments = []
+        colors = []
+        next_color = color_cycle(ax)
+        for (x, y), (_, kwargs) in zip(xys, entries):
+            if id(x) not in converted:
+                converted[id(x)] = np.asarray(ax.xaxis.convert_units(
+                    np.asarray(x)), dtype="float64")
+            _x = converted[id(x)]
+            decimate = _decimation(kwargs.get("decimate", None), kwargs)
+            index = None if decimate is None\
+                else _decimated(x, y, decimate, _pixel_width(ax), kwargs.get("x_range", None))
+            segments.append(np.column_stack([_take(_x, index), _take(y, index)]))
+            colors.append(matplotlib.colors.to_rgba(
+                kwargs.get("color", None) or next_color(),
+                kwargs.get("alpha", None)))
+
+        ax.add_collection(LineCollection(
+            segments,
+            colors=colors,
+            linewidths=[kwargs.get("linewidth", None) for _, kwargs in entries],
+            linestyles=[kwargs.get("linestyle", "-") for _, kwargs in entries]
+        ))
+        ax.autoscale_view()
+        return ax
+    return plot
+
+
+def _extract_lines(args: List[list])->List[tuple]:
+    """
+    x and numeric y of lines.
+    Values are selected at once for lines of the same data and x.
+    """
+    xys = [None] * len(args)
+    groups = {}
+    for k, (df, x, y, *_) in enumerate(args):
+        groups.setdefault((id(df), id(x) if callable(x) else x), []).append(k)
+
+    for ks in groups.values():
+        df, x, *_ = args[ks[0]]
+        _x = get_subset()(df, x)
+        ys = [args[k][2] for k in ks]
+        if hasattr(df, "columns") and all(type(y) is str and y in df.columns for y in ys)\
+                and not df.columns.has_duplicates:
+            values = df[ys].to_numpy(dtype="float64")
+            for n, k in enumerate(ks):
+                xys[k] = (_x, values[:, n])
+        else:
+            for k in ks:
+                xys[k] = (_x, np.asarray(
+                    get_subset()(df, args[k][2]), dtype="float64"))
+    return xys
+
+
 def line(**presetting):
+    """
+    Plot action of line.
+
+    Parameters
+    ----------
+    decimate: str, optional
+        Downsample points to the width of axes in pixel.
+        "minmax": first, last, minimum, and maximum points of each pixel,
+            drawing the same envelope as all points.
+        "lttb": Largest-Triangle-Three-Buckets.
+        "auto": "minmax" for lines without markers, otherwise None.
+        Default is None (all points).
+    x_range: list, optional
+        Range of x shown in the axes, such as xlim of the subplot.
+        Points are decimated to pixels of the range.
+        Default is None (range of x).
+    batch: bool, optional
+        Draw lines of multiple y as a single LineCollection.
+        Lines with markers are drawn separately.
+    """
     return plot_action(
         _line_plotter,
         ["x", "y"],
-        default_kwargs.get("line")
+        default_kwargs.get("line"),
+        _line_batch_plotter
     )(**presetting)
@@ -1,5 +1,11 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.colors
+from typing import List, Optional, Tuple
 from .action import default_kwargs, plot_action, generate_arg_and_kwags, get_value, get_subset, get_literal_or_series
 from .action import DataSource, AxPlot, Selector, LiteralOrSequencer
+from .cycler import color_cycle
 
 
 def _scatter_plotter(
@@ -10,6 +16,11 @@ def _scatter_plotter(
     c: LiteralOrSequencer=None,
     s: LiteralOrSequencer=None,
     marker=None,
+    density=None,
+    aggregate=None,
+    log=None,
+    x_range=None,
+    y_range=None,
     **kwargs
 )->AxPlot:
 
@@ -25,12 +36,257 @@ def _scatter_plotter(
     def plot(ax):
         ax.scatter(_x, _y, s=sizes, c=colors, **kwargs)
         return ax
+
+    def plot_density(ax):
+        _density_plotter(ax, _x, _y, colors, aggregate, log,
+                         x_range=x_range, y_range=y_range, **kwargs)
+        return ax
+    return plot_density if density else plot
+
+
+_aggregations = ["count", "sum", "mean", "max", "min"]
+
+
+def _density_plotter(ax, x, y, c, aggregate=None, log=None, cmap=None, norm=None, vmin=None, vmax=None, alpha=1, x_range=None, y_range=None, **_):
+    """
+    Draw points as an image of pixels of the axes.
+    The value of a pixel is the number of points in it,
+        or aggregated value of c of the points.
+    Pixels cover x_range and y_range, such as xlim and ylim of the subplot.
+    Missing bounds are bounds of the points.
+    """
+    values = c if np.ndim(c) == 1 and len(c) == len(x) else None
+    method = aggregate if aggregate is not None\
+        else "count" if values is None\
+        else "mean"
+    if method not in _aggregations:
+        raise ValueError(
+            f"aggregate must be one of {_aggregations}, but {method} is given.")
+    if method != "count" and values is None:
+        raise ValueError(
+            f"aggregate='{method}' requires c as a sequence of values.")
+    if log and norm is not None:
+        raise ValueError(
+            "log=True can not be used with norm. Pass matplotlib.colors.LogNorm as norm instead.")
+
+    ax.xaxis.update_units(np.asarray(x))
+    ax.yaxis.update_units(np.asarray(y))
+    _x = np.asarray(ax.xaxis.convert_units(np.asarray(x)), dtype="float64")
+    _y = np.asarray(ax.yaxis.convert_units(np.asarray(y)), dtype="float64")
+    _c = None if values is None else np.asarray(values, dtype="float64")
+
+    valid = np.isfinite(_x) & np.isfinite(_y)
+    if _c is not None and method != "count":
+        valid = valid & ~np.isnan(_c)
+    if not valid.any():
+        return ax
+
+    x_range = _visible_range(ax.xaxis, x_range, _x[valid])
+    y_range = _visible_range(ax.yaxis, y_range, _y[valid])
+    valid = valid\
+        & (_x >= x_range[0]) & (_x <= x_range[1])\
+        & (_y >= y_range[0]) & (_y <= y_range[1])
+    if not valid.any():
+        return ax
+
+    _x = _x[valid]
+    _y = _y[valid]
+    _c = None if _c is None else _c[valid]
+
+    extent = ax.get_window_extent()
+    shape = (max(int(np.ceil(extent.height)), 1),
+             max(int(np.ceil(extent.width)), 1))
+
+    grid = _binned(
+        _bin_of(_y, y_range, shape[0]) * shape[1] +
+        _bin_of(_x, x_range, shape[1]),
+        _c, method, shape[0] * shape[1]
+    ).reshape(shape)
+
+    image = np.ma.masked_invalid(grid)
+    if log:
+        image = np.ma.masked_less_equal(image, 0)
+        norm = matplotlib.colors.LogNorm(vmin=vmin, vmax=vmax)
+        vmin = vmax = None
+
+    ax.imshow(
+        image,
+        origin="lower",
+        extent=(*x_range, *y_range),
+        aspect="auto",
+        interpolation="nearest",
+        cmap=cmap,
+        norm=norm,
+        vmin=vmin,
+        vmax=vmax,
+        alpha=alpha
+    )
+    return ax
+
+
+def _visible_range(axis, lim, v: np.ndarray):
+    """
+    Range of pixels in the unit of the axis.
+    Missing bounds of lim are bounds of the values.
+    """
+    lo, hi = float(v.min()), float(v.max())
+    bounds = [] if lim is None else list(lim)[:2]
+    bounds = bounds + [None] * (2 - len(bounds))
+    converted = []
+    for b, default in zip(bounds, [lo, hi]):
+        if b is None or b is pd.NaT or (type(b) is float and np.isnan(b)):
+            converted.append(default)
+            continue
+        b = pd.Timestamp(b) if type(b) is str else b
+        converted.append(float(np.asarray(axis.convert_units(b), dtype="float64")))
+    if converted[1] > converted[0]:
+        return tuple(converted)
+    return _bounds(np.asarray(converted))
+
+
+def _bounds(v: np.ndarray):
+    lo, hi = float(v.min()), float(v.max())
+    if hi > lo:
+        return (lo, hi)
+    # Width of the range is needed for the image.
+    margin = abs(lo) * 0.5 if lo != 0 else 0.5
+    return (lo - margin, hi + margin)
+
+
+def _bin_of(v: np.ndarray, v_range, n_bins: int) -> np.ndarray:
+    lo, hi = v_range
+    return np.clip(
+        ((v - lo) * (n_bins / (hi - lo))).astype("int64"), 0, n_bins - 1)
+
+
+def _binned(bins: np.ndarray, values, method: str, size: int) -> np.ndarray:
+    """
+    Aggregated values of each bin.
+    Bins without points are NaN.
+    """
+    counts = np.bincount(bins, minlength=size).astype("float64")
+    empty = counts == 0
+
+    if method == "count":
+        result = counts
+    elif method == "sum":
+        result = np.bincount(bins, weights=values, minlength=size)
+    elif method == "mean":
+        result = np.bincount(bins, weights=values, minlength=size)\
+            / np.where(empty, 1, counts)
+    elif method == "max":
+        result = np.full(size, -np.inf)
+        np.maximum.at(result, bins, values)
+    else:
+        result = np.full(size, np.inf)
+        np.minimum.at(result, bins, values)
+
+    result[empty] = np.nan
+    return result
+
+
+_shared_scatter_kwargs = [
+    "cmap", "norm", "vmin", "vmax", "alpha",
+    "marker", "edgecolors", "linewidth", "linestyle"
+]
+
+
+def _scatter_batch_plotter(arg_and_kwarg: List[Tuple[list, dict]])->Optional[AxPlot]:
+    """
+    Draw points of all entries as a single PathCollection.
+    None is returned in density mode, when entries have different
+        styles except for c and s, or when some entries have c as
+        color and the others have c as values.
+    Entries without c take colors from the cycle of the axes
+        in the same order as scatter plots drawn separately.
+    """
+    entries = [(arg, kwargs) for arg, kwargs in arg_and_kwarg
+               if len(arg[0]) is not 0]
+    if len(entries) == 0:
+        return lambda ax: ax
+
+    if any(kwargs.get("density", None) for _, kwargs in entries):
+        return None
+    style = {k: entries[0][1][k]
+             for k in _shared_scatter_kwargs if k in entries[0][1]}
+    if any({k: kwargs[k] for k in _shared_scatter_kwargs if k in kwargs} != style
+           for _, kwargs in entries[1:]):
+        return None
+
+    xs = []
+    ys = []
+    cs = []
+    ss = []
+    for (data, x, y, *_), kwargs in entries:
+        xs.append(np.asarray(get_subset()(data, x)))
+        ys.append(np.asarray(get_subset()(data, y)))
+        cs.append(get_literal_or_series(kwargs.get("c", None), data))
+        ss.append(get_literal_or_series(kwargs.get("s", None), data))
+
+    is_values = [_is_sequence(c, len(x)) for c, x in zip(cs, xs)]
+    if any(is_values) and not all(is_values):
+        return None
+
+    try:
+        _x = np.concatenate(xs)
+        _y = np.concatenate(ys)
+    except (TypeError, ValueError):
+        return None
+    sizes = None if all(s is None for s in ss) else np.concatenate([
+        np.asarray(s, dtype="float64") if _is_sequence(s, len(x))
+        else np.full(len(x), matplotlib.rcParams["lines.markersize"] ** 2
+                     if s is None else s, dtype="float64")
+        for s, x in zip(ss, xs)
+    ])
+
+    def plot(ax):
+        if all(is_values):
+            colors = np.concatenate([np.asarray(c) for c in cs])
+        else:
+            next_color = color_cycle(ax, patches=True)
+            colors = np.repeat(
+                [matplotlib.colors.to_rgba(c if c is not None else next_color())
+                 for c in cs],
+                [len(x) for x in xs],
+                axis=0
+            )
+        ax.scatter(_x, _y, s=sizes, c=colors, **style)
+        return ax
     return plot
 
 
+def _is_sequence(v, n: int) -> bool:
+    return np.ndim(v) == 1 and len(v) == n and type(v) is not tuple
+
+
 def scatter(**presetting):
+    """
+    Plot action of scatter.
+
+    Parameters
+    ----------
+    density: bool, optional
+        Draw points as an image whose pixels correspond to pixels of
+            the axes, instead of drawing a marker for each point.
+        Default is None (markers).
+    aggregate: str, optional
+        Value of each pixel in density mode.
+        "count", "sum", "mean", "max", or "min" of c.
+        Default is "mean" when c is a sequence, otherwise "count".
+    log: bool, optional
+        Logarithmic color scale in density mode.
+        It can not be used with norm.
+    x_range, y_range: list, optional
+        Ranges shown in the axes, such as xlim and ylim of the subplot.
+        Pixels of density mode cover the ranges.
+        Default is None (range of points).
+    batch: bool, optional
+        Draw points of multiple x or y as a single PathCollection.
+        Points without c take colors from the cycle of the axes.
+    """
     return plot_action(
         _scatter_plotter,
         ["x", "y"],
-        {**default_kwargs.get("scatter")}
+        {**default_kwargs.get("scatter")},
+        _scatter_batch_plotter
     )(**presetting)
@@ -1,7 +1,10 @@
 from .action import default_kwargs, plot_action, generate_arg_and_kwags, get_value, get_subset, Iget_factor
 from .action import DataSource, AxPlot
+from .factor import Grouping, factor_cache, cache_key
 import pandas as pd
 import numpy as np
+import matplotlib.cbook as cbook
+import matplotlib.mlab as mlab
 from func_helper import pip
 import func_helper.func_helper.iterator as it
 
@@ -13,27 +16,33 @@ def _factor_violin_plotter(
         widths=0.5,
         scale="width",
         xfactor=None,
+        points=100,
+        bw_method=None,
+        kde="fft",
+        sample=None,
         **kwargs)->AxPlot:
     """
     factorが与えられたときはfactorでgroupbyする.
     与えられなかったときはdf[f]でgroupbyする.
+    密度はfactorの水準ごとに計算し, 同じtableオブジェクトについてcacheする.
     """
-    _factor_series, _factor = Iget_factor(df, x, xfactor)
-    _factor_detector = pd.Categorical(
-        _factor_series, ordered=True, categories=_factor)
-
-    _group = df.groupby(_factor_detector)
-    _data_without_nan = [df.loc[_group.groups[fname]][y].dropna()
-                         for fname in _factor]
+    _group, _factor = Grouping.of(df, x, xfactor)
+    _data_without_nan = _group.split(get_subset()(df, y))
 
     _subset_hasLegalLength = pip(
         it.filtering(lambda iv: len(iv[1]) > 0),
         list
     )(enumerate(_data_without_nan))
 
-    dataset = [iv[1].values for iv in _subset_hasLegalLength]
+    dataset = [iv[1] for iv in _subset_hasLegalLength]
     positions = [iv[0] for iv in _subset_hasLegalLength]
 
+    _levels = [_factor[i] for i in positions]
+    vpstats = [
+        _violin_stats(df, x, y, xfactor, level, d, points, bw_method, kde, sample)
+        for level, d in zip(_levels, dataset)
+    ]
+
     if scale is "count":
         count = [len(d) for d in dataset]
         variance = [np.var(d) for d in dataset]
@@ -47,8 +56,8 @@ def _factor_violin_plotter(
             print("No data for violin plot")
             return ax
 
-        parts = ax.violinplot(
-            dataset=dataset,
+        parts = ax.violin(
+            vpstats,
             positions=positions,
             widths=_widths,
             **kwargs
@@ -81,6 +90,102 @@ def _factor_violin_plotter(
     return plot
 
 
+def _violin_stats(df, x, y, xfactor, level, values, points, bw_method, kde, sample) -> dict:
+    """
+    Statistics of a violin.
+    They are cached for the same table object, the factor level,
+        and the options of density estimation,
+        only when x and y are column names, xfactor is None or a list,
+        and bw_method is not callable.
+    A table equal to the cached one but created again is estimated again.
+    """
+    def compute():
+        return cbook.violin_stats(
+            [values], _kde_method(bw_method, kde, sample), points=points)[0]
+
+    key = cache_key(x, y, xfactor)
+    if key is None or callable(bw_method):
+        return compute()
+    return factor_cache.get(
+        df, ("violin", *key, level, points, bw_method, kde, sample), compute)
+
+
+def _kde_method(bw_method, kde="fft", sample=None):
+    """
+    Function evaluating kernel density at coordinates.
+
+    Parameters
+    ----------
+    bw_method: str, float, callable, optional
+        Same as bw_method of matplotlib.pyplot.violinplot.
+    kde: str, optional
+        "fft": binned kernel density estimation by FFT.
+        "exact": matplotlib.mlab.GaussianKDE.
+        Callable bw_method always uses "exact".
+    sample: int, optional
+        Maximum number of values used for the estimation.
+        Values are sampled randomly when there are more values.
+    """
+    def method(x, coords):
+        if sample is not None and len(x) > sample:
+            x = np.random.default_rng(0).choice(x, sample, replace=False)
+        if np.all(x[0] == x):
+            return (x[0] == coords).astype(float)
+        if kde == "exact" or callable(bw_method):
+            return mlab.GaussianKDE(x, bw_method).evaluate(coords)
+        return binned_kde(x, coords, _bandwidth_factor(bw_method, len(x)))
+    return method
+
+
+def _bandwidth_factor(bw_method, n: int) -> float:
+    """
+    Same factor as matplotlib.mlab.GaussianKDE for 1 dimensional data.
+    """
+    if bw_method is None or bw_method == "scott":
+        return n ** (-1. / 5)
+    elif bw_method == "silverman":
+        return (n * 3 / 4.) ** (-1. / 5)
+    elif np.isscalar(bw_method) and not isinstance(bw_method, str):
+        return bw_method
+    else:
+        raise ValueError(
+            "bw_method should be 'scott', 'silverman', a scalar or a callable.")
+
+
+def binned_kde(x: np.ndarray, coords: np.ndarray, factor: float, grid_size: int=1024) -> np.ndarray:
+    """
+    Gaussian kernel density at coordinates estimated by linear binning
+        and convolution with FFT.
+    The bandwidth is the standard deviation of x multiplied by factor.
+    """
+    x = np.asarray(x, dtype="float64")
+    n = len(x)
+    sigma = np.std(x, ddof=1) * factor
+    lo = min(np.min(x), coords[0])
+    hi = max(np.max(x), coords[-1])
+
+    # The grid must be finer than the bandwidth.
+    size = int(min(max(grid_size, np.ceil(4 * (hi - lo) / sigma) + 1), 2**20))
+    delta = (hi - lo) / (size - 1)
+
+    position = (x - lo) / delta
+    left = np.clip(np.floor(position).astype("int64"), 0, size - 2)
+    right_weight = position - left
+    counts = np.bincount(left, weights=1 - right_weight, minlength=size)\
+        + np.bincount(left + 1, weights=right_weight, minlength=size)
+
+    radius = int(min(np.ceil(5 * sigma / delta), size - 1))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) * delta / sigma) ** 2)
+
+    n_fft = 1 << int(np.ceil(np.log2(size + 2 * radius)))
+    convolved = np.fft.irfft(
+        np.fft.rfft(counts, n_fft) * np.fft.rfft(kernel, n_fft), n_fft
+    )[radius:radius + size]
+    density = np.maximum(convolved, 0) / (n * sigma * np.sqrt(2 * np.pi))
+
+    return np.interp(coords, lo + delta * np.arange(size), density)
+
+
 def factor_violin(**presetting):
     """
     factor_violine
@@ -108,9 +213,18 @@ def factor_violin(**presetting):
             "bw_method":None,
             "scale" : "width",
             "bodies": None,
-            "cmeans": None
+            "cmeans": None,
+            "kde": "fft",
+            "sample": None
         }
 
+    Densities are estimated by binned kernel density estimation with FFT.
+    Set kde="exact" to evaluate the gaussian kernel at each value.
+    When sample is given, densities are estimated from at most sample
+        values of each violin.
+    Statistics of violins are cached for the table,
+        so that the same table is plotted again without estimation.
+
     If scale is "width", each violin has the same width.
     Else of scale is "count", each violin has the width proportional
         to its data size.
@@ -127,5 +241,5 @@ def factor_violin(**presetting):
     return plot_action(
         _factor_violin_plotter,
         ["x", "y"],
-        {**default_kwargs.get("violin"), "xfactor": None}
+        {**default_kwargs.get("violin"), "xfactor": None, "kde": "fft", "sample": None}
     )(**presetting)
@@ -0,0 +1,158 @@
+"""
+Column projection.
+
+Subplot collects names of columns used by plot actions and transformers.
+Then, file readers parse only these columns.
+
+Callable selectors and transformers are opaque.
+They must declare the columns they use by `requires`,
+    otherwise all columns are read.
+
+Plot actions made by plot_action declare which option keys are
+    column selectors.
+Other plot actions may use any option as a column name,
+    so all columns are read when a subplot has such an action.
+They can declare the keys by `selector_keys` attribute.
+
+Example
+-------
+def custom_action(df, option):
+    return lambda ax: ax.plot(df[option["x"]], df[option["depth"]])
+
+custom_action.selector_keys = ["x", "depth"]
+"""
+
+from typing import Callable, Iterable, Optional, FrozenSet
+from func_helper import identity
+
+# Keys of plot option whose values are column selectors.
+selector_keys = ["x", "y", "c", "s", "ex", "ey", "text"]
+
+
+def requires(*columns: str):
+    """
+    Declare columns used by a callable selector or transformer.
+
+    Example
+    -------
+    subplot.add(
+        data=getFileList(matchCsv)(directory),
+        transformer=requires("a", "b")(lambda df: df.assign(c=df.a + df.b)),
+        x="c",
+        y=requires("d")(lambda df: df["d"] * 2),
+        plot=[plot.line()]
+    )
+    """
+    def wrapper(f: Callable) -> Callable:
+        declared = frozenset(columns) | declared_columns(f, frozenset())
+        try:
+            f.required_columns = declared
+            return f
+        except AttributeError:
+            # Built-in functions can not have attributes.
+            return Requires(f, declared)
+    return wrapper
+
+
+class Requires:
+    def __init__(self, f: Callable, columns: FrozenSet[str]):
+        self.f = f
+        self.required_columns = columns
+
+    def __call__(self, *arg, **kwargs):
+        return self.f(*arg, **kwargs)
+
+
+def declared_columns(f: Callable, default=None) -> Optional[FrozenSet[str]]:
+    if f is identity:
+        return frozenset()
+    return getattr(f, "required_columns", default)
+
+
+class ColumnSelector:
+    """
+    Callable passed as usecols of pandas.read_csv and pandas.read_excel.
+    Names not in the file are ignored.
+    """
+
+    def __init__(self, columns: Iterable[str]):
+        self.columns = frozenset(columns)
+
+    def __call__(self, column) -> bool:
+        return column in self.columns
+
+    def __repr__(self):
+        return f"ColumnSelector({sorted(self.columns)})"
+
+
+def collect_columns(values: Iterable, selector: bool=True) -> Optional[set]:
+    """
+    Collect column names from selectors.
+    Return None when some columns can not be known.
+
+    Parameters
+    ----------
+    values: Iterable
+        Column names, callables, or nested list or tuple of them.
+    selector: bool, optional
+        If True, values other than str, callable, and None make
+            the columns unknown.
+        Default is True.
+    """
+    columns = set()
+    for v in values:
+        if v is None:
+            continue
+        elif type(v) is str:
+            if v != "index":
+                columns.add(v)
+        elif type(v) in [list, tuple]:
+            nested = collect_columns(v, selector)
+            if nested is None:
+                return None
+            columns |= nested
+        elif callable(v):
+            declared = declared_columns(v)
+            if declared is None:
+                return None
+            columns |= declared
+        elif selector:
+            return None
+    return columns
+
+
+def is_projectable(meta: dict) -> bool:
+    """
+    Projection is not applied when columns are already selected,
+        named by position, or renamed.
+    """
+    if any(key in meta for key in ["usecols", "names"]):
+        return False
+    if "header" in meta and meta["header"] is None:
+        return False
+    for key in ["index_col", "parse_dates"]:
+        v = meta.get(key, None)
+        if v in [None, False] or type(v) is str:
+            continue
+        if type(v) in [list, tuple] and all(type(e) is str for e in v):
+            continue
+        return False
+    return True
+
+
+def project(meta: dict, columns: Optional[Iterable[str]]) -> dict:
+    """
+    Add usecols to read options.
+    """
+    if columns is None or not is_projectable(meta):
+        return meta
+
+    names = set(columns)
+    for key in ["index_col", "parse_dates"]:
+        v = meta.get(key, None)
+        if type(v) is str:
+            names.add(v)
+        elif type(v) in [list, tuple]:
+            names |= set(v)
+
+    return {**meta, "usecols": ColumnSelector(names)}
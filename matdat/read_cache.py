@@ -0,0 +1,206 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional
+import pandas as pd
+from .get_path import PathList
+
+"""
+Memory cache of tables read by subplots.
+
+A table is identified by the files of the data source,
+    options for reading them, transformers, and hints such as
+    required columns and time window.
+Files are identified by their path, size, and modification time,
+    so that modified files are read again.
+
+Example
+-------
+# Cache shared by subplots of a figure
+figure = Figure(read_cache=True)
+
+# Cache shared in the process
+from matdat.read_cache import read_cache
+figure = Figure(read_cache=read_cache)
+subplot.set_read_cache(read_cache)
+
+read_cache.invalidate(path)
+read_cache.clear()
+"""
+
+
+class ReadCache:
+    """
+    Least recently used tables are evicted when total size of cached
+        tables exceeds max_bytes, or when the number of them exceeds
+        max_entries.
+    When the same table is requested while it is being read by another
+        thread, the thread waits for it instead of reading it again.
+
+    Parameters
+    ----------
+    max_bytes: int, optional
+        Upper limit of total memory usage of cached tables.
+        Memory usage includes values of object columns such as strings.
+        Default is 512 MiB.
+    max_entries: int, optional
+        Upper limit of the number of cached tables.
+        Default is 64.
+    """
+
+    def __init__(self, max_bytes: int=512*1024*1024, max_entries: int=64):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.loading = {}
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def source_key(data_source) -> Optional[tuple]:
+        """
+        Path, size, and modification time of files of the data source.
+        None for data sources other than files.
+        """
+        if type(data_source) is PathList:
+            paths = data_source.files()
+        elif type(data_source) in [list, tuple]:
+            paths = data_source
+        elif type(data_source) is str:
+            paths = [data_source]
+        else:
+            return None
+
+        files = []
+        for path in paths:
+            if type(path) is not str:
+                return None
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            files.append(
+                (os.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+        return tuple(files)
+
+    @staticmethod
+    def key(data_source, *identity) -> Optional[tuple]:
+        """
+        Key of a table.
+        None means that the table is not cached.
+
+        Parameters
+        ----------
+        data_source:
+            Path like data source.
+        *identity:
+            Other values identifying the table.
+            They are compared by their json representation,
+                and objects are represented by repr().
+        """
+        files = ReadCache.source_key(data_source)
+        if files is None:
+            return None
+        return (files, json.dumps(identity, sort_keys=True, default=repr))
+
+    @staticmethod
+    def sizeof(df) -> int:
+        """
+        Memory usage of the table, measured once when it is cached.
+        """
+        if type(df) is pd.DataFrame:
+            return int(df.memory_usage(index=True, deep=True).sum())
+        return 0
+
+    def load(self, key: Optional[tuple], read: Callable[[], pd.DataFrame]):
+        """
+        Cached table, or a new table returned by read().
+        """
+        if key is None:
+            return read()
+
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits = self.hits + 1
+                return self.entries[key][0]
+
+            future = self.loading.get(key, None)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self.loading[key] = future
+                self.misses = self.misses + 1
+            else:
+                self.hits = self.hits + 1
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            df = read()
+        except BaseException as e:
+            with self._lock:
+                del self.loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self.loading[key]
+            self.put(key, df)
+        future.set_result(df)
+        return df
+
+    def put(self, key: tuple, df):
+        size = ReadCache.sizeof(df)
+        if size > self.max_bytes:
+            return self
+
+        if key in self.entries:
+            self.total = self.total - self.entries.pop(key)[1]
+        self.entries[key] = (df, size)
+        self.total = self.total + size
+
+        while len(self.entries) > 0 and (
+                self.total > self.max_bytes or len(self.entries) > self.max_entries):
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.total = self.total - evicted
+        return self
+
+    def invalidate(self, path: Optional[str]=None):
+        """
+        Remove tables read from the file.
+        All tables are removed when path is None.
+        """
+        if path is None:
+            return self.clear()
+
+        abspath = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self.entries.keys()
+                        if any(f[0] == abspath for f in k[0])]:
+                self.total = self.total - self.entries.pop(key)[1]
+        return self
+
+    def clear(self):
+        with self._lock:
+            self.entries = OrderedDict()
+            self.total = 0
+        self.hits = 0
+        self.misses = 0
+        return self
+
+    def info(self) -> dict:
+        return {
+            "count": len(self.entries),
+            "bytes": self.total,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+read_cache = ReadCache()
@@ -0,0 +1,186 @@
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+
+
+class Schema:
+    """
+    Data types of columns applied in parsing tables.
+
+    The schema is declared or inferred from the first chunk of the first
+        file, then reused for the other chunks and files.
+    Float columns can be downcasted to float32.
+    String columns having few unique values can be categorical,
+        and the others can be arrow backed strings.
+
+    Example
+    -------
+    schemas.register(
+        "logger",
+        Schema(float32=True, category=True, string="pyarrow")
+    )
+
+    subplot.add(
+        data=getFileList(matchCsv)(directory),
+        dataInfo={"header": 3},
+        schema="logger",
+        ...
+    )
+
+    Parameters
+    ----------
+    dtype: dict, optional
+        Declared data types of columns.
+        When it is given, the schema is not inferred.
+    float32: bool, optional
+        Downcast float64 columns to float32.
+        Default is False.
+    category: bool, List[str], optional
+        If True, string columns with ratio of unique values less than
+            max_category_ratio become categorical.
+        List of column names can be given explicitly.
+        Default is False.
+    max_category_ratio: float, optional
+        Default is 0.5.
+    string: str, optional
+        "pyarrow" or "python".
+        Data type of string columns not categorical.
+        Default is None (object).
+    """
+
+    def __init__(self,
+                 dtype: Optional[dict]=None,
+                 float32: bool=False,
+                 category: Union[bool, List[str]]=False,
+                 max_category_ratio: float=0.5,
+                 string: Optional[str]=None):
+        self.dtype = {} if dtype is None else {**dtype}
+        self.declared = {**self.dtype}
+        self.float32 = float32
+        self.category = category
+        self.max_category_ratio = max_category_ratio
+        self.string = string
+        self.categories = set(category) if type(category) is list else set()
+        self.resolved = dtype is not None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = {**self.__dict__}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def settings(self) -> dict:
+        """
+        Settings deciding data types of tables parsed with the schema.
+        """
+        return {
+            "dtype": self.declared,
+            "float32": self.float32,
+            "category": self.category,
+            "max_category_ratio": self.max_category_ratio,
+            "string": self.string
+        }
+
+    def string_dtype(self):
+        if self.string is None:
+            return None
+        return pd.StringDtype(self.string)
+
+    def parse_dtype(self) -> dict:
+        """
+        Data types passed to pandas.read_csv and pandas.read_excel.
+        Categorical columns are converted after concatenating chunks,
+            because categories of chunks are different.
+        """
+        if not self.resolved:
+            return {}
+        return {k: v for k, v in self.dtype.items() if k not in self.categories}
+
+    def infer(self, df: pd.DataFrame):
+        """
+        Infer data types from a chunk.
+        """
+        with self._lock:
+            if self.resolved:
+                return self
+
+            dtype = {}
+            for column in df.columns:
+                series = df[column]
+                if self.float32 and series.dtype == np.float64:
+                    dtype[column] = np.float32
+                elif series.dtype == object and series.map(type).eq(str).all():
+                    if self.is_category(column, series):
+                        self.categories.add(column)
+                        dtype[column] = "category"
+                    elif self.string_dtype() is not None:
+                        dtype[column] = self.string_dtype()
+
+            self.dtype = dtype
+            self.resolved = True
+        return self
+
+    def is_category(self, column, series: pd.Series) -> bool:
+        if type(self.category) is list:
+            return column in self.category
+        if not self.category or len(series) == 0:
+            return False
+        return series.nunique() / len(series) <= self.max_category_ratio
+
+    def apply(self, df):
+        """
+        Infer schema if needed and cast columns except categorical ones.
+        """
+        if type(df) is not pd.DataFrame:
+            return df
+        self.infer(df)
+        dtype = {k: v for k, v in self.parse_dtype().items()
+                 if k in df.columns and df[k].dtype != v}
+        return df.astype(dtype) if len(dtype) > 0 else df
+
+    def finalize(self, df):
+        """
+        Convert categorical columns of concatenated table.
+        """
+        if type(df) is not pd.DataFrame:
+            return df
+        columns = [c for c in self.categories
+                   if c in df.columns and df[c].dtype.name != "category"]
+        if len(columns) == 0:
+            return df
+        return df.astype({c: "category" for c in columns})
+
+
+class SchemaRegistry:
+    """
+    Schemas identified by names of data sources or presets.
+    """
+
+    def __init__(self):
+        self.schemas: Dict[str, Schema] = {}
+
+    def register(self, name: str, schema: Schema):
+        self.schemas[name] = schema
+        return self
+
+    def get(self, name: str) -> Optional[Schema]:
+        return self.schemas.get(name, None)
+
+    def resolve(self, schema: Optional[Union[str, Schema]]) -> Optional[Schema]:
+        if schema is None or type(schema) is Schema:
+            return schema
+        if schema not in self.schemas:
+            raise KeyError(f"Schema is not registered: {schema}")
+        return self.schemas[schema]
+
+    def clear(self):
+        self.schemas = {}
+        return self
+
+
+schemas = SchemaRegistry()
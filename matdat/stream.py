@@ -0,0 +1,339 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple, Union
+from .decimate import as_numeric, minmax_indices, numeric_range
+
+"""
+Consumers of chunks of pandas.DataFrame for streaming plot.
+
+Chunks flow through transformers into a consumer,
+    and the consumer keeps only a bounded size of data.
+The result of the consumer is a small pandas.DataFrame plotted by
+    usual plot actions.
+
+Example
+-------
+from matdat import stream
+
+subplot = Subplot().add(
+    data=path_to_huge_csv,
+    dataInfo={"header": 0},
+    stream=stream.LineDecimator(x="time", y="value", width=1000),
+    x="time",
+    y="value",
+    plot=[plot.line()]
+)
+"""
+
+
+def _selected(df: pd.DataFrame, column: Optional[str]):
+    return df.index if column in [None, "index"] else df[column]
+
+
+class IConsumer:
+    """
+    Consumers are created with their configuration,
+        and fresh() returns a new consumer with the same configuration.
+    """
+
+    def __init__(self, **config):
+        self.config = config
+
+    def fresh(self):
+        return type(self)(**self.config)
+
+    def required_columns(self) -> Optional[set]:
+        """
+        Names of columns consumed.
+        None means all columns.
+        """
+        return None
+
+    def consume(self, df: pd.DataFrame):
+        return self
+
+    def result(self) -> pd.DataFrame:
+        return pd.DataFrame()
+
+
+class RunningLimits(IConsumer):
+    """
+    Running minimum and maximum of columns.
+    The result has index of "min" and "max".
+
+    Parameters
+    ----------
+    columns: List[str], optional
+        Default is all numeric and datetime columns.
+    """
+
+    def __init__(self, columns: Optional[List[str]]=None):
+        super().__init__(columns=columns)
+        self.columns = columns
+        self.low = None
+        self.high = None
+
+    def consume(self, df: pd.DataFrame):
+        subset = df.select_dtypes(include=["number", "datetime"])\
+            if self.columns is None else df[self.columns]
+        if len(subset) == 0:
+            return self
+
+        low = subset.min()
+        high = subset.max()
+        self.low = low if self.low is None\
+            else pd.concat([self.low, low], axis=1).min(axis=1)
+        self.high = high if self.high is None\
+            else pd.concat([self.high, high], axis=1).max(axis=1)
+        return self
+
+    def required_columns(self) -> Optional[set]:
+        return None if self.columns is None else set(self.columns)
+
+    def extreme_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Positions of rows having minimum or maximum of the columns in df.
+        """
+        subset = df.select_dtypes(include=["number", "datetime"])\
+            if self.columns is None else df[self.columns]
+        positions = []
+        for c in subset.columns:
+            values = as_numeric(subset[c])
+            if np.isnan(values).all():
+                continue
+            positions += [np.nanargmin(values), np.nanargmax(values)]
+        return np.unique(np.array(positions, dtype="int64"))
+
+    def result(self) -> pd.DataFrame:
+        if self.low is None:
+            return pd.DataFrame()
+        return pd.DataFrame({"min": self.low, "max": self.high}).T
+
+
+class LineDecimator(IConsumer):
+    """
+    Keep the first, last, minimum, and maximum points of y
+        in each pixel-width bucket of x.
+
+    Parameters
+    ----------
+    x: str, optional
+        Column name of x.
+        Default is None (index).
+    y: str, List[str]
+        Column names of y.
+    width: int, optional
+        Number of buckets, typically the width of axes in pixel.
+        Default is 1000.
+    xlim: list, optional
+        Range of x.
+        When it is given, buckets are fixed and the result is exact.
+    """
+
+    def __init__(self, y: Union[str, List[str]], x: Optional[str]=None, width: int=1000, xlim: Optional[list]=None):
+        super().__init__(y=y, x=x, width=width, xlim=xlim)
+        self.x = x
+        self.ys = y if type(y) is list else [y]
+        self.width = width
+        self.x_range = LineDecimator.as_range(xlim)
+        self.buffer = []
+        self.buffered = 0
+
+    @staticmethod
+    def as_range(lim: Optional[list]) -> Optional[Tuple[float, float]]:
+        if lim is None or len(lim) < 2 or any(v is None for v in lim[:2]):
+            return None
+        return numeric_range(lim)
+
+    def required_columns(self) -> Optional[set]:
+        return set(self.ys) | ({self.x} - {None, "index"})
+
+    def reduce(self, df: pd.DataFrame, n_buckets: int) -> pd.DataFrame:
+        x = _selected(df, self.x)
+        positions = np.unique(np.concatenate([
+            minmax_indices(x, df[y], n_buckets, self.x_range)
+            for y in self.ys
+        ]))
+        return df.iloc[positions]
+
+    def consume(self, df: pd.DataFrame):
+        if len(df) == 0:
+            return self
+        reduced = self.reduce(df, self.width)
+        self.buffer.append(reduced)
+        self.buffered = self.buffered + len(reduced)
+
+        # Compact with finer buckets to keep the envelope.
+        if self.buffered > 64 * 4 * self.width:
+            compacted = self.reduce(
+                pd.concat(self.buffer), 16 * self.width)
+            self.buffer = [compacted]
+            self.buffered = len(compacted)
+        return self
+
+    def result(self) -> pd.DataFrame:
+        if len(self.buffer) == 0:
+            return pd.DataFrame()
+        return self.reduce(pd.concat(self.buffer), self.width)
+
+
+class ReservoirSample(IConsumer):
+    """
+    Uniform random sample of rows with fixed size.
+    Rows with minimum and maximum values are also kept
+        for the limits of axes.
+
+    Parameters
+    ----------
+    size: int, optional
+        Number of sampled rows.
+        Default is 100,000.
+    keep_extremes: bool, optional
+        Default is True.
+    seed: int, optional
+    """
+
+    def __init__(self, size: int=100000, keep_extremes: bool=True, seed: Optional[int]=None):
+        super().__init__(size=size, keep_extremes=keep_extremes, seed=seed)
+        self.size = size
+        self.keep_extremes = keep_extremes
+        self.random = np.random.RandomState(seed)
+        self.limits = RunningLimits()
+        self.sample = None
+        self.keys = np.array([])
+        self.extremes = None
+
+    def consume(self, df: pd.DataFrame):
+        if len(df) == 0:
+            return self
+
+        # Bottom-k of uniform random keys is a uniform sample.
+        keys = self.random.random_sample(len(df))
+        candidates = df if self.sample is None else pd.concat(
+            [self.sample, df])
+        all_keys = np.concatenate([self.keys, keys])
+        if len(all_keys) > self.size:
+            chosen = np.sort(np.argpartition(
+                all_keys, self.size - 1)[:self.size])
+        else:
+            chosen = np.arange(len(all_keys))
+        self.sample = candidates.iloc[chosen]
+        self.keys = all_keys[chosen]
+
+        if self.keep_extremes:
+            extremes = df.iloc[self.limits.extreme_rows(df)]
+            merged = extremes if self.extremes is None\
+                else pd.concat([self.extremes, extremes])
+            self.extremes = merged.iloc[self.limits.extreme_rows(merged)]
+        return self
+
+    def result(self) -> pd.DataFrame:
+        if self.sample is None:
+            return pd.DataFrame()
+        if self.extremes is None:
+            return self.sample
+        return pd.concat([self.sample, self.extremes])
+
+
+class Histogram(IConsumer):
+    """
+    Binned counts of a column.
+    The result has columns of "left", "right", "center", and "count".
+
+    Parameters
+    ----------
+    column: str
+    bins: int, optional
+        Default is 100.
+    range: tuple, optional
+        Range of bins.
+        Default is decided by the first chunk, and bins are extended
+            with the same width when values out of the range come.
+    max_bins: int, optional
+        Upper limit of the number of bins extended.
+        When more bins are needed, the width of bins is doubled and
+            neighbouring bins are merged.
+        Default is 4 times bins.
+    """
+
+    def __init__(self, column: str, bins: int=100, range: Optional[Tuple[float, float]]=None, max_bins: Optional[int]=None):
+        super().__init__(column=column, bins=bins, range=range, max_bins=max_bins)
+        self.column = column
+        self.bins = bins
+        self.range = range
+        self.max_bins = max(max_bins if max_bins is not None else 4 * bins, bins, 2)
+        self.origin = None
+        self.bin_width = None
+        self.counts = np.zeros(0, dtype="int64")
+
+    def required_columns(self) -> Optional[set]:
+        return {self.column} - {None, "index"}
+
+    def consume(self, df: pd.DataFrame):
+        values = as_numeric(_selected(df, self.column))
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+
+        if self.origin is None:
+            lo, hi = self.range if self.range is not None\
+                else (values.min(), values.max())
+            self.origin = lo
+            self.bin_width = (hi - lo) / self.bins if hi > lo else 1.
+            self.counts = np.zeros(self.bins, dtype="int64")
+
+        if self.range is not None:
+            lo, hi = self.range
+            values = values[(values >= lo) & (values <= hi)]
+            if len(values) == 0:
+                return self
+
+        # Bins are merged before extending them,
+        #   so that counts larger than max_bins are never allocated.
+        while self.span(values) > self.max_bins:
+            self.merge()
+
+        k = np.floor((values - self.origin) / self.bin_width).astype("int64")
+        if self.range is not None:
+            k = np.clip(k, 0, len(self.counts) - 1)
+
+        shift = max(-k.min(), 0)
+        size = max(len(self.counts) + shift, k.max() + shift + 1)
+        counts = np.zeros(size, dtype="int64")
+        counts[shift:shift + len(self.counts)] = self.counts
+        counts = counts + np.bincount(k + shift, minlength=size)
+
+        self.counts = counts
+        self.origin = self.origin - shift * self.bin_width
+        return self
+
+    def span(self, values: np.ndarray) -> int:
+        """
+        Number of bins covering the current bins and the values.
+        """
+        if self.range is not None:
+            return len(self.counts)
+        low = np.floor((values.min() - self.origin) / self.bin_width)
+        high = np.floor((values.max() - self.origin) / self.bin_width)
+        return int(max(len(self.counts) - 1, high) - min(0, low) + 1)
+
+    def merge(self):
+        """
+        Double the width of bins by merging neighbouring bins.
+        """
+        counts = self.counts if len(self.counts) % 2 == 0\
+            else np.append(self.counts, 0)
+        self.counts = counts.reshape((-1, 2)).sum(axis=1)
+        self.bin_width = self.bin_width * 2
+        return self
+
+    def result(self) -> pd.DataFrame:
+        if self.origin is None:
+            return pd.DataFrame(columns=["left", "right", "center", "count"])
+        left = self.origin + self.bin_width * np.arange(len(self.counts))
+        return pd.DataFrame({
+            "left": left,
+            "right": left + self.bin_width,
+            "center": left + self.bin_width / 2,
+            "count": self.counts
+        })
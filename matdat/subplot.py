@@ -1,9 +1,12 @@
 from func_helper import identity, pip
 import func_helper.func_helper.iterator as it
-import func_helper.func_helper.dataframe as dataframe
 import func_helper.func_helper.dictionary as dictionary
 from . import plot
 from .get_path import getFileList, PathList
+from .projection import collect_columns
+from .schema import schemas
+from .read_cache import ReadCache
+from .pipeline import Pipeline, FilterBetween
 from .i_subplot import ISubplot
 import pandas as pd
 from typing import List, Tuple, Callable, Union, Optional,TypeVar
@@ -31,6 +34,13 @@ def mix_dict(target: dict, mix_dict: dict, consume: bool=False)->dict:
     return d, mix_dict
 
 
+def wrap_by_list(a:Union[T,list])->list:
+    """
+    Wrap not list parameter by list.
+    """
+    return a if type(a) is list else [a]
+
+
 def wrap_by_tuple(a:Union[T,tuple])->Union[Tuple[T],tuple]:
     """
     Wrap not tuple parameter by tuple.
@@ -76,8 +86,13 @@ class Subplot(ISubplot):
         self.plotMethods = []
         self.option = []
         self.is_second_axes = []
+        self.stream = []
+        self.schema = []
         self.filter_x = False
         self.title = None
+        self.loader_option = {}
+        self.prefetched = {}
+        self.read_cache = None
 
         default_axes_style = {
             "title": {
@@ -134,11 +149,70 @@ class Subplot(ISubplot):
         self.title = title
         return self
 
+    def set_loader_option(self, **loader_option):
+        """
+        Set option for loading data files.
+
+        Parameters
+        ----------
+        max_workers: int, optional
+            Number of files loaded concurrently.
+        executor: str, optional
+            "thread" or "process".
+        cache: TableCache, optional
+            On-disk cache of parsed tables.
+        time_index: bool, optional
+            Use sidecar time index of csv files in SubplotTime.
+        split_workers: int, optional
+            Number of processes parsing one large csv file.
+        tail: bool, optional
+            Parse only rows appended to csv files since the previous read.
+        """
+        self.loader_option = {**self.loader_option, **loader_option}
+        return self
+
+    def set_read_cache(self, read_cache: Optional[ReadCache]):
+        """
+        Share tables read from files with other subplots.
+
+        Parameters
+        ----------
+        read_cache: ReadCache, optional
+            None means reading files every time.
+        """
+        self.read_cache = read_cache
+        return self
+
     def show_title(self, ax):
         if self.title is not None:
             ax.set_title(self.title, **self.axes_style.get("title", {}))
         return ax
 
+    def load(self, test=False):
+        """
+        Read data of all series before plotting.
+        The next plot() uses the loaded data instead of reading them.
+        Series already loaded by a load plan of the figure are kept.
+        Figure.show(prefetch=True) calls it in worker threads,
+            so that reading data of subplots overlaps.
+
+        Parameters
+        ----------
+        test: bool, optional
+            Flag for test plot mode.
+            Default value is False.
+        """
+        self.set_test_mode(test)
+        self.normalize_xlim()
+        self.prefetched = {
+            i: self.prefetched[i] if i in self.prefetched else self.read(i)
+            for i in range(self.length)
+        }
+        return self
+
+    def normalize_xlim(self):
+        return self
+
     def plot(self, ax, test=False):
         """
         pyplot.axsubplot -> pyplot.axsubplot
@@ -216,7 +290,8 @@ class Subplot(ISubplot):
         return plotter
 
     def __getPlotAction(self, i):
-        dfs: tuple = self.read(i)
+        dfs: tuple = self.prefetched.pop(i) if i in self.prefetched\
+            else self.read(i)
         opt = self.get_option(i)
 
         if len(dfs) == 0 or all(map(lambda df: len(df) is 0, dfs)):
@@ -230,10 +305,19 @@ class Subplot(ISubplot):
         """
         Indipendent from type of data source.
         """
+        return tuple(self.read_request(request)
+                     for request in self.read_requests(i))
+
+    def read_requests(self, i)->List[dict]:
+        """
+        Data source, options, transformers, and hints
+            for reading each data source of i-th series.
+        """
         data: tuple = wrap_by_tuple(self.data[i])
         meta: tuple = wrap_by_tuple(self.dataInfo[i])
         default_transformers: tuple = self.default_transformers(i)
         data_transformers: tuple = wrap_by_tuple(self.dataTransformer[i])
+        time_windows: tuple = self.time_windows(i)
 
         max_len = pip(
             it.mapping(len),
@@ -245,49 +329,162 @@ class Subplot(ISubplot):
                 return default
             return it[i] if len(it) > i else it[-1]
 
-        dfs = []
+        requests = []
         for j in range(max_len):
             d = get_with_duplicate(data, j, {})
             m = get_with_duplicate(meta, j, {})
             def_trans = get_with_duplicate(default_transformers, j, [])
             trans = get_with_duplicate(data_transformers, j, [])
-
-            loader = ISubplot.IDataLoader(d, self.isTest())
+            window = get_with_duplicate(time_windows, j, None)
 
             if self.isTest():
                 transformers = None
+            elif type(d) in [str, list, PathList]:
+                # Built-in steps are optimized for reading files.
+                m, pipeline = Pipeline.of(
+                    *def_trans, *wrap_by_list(trans)).pushdown(m)
+                transformers = pipeline.transformers()
             else:
                 transformers = def_trans + trans
 
-            dfs.append(loader.read(d, meta=m,
-                                   transformers=transformers))
-        return tuple(dfs)
+            requests.append({
+                "i": i,
+                "j": j,
+                "data": d,
+                "meta": m,
+                "transformers": transformers,
+                "user_transformers": trans,
+                "hint": {
+                    "columns": self.required_columns(i),
+                    "time_window": window,
+                    "schema": schemas.resolve(self.schema[i])
+                }
+            })
+        return requests
+
+    def read_request(self, request: dict)->pd.DataFrame:
+        i = request["i"]
+        d = request["data"]
+        m = request["meta"]
+        transformers = request["transformers"]
+        hint = request["hint"]
+
+        loader = ISubplot.IDataLoader(
+            d, self.isTest(), **self.loader_option)
+
+        if self.stream[i] is not None and not self.isTest():
+            consumer = self.stream[i].fresh()
+            for chunk in loader.stream(d, meta=m, transformers=transformers, **hint):
+                consumer.consume(chunk)
+            return consumer.result()
+
+        key = None if self.read_cache is None or self.isTest()\
+            else ReadCache.key(
+                d, m, self.transformer_key(i, request["j"]),
+                request["user_transformers"],
+                sorted(hint["columns"]) if hint["columns"] is not None else None,
+                hint["time_window"], hint["schema"], self.loader_option)
+
+        if key is None:
+            return loader.read(d, meta=m, transformers=transformers, **hint)
+        return self.read_cache.load(
+            key,
+            lambda: loader.read(d, meta=m, transformers=transformers, **hint)
+        )
+
+    def transformer_key(self, i, j)->tuple:
+        """
+        Values determining default transformers of j-th data source.
+        """
+        return (
+            type(self).__name__,
+            j,
+            self.filter_x,
+            self.option[i].get("x", None),
+            self.axes_style.get("xlim"),
+            self.index_name[i]
+        )
+
+    def time_windows(self, i)->tuple:
+        """
+        Time range of rows required for each data source.
+        Readers having time index read only the rows.
+        """
+        return ()
+
+    def required_columns(self, i)->Optional[set]:
+        """
+        Names of columns used by plot actions and transformers.
+        None means that all columns are required.
+        """
+        opt = self.option[i]
+
+        # Aggregation of factor_bar is applied to the whole dataframe.
+        if "agg" in opt and type(opt.get("y")) is not list:
+            return None
+
+        selectors = self.selector_columns(i)\
+            if self.stream[i] is None\
+            else self.stream[i].required_columns()
+        index_names = collect_columns([self.index_name[i]])
+        transformers = collect_columns(
+            [self.dataTransformer[i]], selector=False)
+
+        if any(c is None for c in [selectors, index_names, transformers]):
+            return None
+        return selectors | index_names | transformers
+
+    def selector_columns(self, i)->Optional[set]:
+        """
+        Names of columns selected by plot actions.
+        Plot actions must declare option keys of column selectors
+            by selector_keys attribute, as actions made by plot_action do.
+        None means that some plot actions use unknown keys.
+        """
+        opt = self.option[i]
+        values = []
+        for action in self.plotMethods[i]:
+            keys = getattr(action, "selector_keys", None)
+            if keys is None:
+                return None
+            values += [opt[key] for key in keys if key in opt]
+            values += getattr(action, "preset_selectors", [])
+        return collect_columns(values)
 
     def default_transformers(self, i)->tuple:
-        def filterX(df):
+        def filterX():
             x = self.option[i].get("x", None)
             lim = self.axes_style.get("xlim")
-            if len(lim) is 0 or lim is None:
-                return df
+            if not self.filter_x or lim is None or len(lim) is 0:
+                return identity
             elif len(lim) is 1:
                 lower = lim[0]
                 upper = None
             else:
                 lower, upper, *_ = lim
 
-            return dataframe.filter_between(
-                lower, upper, False, False
-            )(df, x) if self.filter_x else df
+            return FilterBetween(x, lower, upper)
 
         data_len = len(self.data[i]) if type(self.data[i]) is tuple else 1
 
-        return tuple([filterX] for i in range(data_len))
+        return tuple([filterX()] for i in range(data_len))
 
     def get_option(self, i):
+        """
+        Options passed to plot actions.
+        xlim and ylim of the subplot are passed as x_range and y_range,
+            which are the ranges of decimation of lines
+            and of pixels of density scatter.
+        """
+        option = {
+            "x_range": self.axes_style.get("xlim", None),
+            "y_range": self.axes_style.get("ylim", None),
+            **self.option[i]
+        }
         if self.isTest():
-            return {**self.option[i], "y": "y"}
+            return {**option, "y": "y"}
         else:
-            return self.option[i]
+            return option
 
     def register(self, *arg, **kwargs):
         "ailias of self.add"
@@ -314,6 +511,8 @@ class Subplot(ISubplot):
                  cycler=None,
                  within_xlim: bool=False,
                  second_axis: bool=False,
+                 stream=None,
+                 schema=None,
                  **_kwargs):
         """
         Set parameters for plotting.
@@ -356,6 +555,15 @@ class Subplot(ISubplot):
             Flag whether plot only data in xlim.
         second_axis, optinal: bool
             Flag for plot on second axis.
+        stream, optional: matdat.stream.IConsumer
+            Consumer of chunks for streaming plot.
+            When it is given, data is not concatenated and only
+                the result of the consumer is plotted.
+            Default value is None.
+        schema, optional: str, matdat.schema.Schema
+            Schema or name of schema registered in matdat.schema.schemas.
+            Data types of columns are applied in parsing files.
+            Default value is None.
 
         **kwargs:
             Parameters passed to PlotActions.
@@ -427,6 +635,8 @@ class Subplot(ISubplot):
 
         self.filter_x = within_xlim
         self.is_second_axes.append(second_axis)
+        self.stream.append(stream)
+        self.schema.append(schema)
 
         self.length = self.length+1
         return self
@@ -471,6 +681,8 @@ class Subplot(ISubplot):
         )
 
         new_subplot.diff_second_axes_style = {**self.diff_second_axes_style}
+        new_subplot.loader_option = {**self.loader_option}
+        new_subplot.read_cache = self.read_cache
 
         for i in range(self.length):
             new_subplot.add(
@@ -481,6 +693,8 @@ class Subplot(ISubplot):
                         "index": self.index_name[i],
                         "plot": self.plotMethods[i],
                         "second_axis": self.is_second_axes[i],
+                        "stream": self.stream[i],
+                        "schema": self.schema[i],
                     },
                     self.option[i],
                     option[i] if len(option) > i and type(
@@ -502,6 +716,7 @@ class Subplot(ISubplot):
                        for directory in preset["directory"]) if type(preset["directory"]) is tuple else getFileList(*fileSelector)(preset["directory"]),
             dataInfo=preset["dataInfo"],
             index=preset.get("index", None),
+            schema=preset.get("schema", None),
             plot=[*preset["plot"], *plot] if not plotOverwrite else plotOverwrite,
 
             **dictionary.mix(
@@ -3,7 +3,7 @@ import matplotlib.dates as mdates
 from .subplot import Subplot
 from .csv_reader import CsvReader
 from func_helper import identity
-import func_helper.func_helper.dataframe as dataframe
+from .pipeline import SetIndex, FilterBetween
 
 
 class SubplotTime(Subplot):
@@ -44,12 +44,24 @@ class SubplotTime(Subplot):
         })
         self.filter_x = True
 
-    def plot(self, ax, test=False):
+    def normalize_xlim(self):
         if ("xlim" in self.axes_style and type(self.axes_style["xlim"]) is not pd.core.indexes.datetimes.DatetimeIndex):
             self.axes_style["xlim"] = pd.to_datetime(
                 self.axes_style["xlim"])
+        return self
+
+    def plot(self, ax, test=False):
+        self.normalize_xlim()
         return super().plot(ax, test)
 
+    def get_option(self, i):
+        """
+        Lines of time series without markers are decimated
+            to the width of axes by default.
+        Pass decimate=None to add() to draw all points.
+        """
+        return {"decimate": "auto", **super().get_option(i)}
+
     def setXaxisFormat(self):
         def f(ax):
             ax.xaxis.set_major_formatter(
@@ -65,7 +77,7 @@ class SubplotTime(Subplot):
         def filterX():
             x = self.option[i].get("x", None)
             lim = self.axes_style.get("xlim", [])
-            if len(lim) is 0 or lim is None:
+            if not self.filter_x or lim is None or len(lim) is 0:
                 return identity
             elif len(lim) is 1:
                 lower = lim[0]
@@ -73,29 +85,49 @@ class SubplotTime(Subplot):
             else:
                 lower, upper, *_ = lim
 
-            return lambda df: dataframe.filter_between(
+            return FilterBetween(
+                x,
                 *(pd.to_datetime([lower, upper]) if type(lower)
-                  is not pd.core.indexes.datetimes.DatetimeIndex else [lower, upper]), False, False
-            )(df, x) if self.filter_x else df
+                  is not pd.core.indexes.datetimes.DatetimeIndex else [lower, upper])
+            )
 
         def setIndex(index_name):
             if type(index_name) is not list:
-                return dataframe.setTimeSeriesIndex(
-                    index_name
-                )
+                return SetIndex([index_name])
 
             if len(index_name) is 0:
                 return identity
             else:
-                return dataframe.setTimeSeriesIndex(
-                    *index_name
-                )
+                return SetIndex(index_name)
 
         index_names = self.index_name[i] if type(
             self.index_name[i]) is tuple else (self.index_name[i],)
 
         return tuple([setIndex(index_name), filterX()] for index_name in index_names)
 
+    def time_windows(self, i)->tuple:
+        x = self.option[i].get("x", None)
+        lim = self.axes_style.get("xlim", [])
+        if not self.filter_x or lim is None or len(lim) == 0:
+            return ()
+
+        lower, upper = pd.to_datetime(
+            [lim[0], lim[1] if len(lim) > 1 else None])
+
+        def window(index_name):
+            columns = [x] if x is not None\
+                else index_name if type(index_name) is list\
+                else [index_name] if index_name is not None\
+                else []
+            if len(columns) == 0:
+                return None
+            return {"columns": columns, "lower": lower, "upper": upper}
+
+        index_names = self.index_name[i] if type(
+            self.index_name[i]) is tuple else (self.index_name[i],)
+
+        return tuple(window(index_name) for index_name in index_names)
+
     def read(self, i):
 
         if self.isTest():
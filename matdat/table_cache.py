@@ -0,0 +1,193 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import pandas as pd
+from typing import Callable, Optional
+
+
+class TableCache:
+    """
+    On-disk columnar cache of parsed tables.
+
+    Parsed pandas.DataFrame is stored as a parquet or feather file.
+    The key of the cache is made from the absolute path, size, and
+        modification time of the source file and the options for reading it.
+    When the total size of cached files exceeds max_bytes,
+        the least recently used files are removed.
+
+    Example
+    -------
+    cache = TableCache("./.matdat_cache/", max_bytes=2 * 1024**3)
+
+    subplot = Subplot()\\
+        .set_loader_option(cache=cache)\\
+        .add(data=getFileList(matchCsv)(directory), ...)
+
+    # The second plot does not parse csv files.
+    print(cache.info())
+    # {"hits": 10, "misses": 10, "bytes": 12345678, "files": 10}
+
+    Parameters
+    ----------
+    directory: str, optional
+        Directory storing cached files.
+        Default is "./.matdat_cache/".
+    max_bytes: int, optional
+        Upper limit of the total size of cached files.
+        Default is 1 GiB.
+    format: str, optional
+        "parquet" or "feather".
+        Pyarrow (or fastparquet) is required.
+        Default is "parquet".
+    """
+
+    def __init__(self, directory: str="./.matdat_cache/", max_bytes: int=1024**3, format: str="parquet"):
+        if format not in ["parquet", "feather"]:
+            raise SystemError(f"Invalid cache format: {format}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.format = format
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = {**self.__dict__}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(path: str, read_option: dict={}) -> str:
+        """
+        Hash of path, size, and modification time of the file
+            and options for reading it.
+        """
+        stat = os.stat(path)
+        source = json.dumps(
+            [os.path.abspath(path), stat.st_size,
+             stat.st_mtime_ns, read_option],
+            sort_keys=True,
+            default=repr
+        )
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def load(self, path: str, read_option: dict, parse: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Return cached table if exists.
+        Otherwise, parse the file and store the result.
+
+        Parameters
+        ----------
+        path: str
+            Path to the source file.
+        read_option: dict
+            Options used in parsing the file.
+        parse: callable[[], pandas.DataFrame]
+            Function parsing the file.
+        """
+        key = TableCache.fingerprint(path, read_option)
+        df = self.get(key)
+        if df is not None:
+            return df
+
+        df = parse()
+        self.put(key, df)
+        return df
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        cache_path = self.cachePath(key)
+        try:
+            df = pd.read_parquet(cache_path) if self.format == "parquet"\
+                else pd.read_feather(cache_path)
+        except Exception:
+            self.count("misses")
+            return None
+
+        # Update modification time for LRU eviction.
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        self.count("hits")
+        return df
+
+    def put(self, key: str, df: pd.DataFrame):
+        """
+        Store table.
+        Table which can not be written as the format is not stored.
+        """
+        if type(df) is not pd.DataFrame:
+            return self
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+
+        cache_path = self.cachePath(key)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if self.format == "parquet":
+                df.to_parquet(tmp_path)
+            else:
+                df.to_feather(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+            return self
+
+        return self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used files until total size
+            is smaller than max_bytes.
+        """
+        entries = sorted(self.entries(), key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total = total - size
+            except OSError:
+                pass
+        return self
+
+    def clear(self):
+        for entry in self.entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        return self
+
+    def info(self) -> dict:
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": sum(e.stat().st_size for e in entries),
+            "files": len(entries)
+        }
+
+    def entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        pattern = re.compile(r"^[0-9a-f]{40}\." + self.format + "$")
+        with os.scandir(self.directory) as it:
+            return [e for e in it if e.is_file() and pattern.search(e.name)]
+
+    def cachePath(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.{self.format}")
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
@@ -0,0 +1,217 @@
+import os
+import io
+import csv
+import json
+import threading
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+from .byte_range import preamble_lines, read_range
+
+"""
+時系列csvファイルの時刻とバイトオフセットの対応表 (sidecar index).
+
+The index is saved beside the csv file as "{path}.tidx.json".
+It records the byte offset and time of every `stride` rows.
+When modification time or size of the csv file changes,
+    the index is rebuilt.
+
+Rows of the file must be sorted by time.
+Quoted fields including line breaks are not supported.
+"""
+
+sidecar_suffix = ".tidx.json"
+
+_memory = {}
+_lock = threading.Lock()
+
+
+class TimeIndex:
+    """
+    Example
+    -------
+    index = TimeIndex.load(path, ["date", "time"], header=3, encoding="utf-8")
+    if index is not None:
+        start, end = index.window("2018/08/10", "2018/08/11")
+    """
+
+    def __init__(self, source: dict, columns: List[str], preamble_end: int, offsets, times, stride: int, rows: int):
+        self.source = source
+        self.columns = columns
+        self.preamble_end = preamble_end
+        self.offsets = np.asarray(offsets, dtype="int64")
+        self.times = np.asarray(times, dtype="int64")
+        self.stride = stride
+        self.rows = rows
+
+    @staticmethod
+    def load(path: str, columns: List[str], header=0, skiprows=None, encoding="utf-8", sep=",", stride: int=1000) -> Optional["TimeIndex"]:
+        """
+        Load the sidecar index of the file.
+        The index is built when it does not exist or is out of date.
+        None is returned when the index can not be built.
+        """
+        source = TimeIndex.fingerprint(
+            path, columns, header, skiprows, sep)
+
+        with _lock:
+            index = _memory.get(path)
+        if index is not None and index.source == source:
+            return index
+
+        index = TimeIndex.read(path, source)
+        if index is None:
+            index = TimeIndex.build(
+                path, source, columns, header, skiprows, encoding, sep, stride)
+            if index is not None:
+                index.save(path)
+
+        if index is not None:
+            with _lock:
+                _memory[path] = index
+        return index
+
+    @staticmethod
+    def fingerprint(path, columns, header, skiprows, sep) -> dict:
+        stat = os.stat(path)
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "columns": list(columns),
+            "header": header,
+            "skiprows": skiprows,
+            "sep": sep
+        }
+
+    @staticmethod
+    def read(path: str, source: dict) -> Optional["TimeIndex"]:
+        try:
+            with open(path + sidecar_suffix, "r") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if d.get("source") != source or "rows" not in d:
+            return None
+        return TimeIndex(
+            d["source"], d["columns"], d["preamble_end"],
+            d["offsets"], d["times"], d["stride"], d["rows"])
+
+    def save(self, path: str):
+        try:
+            tmp = f"{path}{sidecar_suffix}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({
+                    "source": self.source,
+                    "columns": self.columns,
+                    "preamble_end": self.preamble_end,
+                    "offsets": self.offsets.tolist(),
+                    "times": self.times.tolist(),
+                    "stride": self.stride,
+                    "rows": self.rows
+                }, f)
+            os.replace(tmp, path + sidecar_suffix)
+        except OSError:
+            # The index is kept only in memory.
+            pass
+        return self
+
+    @staticmethod
+    def build(path, source, columns, header, skiprows, encoding, sep, stride) -> Optional["TimeIndex"]:
+        n_preamble = preamble_lines(header, skiprows)
+        if n_preamble is None or header is None:
+            return None
+
+        offsets = []
+        keys = []
+        with open(path, "rb") as f:
+            offset = 0
+            for i in range(n_preamble):
+                line = f.readline()
+                offset = offset + len(line)
+                if i == n_preamble - 1:
+                    names = TimeIndex.parse_line(line, encoding, sep)
+            preamble_end = offset
+
+            if not all(c in names for c in columns):
+                return None
+            positions = [names.index(c) for c in columns]
+
+            row = 0
+            last = None
+            for line in f:
+                if row % stride == 0:
+                    offsets.append(offset)
+                    keys.append(TimeIndex.key(line, encoding, sep, positions))
+                    last = None
+                else:
+                    last = (offset, line)
+                offset = offset + len(line)
+                row = row + 1
+
+            # The last row bounds the time range of the file.
+            if last is not None:
+                offsets.append(last[0])
+                keys.append(TimeIndex.key(last[1], encoding, sep, positions))
+
+        times = pd.to_datetime(keys, errors="coerce")
+        if len(times) == 0 or times.hasnans or not times.is_monotonic_increasing:
+            return None
+
+        return TimeIndex(source, list(columns), preamble_end, offsets, times.asi8, stride, row)
+
+    @staticmethod
+    def parse_line(line: bytes, encoding: str, sep: str) -> List[str]:
+        text = line.decode(encoding, errors="replace").rstrip("\r\n")
+        return next(csv.reader([text], delimiter=sep), [])
+
+    @staticmethod
+    def key(line: bytes, encoding: str, sep: str, positions: List[int]) -> Optional[str]:
+        fields = TimeIndex.parse_line(line, encoding, sep)
+        if max(positions) >= len(fields):
+            return None
+        return " ".join(fields[p].strip() for p in positions)
+
+    def window(self, lower=None, upper=None) -> Tuple[int, Optional[int]]:
+        """
+        Byte range including all rows between lower and upper.
+        End is None when the range continues to the end of file.
+        """
+        k = self.first_entry(lower)
+        start = self.preamble_end if k < 0 else int(self.offsets[k])
+        end = None
+
+        if upper is not None and upper is not pd.NaT:
+            m = np.searchsorted(
+                self.times, pd.Timestamp(upper).value, side="right")
+            if m < len(self.offsets):
+                end = int(self.offsets[m])
+
+        return (start, end)
+
+    def first_entry(self, lower=None) -> int:
+        """
+        Position of the entry where the window of lower starts.
+        -1 means the first data row.
+        """
+        if lower is None or lower is pd.NaT:
+            return -1
+        return int(np.searchsorted(
+            self.times, pd.Timestamp(lower).value, side="left")) - 1
+
+    def skipped_rows(self, lower=None) -> int:
+        """
+        Number of data rows before the window of lower.
+        """
+        k = self.first_entry(lower)
+        if k < 0:
+            return 0
+        # The last entry is the last row, which is not on the stride.
+        return k * self.stride if k * self.stride < self.rows else self.rows - 1
+
+    def slice(self, path: str, lower=None, upper=None) -> io.BytesIO:
+        """
+        Bytes of the preamble and rows between lower and upper.
+        """
+        start, end = self.window(lower, upper)
+        return read_range(path, self.preamble_end, start, end)
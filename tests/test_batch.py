@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.colors
+import matplotlib.pyplot as plt
+from cycler import cycler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matdat.plot as plot
+
+
+class BatchTestSuite(unittest.TestCase):
+    """Entries drawn at once look the same as drawn separately."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "x": np.arange(10.),
+            "a": np.arange(10.) ** 2,
+            "b": -np.arange(10.)
+        })
+        self.fig, self.axes = plt.subplots(1, 2)
+        for ax in self.axes:
+            ax.set_prop_cycle(cycler(color=["r", "g", "b"]))
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def draw(self, action, ax, **option):
+        return action(self.df, {"x": "x", "y": ("a", "b"), **option})(ax)
+
+    def test_line_with_colors(self):
+        ax = self.draw(plot.line(batch=True), self.axes[0], color=("k", "m"))
+        self.assertEqual(len(ax.lines), 0)
+        collection = ax.collections[0]
+        np.testing.assert_array_equal(
+            collection.get_colors(),
+            [matplotlib.colors.to_rgba(c) for c in ["k", "m"]])
+        np.testing.assert_array_equal(
+            collection.get_segments()[1][:, 1], self.df["b"])
+
+    def test_line_without_colors_uses_cycle(self):
+        batch = self.draw(plot.line(batch=True), self.axes[0])
+        separate = self.draw(plot.line(), self.axes[1])
+        self.assertEqual(len(batch.lines), 0)
+        self.assertEqual(len(batch.collections), 1)
+        np.testing.assert_array_equal(
+            batch.collections[0].get_colors(),
+            [matplotlib.colors.to_rgba(l.get_color()) for l in separate.lines])
+
+        # Following lines continue the cycle.
+        self.assertEqual(batch.plot([0, 1])[0].get_color(), "b")
+
+    def test_many_lines_with_cycle(self):
+        df = pd.DataFrame(
+            np.arange(400.).reshape(10, 40),
+            columns=[f"y{i}" for i in range(40)])
+        ax = plot.line(batch=True)(
+            df, {"y": tuple(df.columns)})(self.axes[0])
+        self.assertEqual(len(ax.lines), 0)
+        self.assertEqual(len(ax.collections), 1)
+        np.testing.assert_array_equal(
+            ax.collections[0].get_colors(),
+            [matplotlib.colors.to_rgba(["r", "g", "b"][i % 3]) for i in range(40)])
+
+    def test_scatter_with_colors(self):
+        ax = self.draw(plot.scatter(batch=True), self.axes[0], c=("k", "m"))
+        self.assertEqual(len(ax.collections), 1)
+        self.assertEqual(len(ax.collections[0].get_offsets()), 20)
+
+    def test_scatter_without_colors_uses_cycle(self):
+        batch = self.draw(plot.scatter(batch=True), self.axes[0])
+        separate = self.draw(plot.scatter(), self.axes[1])
+        self.assertEqual(len(batch.collections), 1)
+        colors = batch.collections[0].get_facecolor()
+        np.testing.assert_array_equal(
+            colors[::10],
+            [c.get_facecolor()[0] for c in separate.collections])
+        np.testing.assert_array_equal(
+            colors[::10], [matplotlib.colors.to_rgba(c) for c in ["r", "g"]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+
+import bz2
+import gc
+import gzip
+import io
+import lzma
+import os
+import sys
+import tempfile
+import time
+import unittest
+import weakref
+from unittest import mock
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import matdat.csv_reader as csv_reader
+from matdat.csv_reader import CsvReader
+
+
+def read(path, **kwd):
+    return CsvReader(path).read(**kwd).assemble().df
+
+
+class EncodingTestSuite(unittest.TestCase):
+    """Encoding detected from the head of files."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text, encoding):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+        return path
+
+    def test_utf8(self):
+        path = self.write("utf8.csv", "名前,値\n観測,1\n", "utf-8")
+        df = read(path)
+        self.assertEqual(list(df.columns), ["名前", "値"])
+        self.assertEqual(df["名前"].tolist(), ["観測"])
+
+    def test_shift_jis_after_ascii_head(self):
+        """
+        Multi byte characters appear after the probed head.
+        Rows parsed before the error are not duplicated.
+        """
+        rows = ["a,b"] + [f"{i},x" for i in range(20000)] + ["20000,観測"]
+        text = "\n".join(rows) + "\n"
+        path = self.write("sjis.csv", text, "shift-JIS")
+        expected = pd.read_csv(path, encoding="shift-JIS")
+
+        df = read(path, chunksize=1000)
+        pd.testing.assert_frame_equal(df, expected)
+
+        # The fallback encoding is remembered.
+        self.assertEqual(CsvReader(path).encoding, "shift-JIS")
+
+    def test_fallback_parses_once(self):
+        """
+        Bytes are decoded before they are parsed,
+            so the file is not parsed again with the fallback encoding.
+        """
+        rows = ["a,b"] + [f"{i},x" for i in range(20000)] + ["20000,観測"]
+        text = "\n".join(rows) + "\n"
+        path = self.write("sjis.csv", text, "shift-JIS")
+        expected = pd.read_csv(path, encoding="shift-JIS")
+
+        read_csv = pd.read_csv
+        with mock.patch.object(csv_reader.pd, "read_csv", wraps=read_csv) as parse:
+            df = read(path)
+        self.assertEqual(parse.call_count, 1)
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_fallback_with_python_engine(self):
+        rows = ["a;;b"] + [f"{i};;x" for i in range(100)] + ["100;;観測"]
+        text = "\n".join(rows) + "\n"
+        path = self.write("sjis.csv", text, "shift-JIS")
+        expected = pd.read_csv(
+            path, sep=";;", engine="python", encoding="shift-JIS")
+
+        reader = CsvReader(path)
+        reader.encoding = "utf-8"
+        pd.testing.assert_frame_equal(
+            reader.read(sep=";;").assemble().df, expected)
+
+    def test_reader_is_released(self):
+        """
+        Chunked reader is released by reference counting
+            when reading stops, and the file is closed.
+        """
+        rows = ["a,b"] + [f"{i},x" for i in range(1000)]
+        path = self.write("table.csv", "\n".join(rows) + "\n", "utf-8")
+        reader = CsvReader(path).read(chunksize=10)
+        released = weakref.ref(reader)
+        chunks = reader.stream()
+        next(chunks)
+        del reader, chunks
+        self.assertIsNone(released())
+
+    def test_invalid_for_fallback(self):
+        path = os.path.join(self.directory.name, "invalid.csv")
+        with open(path, "wb") as f:
+            f.write(b"a,b\n1,\xff\xff\n")
+        reader = CsvReader(path)
+        reader.encoding = "utf-8"
+        with self.assertRaises(UnicodeDecodeError):
+            reader.read().assemble()
+
+
+class EngineTestSuite(unittest.TestCase):
+    """C engine is used for paths including multi byte characters."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "観測データ.csv")
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write("時刻,値\n0,1.5\n1,2.5\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_non_ascii_path(self):
+        reader = CsvReader(self.path)
+        arg = {"header": 0, "encoding": reader.encoding}
+        self.assertEqual(CsvReader.select_engine(arg), "c")
+
+        read_csv = pd.read_csv
+        with mock.patch.object(csv_reader.pd, "read_csv", wraps=read_csv) as parse:
+            df = reader.read().assemble().df
+        self.assertEqual(parse.call_args.kwargs["engine"], "c")
+        # The file is opened by the reader, not by pandas.
+        self.assertNotIsInstance(parse.call_args.args[0], str)
+        self.assertEqual(list(df.columns), ["時刻", "値"])
+        self.assertEqual(df["値"].tolist(), [1.5, 2.5])
+
+    def test_python_engine_options(self):
+        self.assertEqual(CsvReader.select_engine({"sep": None}), "python")
+        self.assertEqual(CsvReader.select_engine({"sep": ";;"}), "python")
+        self.assertEqual(CsvReader.select_engine({"sep": r"\s+"}), "c")
+        self.assertEqual(CsvReader.select_engine({"skipfooter": 1}), "python")
+
+        df = CsvReader.readCsv(self.path, False, encoding="utf-8", skipfooter=1)
+        self.assertEqual(df["値"].tolist(), [1.5])
+
+
+class ByteRangeTestSuite(unittest.TestCase):
+    """Tables parsed by byte ranges are the same as parsed at once."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.split_min_bytes = csv_reader.split_min_bytes
+        csv_reader.split_min_bytes = 0
+
+    def tearDown(self):
+        csv_reader.split_min_bytes = self.split_min_bytes
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="") as f:
+            f.write(text)
+        return path
+
+    def read_split(self, path, quoted=None, **kwd):
+        reader = CsvReader(path).setSplit(3, quoted)
+        arg = reader.schemaOption({"header": 0, "encoding": reader.encoding, **kwd})
+        return (
+            reader.byteRanges(arg),
+            reader.read(**kwd).assemble().df
+        )
+
+    def test_split_equals_single(self):
+        rows = ["time,value,label"] + \
+            [f"2020-01-01 00:{i // 60:02d}:{i % 60:02d},{i * 0.5},a{i}"
+             for i in range(3000)]
+        path = self.write("plain.csv", "\n".join(rows) + "\n")
+
+        ranges, df = self.read_split(path, header=0)
+        self.assertIsNotNone(ranges)
+        self.assertEqual(len(ranges[1]), 3)
+        pd.testing.assert_frame_equal(df, pd.read_csv(path))
+
+    def test_quoted_file_is_not_split(self):
+        """
+        Line breaks in quoted fields are not boundaries of rows.
+        """
+        rows = ["id,note"] + \
+            [f'{i},"line\nbreak {i}"' for i in range(3000)]
+        path = self.write("quoted.csv", "\n".join(rows) + "\n")
+
+        ranges, df = self.read_split(path)
+        self.assertIsNone(ranges)
+        pd.testing.assert_frame_equal(df, pd.read_csv(path))
+
+    def test_quoted_option(self):
+        rows = ["id,note"] + [f"{i},x{i}" for i in range(3000)]
+        path = self.write("option.csv", "\n".join(rows) + "\n")
+
+        ranges, df = self.read_split(path, quoted=True)
+        self.assertIsNone(ranges)
+        ranges, df = self.read_split(path, quoted=False)
+        self.assertIsNotNone(ranges)
+        pd.testing.assert_frame_equal(df, pd.read_csv(path))
+
+
+class TailTestSuite(unittest.TestCase):
+    """Tables read by tail reading are the same as parsed at once."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "log.csv")
+        CsvReader.clearTail()
+
+    def tearDown(self):
+        CsvReader.clearTail()
+        self.directory.cleanup()
+
+    def write(self, text, mode="w"):
+        with open(self.path, mode, newline="") as f:
+            f.write(text)
+
+    def read(self, path=None):
+        return CsvReader(path or self.path).setTail(True).read().assemble().df
+
+    def test_append(self):
+        self.write("a,b\n1,x\n2,y\n")
+        pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+
+        for i in range(3, 40):
+            self.write(f"{i},z\n", "a")
+            pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+
+    def test_rewrite(self):
+        self.write("a,b\n1,x\n2,y\n")
+        self.read()
+        self.write("a,b\n9,w\n")
+        pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+
+    def test_missing_final_newline(self):
+        """
+        The last line without line break is read at the first read.
+        After that, the incomplete last line is read after the file
+            stops growing, and it is read again when it is completed.
+        """
+        self.write("a,b\n1,x\n2,")
+        pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+        pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+
+        self.write("y\n3,z", "a")
+        self.assertEqual(self.read()["a"].tolist(), [1, 2])
+        self.assertEqual(self.read()["b"].tolist(), ["x", "y", "z"])
+        pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+
+    def test_line_end_over_blocks(self):
+        """
+        Line break is searched backward over blocks,
+            and the file is parsed from the file by a stream.
+        """
+        rows = "".join(f"{i},{'x' * 100}\n" for i in range(2000))
+        tail = "2000," + "y" * (2 * csv_reader.probe_size)
+        self.write("a,b\n" + rows + tail)
+        with open(self.path, "rb") as f:
+            end = CsvReader.lineEnd(f, 4, os.path.getsize(self.path))
+        self.assertEqual(end, len("a,b\n" + rows))
+
+        pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+        self.write("\n2001,z\n", "a")
+        pd.testing.assert_frame_equal(self.read(), pd.read_csv(self.path))
+
+    def test_remembered_files_are_bounded(self):
+        paths = []
+        for i in range(csv_reader.tail_max_entries + 3):
+            path = os.path.join(self.directory.name, f"log{i}.csv")
+            with open(path, "w") as f:
+                f.write("a\n1\n")
+            self.read(path)
+            paths.append(os.path.abspath(path))
+
+        remembered = [key[0] for key in csv_reader._tail_cache.keys()]
+        self.assertEqual(len(remembered), csv_reader.tail_max_entries)
+        self.assertEqual(remembered, paths[-csv_reader.tail_max_entries:])
+
+
+def zstd_compress(data: bytes) -> bytes:
+    import zstandard
+    return zstandard.ZstdCompressor().compress(data)
+
+
+class CompressionTestSuite(unittest.TestCase):
+    """Compressed files are read as the uncompressed ones."""
+
+    codecs = {
+        ".gz": gzip.compress,
+        ".bz2": bz2.compress,
+        ".xz": lzma.compress,
+        ".zst": zstd_compress
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        rows = ["time,value,label"] + [
+            f"2020-01-01 00:00:{i % 60:02d},{i * 0.5},観測{i % 7}"
+            for i in range(5000)]
+        self.text = "\n".join(rows) + "\n"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, data: bytes):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_round_trip(self):
+        for encoding in ["utf-8", "shift-JIS"]:
+            data = self.text.encode(encoding)
+            expected = read(self.write("plain.csv", data))
+            for suffix, compress in self.codecs.items():
+                with self.subTest(encoding=encoding, suffix=suffix):
+                    try:
+                        compressed = compress(data)
+                    except ImportError:
+                        self.skipTest("zstandard is not installed.")
+                    path = self.write(f"table{suffix}.csv{suffix}", compressed)
+                    self.assertTrue(CsvReader(path).isCompressed())
+                    pd.testing.assert_frame_equal(read(path), expected)
+                    pd.testing.assert_frame_equal(
+                        read(path, chunksize=700), expected)
+
+    def test_read_ahead_stops_when_reading_stops(self):
+        """
+        The thread decompressing blocks ahead stops
+            when chunks are no longer read.
+        """
+        # Larger than the blocks read ahead.
+        size = 2 * csv_reader.read_ahead_depth * csv_reader.block_size
+        rows = self.text.split("\n", 1)[1]
+        data = (self.text + rows * (size // len(rows.encode()) + 1)).encode("utf-8")
+        path = self.write("table.csv.gz", gzip.compress(data, compresslevel=1))
+
+        started = []
+
+        class Recorded(csv_reader.ReadAhead):
+            def __init__(self, *arg, **kwd):
+                super().__init__(*arg, **kwd)
+                started.append(self)
+
+        with mock.patch.object(csv_reader, "ReadAhead", Recorded):
+            chunks = CsvReader(path).read(chunksize=100).stream()
+            self.assertEqual(len(next(chunks)), 100)
+        self.assertEqual(len(started), 1)
+        self.assertTrue(started[0].thread.is_alive())
+
+        del chunks
+        gc.collect()
+        started[0].thread.join(timeout=5)
+        self.assertFalse(started[0].thread.is_alive())
+        self.assertTrue(started[0].closed)
+
+    def test_read_ahead_close(self):
+        class Endless(io.RawIOBase):
+            closed_by_reader = False
+
+            def readable(self):
+                return True
+
+            def readinto(self, b):
+                b[:len(b)] = b"x" * len(b)
+                return len(b)
+
+            def close(self):
+                Endless.closed_by_reader = True
+                super().close()
+
+        stream = csv_reader.ReadAhead(Endless(), size=16, depth=2)
+        self.assertEqual(stream.read(4), b"xxxx")
+        # Wait until the queue is full and the thread is blocked.
+        time.sleep(0.3)
+        stream.close()
+        self.assertFalse(stream.thread.is_alive())
+        self.assertTrue(Endless.closed_by_reader)
+
+    def test_read_ahead_error(self):
+        class Broken(io.RawIOBase):
+            def readable(self):
+                return True
+
+            def readinto(self, b):
+                raise OSError("broken")
+
+        stream = csv_reader.ReadAhead(Broken())
+        with self.assertRaises(OSError):
+            stream.read(4)
+        stream.close()
+        self.assertFalse(stream.thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
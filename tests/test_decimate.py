@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat import Subplot, SubplotTime
+from matdat.decimate import as_numeric, numeric_range, minmax_indices
+from matdat.plot.line import _decimated
+import matdat.plot as plot
+
+
+class DecimateTestSuite(unittest.TestCase):
+    """Decimated lines have the same envelope as all points."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(200000, dtype="float64")
+        self.y = rng.standard_normal(len(self.x)).cumsum()
+
+    def assertEnvelope(self, x, y, index, x_range, width):
+        """
+        Minimum and maximum of each pixel in the range are kept.
+        """
+        lo, hi = x_range
+        step = (hi - lo) / width
+        inside = (x >= lo) & (x < hi)
+        pixels = ((x[inside] - lo) // step).astype("int64")
+        kept = np.zeros(len(x), dtype=bool)
+        kept[index] = True
+        for p in np.unique(pixels):
+            in_pixel = np.flatnonzero(inside)[pixels == p]
+            values = y[in_pixel]
+            decimated = y[in_pixel[kept[in_pixel]]]
+            self.assertEqual(decimated.max(), values.max())
+            self.assertEqual(decimated.min(), values.min())
+
+    def test_envelope_in_range(self):
+        width = 200
+        lim = [50000, 60000]
+        index = _decimated(self.x, self.y, "minmax", width, lim)
+        self.assertLess(len(index), len(self.x) // 10)
+        self.assertEnvelope(self.x, self.y, index, lim, width)
+
+        # Points out of the range keep lines reaching the edges of axes
+        #   and the range of y.
+        self.assertIn(0, index)
+        self.assertIn(len(self.x) - 1, index)
+        self.assertIn(int(np.argmax(self.y)), index)
+        self.assertIn(int(np.argmin(self.y)), index)
+
+    def test_envelope_without_range(self):
+        width = 200
+        index = _decimated(self.x, self.y, "minmax", width)
+        self.assertEnvelope(
+            self.x, self.y, index, (self.x[0], self.x[-1]), width)
+
+    def test_datetime_range(self):
+        x = pd.Series(pd.date_range("2020-01-01", periods=len(self.y), freq="s"))
+        lim = ["2020-01-01 12:00", "2020-01-01 14:00"]
+        width = 100
+        index = _decimated(x, self.y, "minmax", width, lim)
+        self.assertEnvelope(as_numeric(x), self.y, index, numeric_range(lim), width)
+
+    def test_open_range(self):
+        self.assertTrue(np.isnan(numeric_range([10])[1]))
+        index = _decimated(self.x, self.y, "minmax", 200, [150000])
+        self.assertEnvelope(
+            self.x, self.y, index, (150000, self.x[-1]), 200)
+
+    def test_lttb_resolution_in_range(self):
+        width = 200
+        lim = [50000, 60000]
+        index = _decimated(self.x, self.y, "lttb", width, lim)
+        inside = np.count_nonzero((index >= lim[0]) & (index <= lim[1]))
+        self.assertGreaterEqual(inside, width - 2)
+
+    def test_plot_action(self):
+        fig, ax = plt.subplots()
+        df = pd.DataFrame({"x": self.x, "y": self.y})
+        lim = [50000, 60000]
+        plot.line(decimate="minmax", x_range=lim)(df, {"x": "x", "y": "y"})(ax)
+        width = int(np.ceil(ax.get_window_extent().width))
+        drawn = ax.lines[0].get_xdata()
+        index = minmax_indices(self.x, self.y, width, numeric_range(lim))
+        np.testing.assert_array_equal(drawn, self.x[index])
+        plt.close(fig)
+
+    def test_subplot_passes_xlim(self):
+        subplot = Subplot(xlim=[1, 2]).add(plot=[plot.line()], x="x", y="y")
+        subplot.set_test_mode(False)
+        self.assertEqual(subplot.get_option(0)["x_range"], [1, 2])
+
+    def test_time_series_with_markers(self):
+        """
+        Lines of time series are decimated by default
+            only when points are not drawn as markers.
+        """
+        df = pd.DataFrame({
+            "x": pd.date_range("2020-01-01", periods=len(self.x), freq="s"),
+            "y": self.y
+        })
+        subplot = SubplotTime().add(plot=[plot.line()], x="x", y="y")
+        subplot.set_test_mode(False)
+        option = {**subplot.get_option(0), "x_range": None}
+        self.assertEqual(option["decimate"], "auto")
+
+        cases = [
+            (plot.line(), {}, True),
+            (plot.line(), {"marker": "o"}, False),
+            (plot.line(marker="."), {}, False),
+            (plot.line(), {"linestyle": "none"}, False),
+            (plot.line(linestyle="None", marker="x"), {}, False)
+        ]
+        for action, kwd, decimated in cases:
+            with self.subTest(kwd=kwd, decimated=decimated):
+                fig, ax = plt.subplots()
+                action(df, {**option, **kwd})(ax)
+                self.assertEqual(
+                    len(ax.lines[0].get_xdata()) < len(df), decimated)
+                plt.close(fig)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.excel_reader import ExcelReader
+
+columns = ["i", "f", "mixed", "text", "date", "empty", "flag", "late"]
+sheets = {
+    "first": [
+        [1, 1.5, 1, "a", datetime.datetime(2020, 1, 1), None, True, None],
+        [2, None, 2.5, "b", datetime.datetime(2020, 1, 2), None, False, None],
+        [3, 2.0, 3, None, None, None, True, None],
+        [4, 3.0, 4, "d", datetime.datetime(2020, 1, 4), None, None, 1.5],
+        [5, 4.0, 5, "e", datetime.datetime(2020, 1, 5), None, True, None]
+    ],
+    "second": [
+        [6, 5.0, 6, "f", datetime.datetime(2020, 1, 6), None, False, 2],
+        [7, 6.0, 7, "g", datetime.datetime(2020, 1, 7), None, None, 3]
+    ]
+}
+
+
+class ExcelReaderTestSuite(unittest.TestCase):
+    """Tables read by chunks are the same as read by pandas.read_excel."""
+
+    @classmethod
+    def setUpClass(cls):
+        import openpyxl
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "table.xlsx")
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        for name, rows in sheets.items():
+            sheet = workbook.create_sheet(name)
+            sheet.append(columns)
+            for row in rows:
+                sheet.append(row)
+        workbook.save(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def read(self, **kwd):
+        return ExcelReader(self.path).read(**kwd).assemble().df
+
+    def test_default_is_read_excel(self):
+        self.assertFalse(ExcelReader.isStreamable(self.path, {"header": 0}))
+        pd.testing.assert_frame_equal(self.read(), pd.read_excel(self.path))
+
+    def test_chunks(self):
+        expected = pd.read_excel(self.path)
+        for chunksize in [1, 2, 3, 100]:
+            with self.subTest(chunksize=chunksize):
+                self.assertTrue(ExcelReader.isStreamable(
+                    self.path, {"header": 0, "chunksize": chunksize}))
+                pd.testing.assert_frame_equal(
+                    self.read(chunksize=chunksize), expected)
+
+    def test_chunk_dtypes(self):
+        """
+        Each chunk is parsed like pandas.read_excel,
+            so only missing values change dtypes over chunks.
+        """
+        chunks = list(ExcelReader(self.path).read(chunksize=2).stream())
+        self.assertEqual(chunks[0]["flag"].dtype, bool)
+        self.assertEqual(chunks[1]["flag"].dtype, "float64")
+        self.assertEqual(chunks[0]["empty"].dtype, "float64")
+        self.assertEqual(chunks[1]["text"].dtype, object)
+
+    def test_options(self):
+        options = [
+            {"usecols": ["i", "text", "flag"]},
+            {"usecols": [0, 3]},
+            {"nrows": 3},
+            {"skiprows": 1, "header": None},
+            {"names": list("abcdefgh")},
+            {"dtype": {"i": "float64", "text": str}},
+            {"parse_dates": ["date"]}
+        ]
+        for option in options:
+            with self.subTest(**{k: str(v) for k, v in option.items()}):
+                pd.testing.assert_frame_equal(
+                    self.read(chunksize=2, **option),
+                    pd.read_excel(self.path, **option))
+
+    def test_sheets(self):
+        for sheet_name in [None, ["second", "first"], 1]:
+            with self.subTest(sheet_name=sheet_name):
+                expected = pd.read_excel(self.path, sheet_name=sheet_name)
+                if type(expected) is dict:
+                    expected = pd.concat(expected.values())
+                reader = ExcelReader(self.path)
+                chunks = reader.readStream(
+                    {"header": 0, "sheet_name": sheet_name, "chunksize": 2})
+                pd.testing.assert_frame_equal(
+                    ExcelReader.concat(chunks), expected)
+                pd.testing.assert_frame_equal(
+                    self.read(chunksize=2, sheet_name=sheet_name), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.plot.factor import Grouping, cache_key, factor_cache, crosstab, _reductions
+
+
+def groups_by_pandas(df, f, values):
+    d = df[f] if type(f) is str else f(df)
+    return {k: list(v.dropna()) for k, v in values.groupby(d, sort=True)}
+
+
+class FactorCacheTestSuite(unittest.TestCase):
+    """Groupings are cached only for literal selectors and levels."""
+
+    def setUp(self):
+        factor_cache.clear()
+        self.df = pd.DataFrame({
+            "site": ["a", "b", "a", "c", "b", "a"],
+            "depth": [1., 2., 3., np.nan, 5., 6.]
+        })
+
+    def tearDown(self):
+        factor_cache.clear()
+
+    def split(self, f, factor):
+        grouping, categories = Grouping.of(self.df, f, factor)
+        return dict(zip(categories, map(list, grouping.split(self.df["depth"]))))
+
+    def test_same_as_groupby(self):
+        self.assertEqual(
+            self.split("site", None),
+            groups_by_pandas(self.df, "site", self.df["depth"]))
+
+    def test_cached_for_column_name(self):
+        first, _ = Grouping.of(self.df, "site", None)
+        second, _ = Grouping.of(self.df, "site", None)
+        self.assertIs(first, second)
+
+        by_list, _ = Grouping.of(self.df, "site", ["b", "a"])
+        self.assertIsNot(by_list, first)
+        self.assertEqual(self.split("site", ["b", "a"]),
+                         {"b": [2., 5.], "a": [1., 3., 6.]})
+
+    def test_callable_factor_is_not_cached(self):
+        """
+        Levels returned by the function are the same as the column,
+            but values are different.
+        """
+        self.split("site", None)
+
+        def swap(d):
+            return (d.map({"a": "b", "b": "a", "c": "c"}), pd.Index(["a", "b", "c"]))
+
+        self.assertEqual(self.split("site", swap),
+                         {"a": [2., 5.], "b": [1., 3., 6.], "c": []})
+
+    def test_callable_selector_is_not_cached(self):
+        self.split(lambda df: df["site"], None)
+        self.assertEqual(len(factor_cache.entries), 0)
+
+    def test_cache_key(self):
+        self.assertEqual(cache_key("site", None), ("site", None))
+        self.assertEqual(cache_key("site", ["a"]), ("site", ("list", ("a",))))
+        self.assertIsNone(cache_key(len))
+        self.assertIsNone(cache_key("site", [len]))
+        self.assertIsNone(cache_key("site", [["a"]]))
+
+
+class CrosstabTestSuite(unittest.TestCase):
+    """Aggregated matrix is the same as groupby of pandas."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 1000
+        values = rng.standard_normal(n)
+        values[rng.random(n) < 0.1] = np.nan
+        self.values = pd.Series(values)
+        # Level 3 of rows and level 4 of columns have no values,
+        #   and negative codes are not counted.
+        self.rows = rng.integers(-1, 3, n)
+        self.columns = rng.integers(-1, 4, n)
+        self.shape = (4, 5)
+
+    def expected(self, agg):
+        """
+        Groups without values have the aggregation of an empty table.
+        """
+        valid = (self.rows >= 0) & (self.columns >= 0)
+        grouped = self.values[valid].groupby(
+            [self.rows[valid], self.columns[valid]]).agg(agg)
+        empty = np.asarray(self.values.iloc[:0].to_frame().agg(agg)).ravel()
+        index = pd.MultiIndex.from_product(
+            [range(self.shape[0]), range(self.shape[1])])
+        return grouped.reindex(index, fill_value=empty[0] if len(empty) > 0 else 0)\
+            .to_numpy(dtype="float64").reshape(self.shape)
+
+    def actual(self, agg):
+        return crosstab(
+            self.values, self.rows, self.shape[0],
+            self.columns, self.shape[1], agg)
+
+    def test_supported_aggregations(self):
+        for agg in _reductions.keys():
+            with self.subTest(agg=agg):
+                np.testing.assert_allclose(
+                    self.actual(agg), self.expected(agg), equal_nan=True)
+
+    def test_other_aggregations(self):
+        for agg in ["median", "std", lambda v: v.max() - v.min()]:
+            with self.subTest(agg=agg):
+                np.testing.assert_allclose(
+                    self.actual(agg), self.expected(agg), equal_nan=True)
+
+    def test_same_as_pandas_crosstab(self):
+        valid = (self.rows >= 0) & (self.columns >= 0)
+        table = pd.crosstab(
+            self.rows[valid], self.columns[valid],
+            values=self.values.to_numpy()[valid], aggfunc="mean")
+        np.testing.assert_allclose(
+            self.actual("mean")[:3, :4], table.to_numpy(), equal_nan=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
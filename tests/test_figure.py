@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat import Figure, Subplot
+import matdat.plot as plot
+
+
+class PrefetchTestSuite(unittest.TestCase):
+    """Data of subplots are read once in worker threads."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.csv")
+        pd.DataFrame({"a": [0, 1, 2], "b": [3, 4, 5]}).to_csv(self.path, index=False)
+
+        self.reads = []
+        read = Subplot.read
+
+        def recorded(subplot, i):
+            self.reads.append((id(subplot), i, threading.current_thread()))
+            return read(subplot, i)
+        patcher = mock.patch.object(Subplot, "read", autospec=True, side_effect=recorded)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        plt.close("all")
+        self.directory.cleanup()
+
+    def figure(self, *data):
+        figure = Figure()
+        for d in data:
+            figure.add_subplot(Subplot().add(
+                data=d, plot=[plot.line()], x="a", y=("b", "a")))
+        return figure
+
+    def assertReadOnce(self, figure, axes):
+        self.assertEqual(len(axes), figure.get_length())
+        self.assertEqual(
+            sorted((s, i) for s, i, _ in self.reads),
+            sorted((id(s), i) for s in figure.subplots for i in range(s.length)))
+        self.assertTrue(all(
+            t is not threading.main_thread() for *_, t in self.reads))
+        self.assertTrue(all(len(s.prefetched) == 0 for s in figure.subplots))
+        for ax in axes.values():
+            self.assertEqual(len(ax.lines), 2)
+
+    def test_show_prefetch(self):
+        figure = self.figure(self.path, self.path, self.path)
+        fig, axes = figure.show(size=(4, 3), column=3, prefetch=2)
+        self.assertReadOnce(figure, axes)
+
+    def test_show_async(self):
+        figure = self.figure(self.path, self.path)
+        fig, axes = asyncio.run(figure.show_async(size=(4, 3), column=2))
+        self.assertReadOnce(figure, axes)
+
+    def test_error_reaches_caller(self):
+        missing = os.path.join(self.directory.name, "missing.csv")
+        with self.assertRaises(FileNotFoundError):
+            self.figure(self.path, missing).show(size=(4, 3), column=2, prefetch=True)
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(self.figure(missing, self.path).show_async(size=(4, 3), column=2))
+
+    def test_error_of_transformer_reaches_caller(self):
+        def broken(df):
+            raise ValueError("broken transformer")
+
+        figure = Figure().add_subplot(Subplot().add(
+            data=self.path, transformer=broken, plot=[plot.line()], x="a", y="b"))
+        with self.assertRaisesRegex(ValueError, "broken transformer"):
+            figure.show(size=(4, 3), prefetch=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.get_path import getFileList, getAllSubPath, isMatchAll, literalPrefix, ListingCache
+
+
+class GetPathTestSuite(unittest.TestCase):
+    """Listings are the same as filtering all paths by glob."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name + "/"
+        for d in ["Data/a", "Data/b", "data/c", "other"]:
+            os.makedirs(self.root + d)
+            for name in ["x.csv", "y.txt"]:
+                with open(os.path.join(self.root, d, name), "w") as f:
+                    f.write("a\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def expected(self, *patterns):
+        isMatch = isMatchAll(patterns)
+        return [p for p in getAllSubPath(self.root) if isMatch(p)]
+
+    def listing(self, *patterns, cache=None):
+        return getFileList(*patterns, cache=cache)(self.root).paths
+
+    def test_same_as_glob(self):
+        for patterns in [
+            (r"\.csv$",),
+            ("^" + re.escape(self.root + "Data/"), r"\.csv$"),
+            ("^" + re.escape(self.root + "da"),),
+        ]:
+            self.assertEqual(self.listing(*patterns), self.expected(*patterns))
+
+    def test_compiled_pattern(self):
+        pattern = re.compile("^" + re.escape(self.root + "Data/a"))
+        self.assertEqual(literalPrefix(pattern), self.root + "Data/a")
+        self.assertEqual(self.listing(pattern), self.expected(pattern))
+
+    def test_ignorecase_is_not_pruned(self):
+        pattern = re.compile("^" + re.escape(self.root + "data/"), re.IGNORECASE)
+        self.assertEqual(literalPrefix(pattern), "")
+        paths = self.listing(pattern, r"\.csv$")
+        self.assertEqual(paths, self.expected(pattern, r"\.csv$"))
+        self.assertEqual(len(paths), 3)
+
+    def test_bytes_pattern_has_no_prefix(self):
+        self.assertEqual(literalPrefix(re.compile(b"^abc")), "")
+
+    def test_listing_cache(self):
+        cache = ListingCache()
+        patterns = (r"\.csv$",)
+        first = self.listing(*patterns, cache=cache)
+        second = self.listing(*patterns, cache=cache)
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Adding a file changes modification time of the directory.
+        with open(self.root + "other/z.csv", "w") as f:
+            f.write("a\n")
+        self.assertEqual(self.listing(*patterns, cache=cache),
+                         self.expected(*patterns))
+        self.assertEqual(cache.misses, 2)
+
+    def test_flags_are_part_of_cache_key(self):
+        cache = ListingCache()
+        prefix = "^" + re.escape(self.root + "data/")
+        self.listing(re.compile(prefix), cache=cache)
+        paths = self.listing(re.compile(prefix, re.IGNORECASE), cache=cache)
+        self.assertEqual(paths, self.expected(re.compile(prefix, re.IGNORECASE)))
+
+
+if __name__ == '__main__':
+    unittest.main()
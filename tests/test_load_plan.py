@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat import Figure, Subplot, SubplotTime
+from matdat.data_loader import TableLoader
+import matdat.plot as plot
+
+
+class LoadPlanTestSuite(unittest.TestCase):
+    """Series reading the same files are grouped and read once."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        table = pd.DataFrame({
+            "time": pd.date_range("2020-01-01", periods=10, freq="h").astype(str),
+            "x": range(10),
+            "y1": range(10, 20),
+            "y2": range(20, 30),
+            "y3": range(30, 40)
+        })
+        self.shared = os.path.join(self.directory.name, "shared.csv")
+        self.other = os.path.join(self.directory.name, "other.csv")
+        table.to_csv(self.shared, index=False)
+        table.to_csv(self.other, index=False)
+
+    def tearDown(self):
+        plt.close("all")
+        self.directory.cleanup()
+
+    def figure(self):
+        return Figure().add_subplot(
+            Subplot().add(data=self.shared, plot=[plot.line()], x="x", y="y1"),
+            Subplot()
+            .add(data=self.shared, plot=[plot.line()], x="x", y="y2")
+            .add(data=self.other, plot=[plot.line()], x="x", y="y3"),
+            Subplot().add(
+                data=self.shared, dataInfo={"nrows": 5},
+                plot=[plot.line()], x="x", y="y3"),
+            name=["a", "b", "c"]
+        )
+
+    def test_groups(self):
+        groups = self.figure().plan().groups
+        self.assertEqual(len(groups), 3)
+        shared, other, limited = groups
+        self.assertEqual(
+            [(name, r["i"]) for _, name, r in shared["consumers"]],
+            [("a", 0), ("b", 0)])
+        self.assertEqual(shared["columns"], {"x", "y1", "y2"})
+        self.assertEqual(
+            [(name, r["i"]) for _, name, r in other["consumers"]], [("b", 1)])
+        # Different options are read separately.
+        self.assertEqual(limited["meta"]["nrows"], 5)
+        self.assertEqual(
+            [(name, r["i"]) for _, name, r in limited["consumers"]], [("c", 0)])
+
+    def test_explain(self):
+        explained = self.figure().explain()
+        self.assertEqual(
+            list(explained.columns),
+            ["source", "files", "columns", "time_window", "series", "shared"])
+        self.assertEqual(
+            explained["source"].tolist(), [self.shared, self.other, self.shared])
+        self.assertEqual(explained["files"].tolist(), [1, 1, 1])
+        self.assertEqual(
+            explained["columns"].tolist(),
+            [["x", "y1", "y2"], ["x", "y3"], ["x", "y3"]])
+        self.assertEqual(
+            explained["series"].tolist(),
+            [[("a", 0, 0), ("b", 0, 0)], [("b", 1, 0)], [("c", 0, 0)]])
+        self.assertEqual(explained["shared"].tolist(), [True, False, False])
+        self.assertEqual(explained["time_window"].tolist(), [None, None, None])
+
+    def test_explain_time_window(self):
+        figure = Figure().add_subplot(
+            SubplotTime(xlim=["2020-01-01 01:00", "2020-01-01 03:00"])
+            .add(data=self.shared, index="time", plot=[plot.line()], y="y1"),
+            SubplotTime(xlim=["2020-01-01 02:00", "2020-01-01 06:00"])
+            .add(data=self.shared, index="time", plot=[plot.line()], y="y2"),
+            name=["early", "late"]
+        )
+        explained = figure.explain()
+        self.assertEqual(len(explained), 1)
+        self.assertEqual(
+            explained["time_window"][0],
+            tuple(pd.to_datetime(["2020-01-01 01:00", "2020-01-01 06:00"])))
+        self.assertEqual(explained["columns"][0], ["time", "y1", "y2"])
+        self.assertEqual(
+            explained["series"][0], [("early", 0, 0), ("late", 0, 0)])
+
+    def test_test_mode_is_not_planned(self):
+        self.assertEqual(len(self.figure().explain(test=True)), 0)
+
+    def test_execute(self):
+        """
+        Shared files are read once,
+            and each series gets the same table as reading by itself.
+        """
+        figure = self.figure()
+        expected = {}
+        for name, subplot in zip(figure.axIdentifier, figure.subplots):
+            subplot.set_test_mode(False)
+            for i in range(subplot.length):
+                expected[(name, i)] = subplot.read(i)
+
+        read = TableLoader.readEach
+        with mock.patch.object(TableLoader, "readEach", autospec=True, side_effect=read) as reader:
+            figure.plan().execute()
+        self.assertEqual(reader.call_count, 1)
+
+        prefetched = {
+            (name, i): dfs
+            for name, subplot in zip(figure.axIdentifier, figure.subplots)
+            for i, dfs in subplot.prefetched.items()
+        }
+        self.assertEqual(sorted(prefetched.keys()), [("a", 0), ("b", 0)])
+        for key, dfs in prefetched.items():
+            for df, expected_df in zip(dfs, expected[key]):
+                pd.testing.assert_frame_equal(df, expected_df)
+
+    def test_show_with_plan(self):
+        fig, axes = self.figure().show(size=(4, 3), column=3, plan=True)
+        self.assertEqual(
+            [len(ax.lines) for ax in axes.values()], [1, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat import SubplotTime, CsvReader
+import matdat.plot as plot
+from matdat.pipeline import Pipeline, SetIndex, FilterBetween, IndexBetween, Opaque
+
+
+def unoptimized(steps, df):
+    for step in steps:
+        df = step(df)
+    return df
+
+
+class FilterBetweenTestSuite(unittest.TestCase):
+    """Bounds of FilterBetween are exclusive unless flags are given."""
+
+    def setUp(self):
+        self.sorted = pd.DataFrame({"v": [0, 1, 1, 2, 3, 4], "w": list("abcdef")})
+        self.unsorted = self.sorted.iloc[[3, 0, 5, 1, 4, 2]]
+
+    def test_exclusive_bounds(self):
+        f = FilterBetween("v", 1, 3)
+        self.assertIsNotNone(f.slice(self.sorted))
+        self.assertIsNone(f.slice(self.unsorted))
+
+        self.assertEqual(f(self.sorted)["v"].tolist(), [2])
+        self.assertEqual(sorted(f(self.unsorted)["v"].tolist()), [2])
+
+    def test_boundary_values(self):
+        cases = [
+            ((1, 3, False, False), [2]),
+            ((1, 3, True, False), [1, 1, 2]),
+            ((1, 3, False, True), [2, 3]),
+            ((1, 3, True, True), [1, 1, 2, 3]),
+            ((1, None, False, False), [2, 3, 4]),
+            ((None, 1, False, True), [0, 1, 1]),
+            ((1, 1, True, True), [1, 1]),
+            ((1, 1, False, True), [])
+        ]
+        for bounds, expected in cases:
+            with self.subTest(bounds=bounds):
+                f = FilterBetween("v", *bounds)
+                self.assertEqual(f(self.sorted)["v"].tolist(), expected)
+                self.assertEqual(sorted(f(self.unsorted)["v"].tolist()), expected)
+
+    def test_slice_equals_mask(self):
+        for lower, upper in [(1, 3), (None, 2), (2, None), (5, 9), (3, 1)]:
+            for inclusive in [(False, False), (True, True), (True, False)]:
+                f = FilterBetween("v", lower, upper, *inclusive)
+                pd.testing.assert_frame_equal(
+                    f(self.sorted), f(self.unsorted).sort_index())
+
+    def test_index(self):
+        df = self.sorted.set_index(
+            pd.date_range("2020-01-01", periods=6, freq="D"))
+        f = FilterBetween(None, *pd.to_datetime(["2020-01-02", "2020-01-04"]))
+        self.assertEqual(f(df)["w"].tolist(), ["c"])
+        self.assertEqual(f(df.iloc[::-1])["w"].tolist(), ["c"])
+
+        f = FilterBetween(None, *pd.to_datetime(["2020-01-02", "2020-01-04"]), True, True)
+        self.assertEqual(f(df)["w"].tolist(), ["b", "c", "d"])
+        self.assertEqual(f(df.iloc[::-1])["w"].tolist(), ["d", "c", "b"])
+
+
+class PushdownTestSuite(unittest.TestCase):
+    """Optimized plans give the same table as applying steps in order."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "date": pd.date_range("2020-01-01", periods=10, freq="h"),
+            "depth": [5, 1, 9, 3, 7, 2, 8, 4, 6, 0],
+        })
+
+    def assertSameResult(self, steps, meta={}):
+        _, pipeline = Pipeline.of(*steps).pushdown(meta)
+        pd.testing.assert_frame_equal(
+            pipeline(self.df), unoptimized(steps, self.df))
+        return pipeline
+
+    def test_filter_of_column_is_moved_before_index(self):
+        steps = [SetIndex(["date"]), FilterBetween("depth", 2, 7)]
+        pipeline = self.assertSameResult(steps)
+        self.assertIsInstance(pipeline.steps[0], FilterBetween)
+
+    def test_filter_of_parsed_index(self):
+        steps = [
+            SetIndex(["date"]),
+            FilterBetween(None, *pd.to_datetime(["2020-01-01 02:00", "2020-01-01 05:00"]))
+        ]
+        pipeline = self.assertSameResult(steps, {"parse_dates": ["date"]})
+        self.assertIsInstance(pipeline.steps[0], IndexBetween)
+
+    def test_steps_after_opaque_are_kept(self):
+        steps = [
+            Opaque(lambda df: df.assign(depth=df["depth"] * 2)),
+            FilterBetween("depth", 4, 10)
+        ]
+        pipeline = self.assertSameResult(steps)
+        self.assertIsInstance(pipeline.steps[0], Opaque)
+
+    def test_unbounded_filter_is_removed(self):
+        pipeline = self.assertSameResult([FilterBetween("depth", None, pd.NaT)])
+        self.assertEqual(pipeline.steps, [])
+
+
+class ReadOptionTestSuite(unittest.TestCase):
+    """Time columns of filtered indexes are parsed by readers."""
+
+    def setUp(self):
+        self.window = pd.to_datetime(["2020-01-01 02:00", "2020-01-01 05:00"])
+
+    def test_parse_dates(self):
+        meta, pipeline = Pipeline.of(
+            SetIndex(["date"]), FilterBetween(None, *self.window)
+        ).pushdown({"header": 0})
+        self.assertEqual(meta, {"header": 0, "parse_dates": ["date"]})
+        self.assertIsInstance(pipeline.steps[0], IndexBetween)
+
+        meta, _ = Pipeline.of(
+            SetIndex(["date"]), FilterBetween(None, self.window[0], None)
+        ).pushdown({"parse_dates": ["other"]})
+        self.assertEqual(meta, {"parse_dates": ["other", "date"]})
+
+    def test_not_pushed(self):
+        cases = [
+            # Opaque steps may use the unparsed column.
+            ([SetIndex(["date"]), FilterBetween(None, *self.window), Opaque(len)], {}),
+            # Bounds are not datetime.
+            ([SetIndex(["date"]), FilterBetween(None, 1, 2)], {}),
+            # Index made from multiple columns.
+            ([SetIndex(["date", "time"]), FilterBetween(None, *self.window)], {}),
+            # Type of the column is given by the user.
+            ([SetIndex(["date"]), FilterBetween(None, *self.window)], {"dtype": {"date": str}}),
+            ([SetIndex(["date"]), FilterBetween(None, *self.window)], {"parse_dates": True})
+        ]
+        for steps, meta in cases:
+            with self.subTest(steps=steps, meta=meta):
+                pushed, _ = Pipeline.of(*steps).pushdown(meta)
+                self.assertEqual(pushed, meta)
+
+    def test_reader_receives_parse_dates(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "log.csv")
+        df = pd.DataFrame({
+            "date": pd.date_range("2020-01-01", periods=10, freq="h"),
+            "v": range(10)
+        })
+        df.to_csv(path, index=False)
+
+        subplot = SubplotTime(xlim=["2020-01-01 02:00", "2020-01-01 05:00"])\
+            .add(data=path, index="date", plot=[plot.line()], y="v")
+        subplot.set_test_mode(False)
+        subplot.normalize_xlim()
+
+        read = CsvReader.read
+        with mock.patch.object(CsvReader, "read", autospec=True, side_effect=read) as reader:
+            table = subplot.read(0)[0]
+        self.assertEqual(reader.call_args.kwargs["parse_dates"], ["date"])
+        self.assertEqual(table["v"].tolist(), [3, 4])
+        self.assertEqual(
+            list(table.index), list(pd.date_range("2020-01-01 03:00", periods=2, freq="h")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat import Subplot, requires
+import matdat.plot as plot
+
+
+class ProjectionTestSuite(unittest.TestCase):
+    """Columns required by plot actions."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.csv")
+        pd.DataFrame({
+            "a": [0, 1, 2],
+            "b": [3, 4, 5],
+            "c": [6, 7, 8],
+            "d": [9, 10, 11]
+        }).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_option_selectors(self):
+        subplot = Subplot().add(
+            data=self.path, plot=[plot.line()], x="a", y="b")
+        self.assertEqual(subplot.required_columns(0), {"a", "b"})
+        subplot.set_test_mode(False)
+        self.assertEqual(list(subplot.read(0)[0].columns), ["a", "b"])
+
+    def test_preset_selectors(self):
+        subplot = Subplot().add(
+            data=self.path, plot=[plot.line(y="c")], x="a")
+        self.assertEqual(subplot.required_columns(0), {"a", "c"})
+
+    def test_declared_callable(self):
+        subplot = Subplot().add(
+            data=self.path, plot=[plot.line()],
+            x="a", y=requires("b", "c")(lambda df: df["b"] + df["c"]))
+        self.assertEqual(subplot.required_columns(0), {"a", "b", "c"})
+
+    def test_undeclared_callable(self):
+        subplot = Subplot().add(
+            data=self.path, plot=[plot.line()],
+            x="a", y=lambda df: df["b"] + df["c"])
+        self.assertIsNone(subplot.required_columns(0))
+
+    def test_custom_action_reads_all_columns(self):
+        def custom(df, option):
+            return lambda ax: ax.plot(df[option["x"]], df[option["depth"]])
+
+        subplot = Subplot().add(
+            data=self.path, plot=[custom], x="a", depth="d")
+        self.assertIsNone(subplot.required_columns(0))
+        subplot.set_test_mode(False)
+        self.assertEqual(
+            list(subplot.read(0)[0].columns), ["a", "b", "c", "d"])
+
+    def test_custom_action_with_selector_keys(self):
+        def custom(df, option):
+            return lambda ax: ax.plot(df[option["x"]], df[option["depth"]])
+        custom.selector_keys = ["x", "depth"]
+
+        subplot = Subplot().add(
+            data=self.path, plot=[custom], x="a", depth="d")
+        self.assertEqual(subplot.required_columns(0), {"a", "d"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.read_cache import ReadCache
+
+
+class ReadCacheTestSuite(unittest.TestCase):
+    """Tables shared by subplots through the memory cache."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.csv")
+        pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})\
+            .to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cached_table_equals_read_table(self):
+        cache = ReadCache()
+        key = ReadCache.key(self.path, {"usecols": ["a"]})
+        first = cache.load(key, lambda: pd.read_csv(self.path))
+        second = cache.load(key, lambda: self.fail("read again"))
+        self.assertIs(first, second)
+        pd.testing.assert_frame_equal(second, pd.read_csv(self.path))
+        self.assertEqual(cache.info()["hits"], 1)
+
+    def test_modified_file_is_read_again(self):
+        key = ReadCache.key(self.path)
+        pd.DataFrame({"a": [4]}).to_csv(self.path, index=False)
+        os.utime(self.path, ns=(0, 1))
+        self.assertNotEqual(key, ReadCache.key(self.path))
+
+    def test_size_includes_strings(self):
+        df = pd.DataFrame({"s": ["x" * 1000] * 100})
+        self.assertGreater(ReadCache.sizeof(df), 100 * 1000)
+
+        cache = ReadCache(max_bytes=50 * 1000)
+        cache.load(ReadCache.key(self.path), lambda: df)
+        self.assertEqual(cache.info()["count"], 0)
+
+    def test_number_of_entries_is_bounded(self):
+        cache = ReadCache(max_entries=2)
+        for i in range(3):
+            cache.load(ReadCache.key(self.path, i), lambda: pd.DataFrame({"a": [i]}))
+        self.assertEqual(cache.info()["count"], 2)
+        self.assertNotIn(ReadCache.key(self.path, 0), cache.entries)
+        self.assertIn(ReadCache.key(self.path, 2), cache.entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
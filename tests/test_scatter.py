@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.colors
+import matplotlib.dates
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat import Subplot
+import matdat.plot as plot
+
+
+class DensityTestSuite(unittest.TestCase):
+    """Scatter drawn as an image of pixels."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            "x": rng.standard_normal(10000),
+            "y": rng.standard_normal(10000),
+            "c": rng.random(10000)
+        })
+        self.fig, self.ax = plt.subplots()
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def draw(self, df=None, **kwargs):
+        plot.scatter(density=True, **kwargs)(
+            self.df if df is None else df, {"x": "x", "y": "y"})(self.ax)
+        return self.ax.images[0]
+
+    def test_count(self):
+        image = self.draw()
+        self.assertEqual(image.get_array().sum(), len(self.df))
+
+    def test_log(self):
+        image = self.draw(log=True)
+        self.assertIsInstance(image.norm, matplotlib.colors.LogNorm)
+
+    def test_log_with_norm(self):
+        with self.assertRaises(ValueError):
+            self.draw(log=True, norm=matplotlib.colors.PowerNorm(0.5))
+
+        image = self.draw(norm=matplotlib.colors.PowerNorm(0.5))
+        self.assertIsInstance(image.norm, matplotlib.colors.PowerNorm)
+
+    def test_zoomed_range(self):
+        """
+        Pixels cover the visible range, so that the resolution
+            does not depend on outliers.
+        """
+        image = self.draw(x_range=[-0.5, 0.5], y_range=[0, 1])
+        self.assertEqual(tuple(image.get_extent()), (-0.5, 0.5, 0, 1))
+
+        x, y = self.df["x"], self.df["y"]
+        inside = (x >= -0.5) & (x <= 0.5) & (y >= 0) & (y <= 1)
+        self.assertEqual(image.get_array().sum(), inside.sum())
+
+        bbox = self.ax.get_window_extent()
+        self.assertEqual(
+            image.get_array().shape,
+            (int(np.ceil(bbox.height)), int(np.ceil(bbox.width))))
+
+    def test_half_open_range(self):
+        image = self.draw(x_range=[0, None])
+        lo, hi, *_ = image.get_extent()
+        self.assertEqual(lo, 0)
+        self.assertEqual(hi, self.df["x"].max())
+        self.assertEqual(image.get_array().sum(), (self.df["x"] >= 0).sum())
+
+    def test_time_range(self):
+        df = pd.DataFrame({
+            "x": pd.date_range("2020-01-01", periods=100, freq="h"),
+            "y": np.arange(100.)
+        })
+        image = self.draw(df, x_range=pd.to_datetime(["2020-01-02", "2020-01-03"]))
+        lo, hi, *_ = image.get_extent()
+        self.assertEqual(
+            [lo, hi],
+            [matplotlib.dates.date2num(pd.Timestamp(d)) for d in ["2020-01-02", "2020-01-03"]])
+        self.assertEqual(image.get_array().sum(), 25)
+
+    def test_subplot_limits(self):
+        subplot = Subplot(xlim=[-0.5, 0.5], ylim=[0, 1]).add(
+            data=self.df, plot=[plot.scatter(density=True)], x="x", y="y")
+        subplot.set_test_mode(False)
+        option = subplot.get_option(0)
+        self.assertEqual(
+            (option["x_range"], option["y_range"]), ([-0.5, 0.5], [0, 1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.stream import RunningLimits, LineDecimator, ReservoirSample, Histogram
+from matdat.decimate import minmax_indices
+
+
+def consume(consumer, df, chunksize):
+    for start in range(0, len(df), chunksize):
+        consumer.consume(df.iloc[start:start + chunksize])
+    return consumer.result()
+
+
+class StreamTestSuite(unittest.TestCase):
+    """Results of consumers of chunks are the same as of the whole table."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 100000
+        self.df = pd.DataFrame({
+            "x": np.arange(n, dtype="float64"),
+            "y": rng.standard_normal(n).cumsum(),
+            "z": rng.standard_normal(n),
+            "time": pd.date_range("2020-01-01", periods=n, freq="s")
+        })
+
+    def test_running_limits(self):
+        result = consume(RunningLimits(), self.df, 7000)
+        for c in ["x", "y", "z", "time"]:
+            self.assertEqual(result.loc["min", c], self.df[c].min())
+            self.assertEqual(result.loc["max", c], self.df[c].max())
+
+        result = consume(RunningLimits(["y"]), self.df, 7000)
+        self.assertEqual(list(result.columns), ["y"])
+
+    def test_line_decimator_with_xlim(self):
+        """
+        Buckets are fixed by xlim, so the result is the same as
+            decimating the whole table.
+        """
+        width = 100
+        xlim = [0, len(self.df) - 1]
+        result = consume(
+            LineDecimator(y="y", x="x", width=width, xlim=xlim), self.df, 3000)
+        index = minmax_indices(
+            self.df["x"], self.df["y"], width, (float(xlim[0]), float(xlim[1])))
+        pd.testing.assert_frame_equal(result, self.df.iloc[index])
+
+    def test_line_decimator_keeps_extremes(self):
+        width = 100
+        result = consume(LineDecimator(y=["y", "z"], x="x", width=width), self.df, 3000)
+        self.assertLessEqual(len(result), 2 * 4 * width)
+        for c in ["y", "z"]:
+            self.assertEqual(result[c].max(), self.df[c].max())
+            self.assertEqual(result[c].min(), self.df[c].min())
+        self.assertTrue(result["x"].is_monotonic_increasing)
+
+    def test_reservoir_sample(self):
+        size = 1000
+        result = consume(ReservoirSample(size, seed=0), self.df, 7000)
+        sample = result.iloc[:size]
+        self.assertEqual(len(sample), size)
+        self.assertFalse(sample.index.has_duplicates)
+        pd.testing.assert_frame_equal(sample, self.df.loc[sample.index])
+        # Uniform sample of row positions.
+        self.assertAlmostEqual(
+            sample.index.to_series().mean() / len(self.df), 0.5, delta=0.05)
+
+        for c in ["y", "z"]:
+            self.assertEqual(result[c].max(), self.df[c].max())
+            self.assertEqual(result[c].min(), self.df[c].min())
+
+    def test_reservoir_sample_smaller_than_size(self):
+        result = consume(
+            ReservoirSample(1000, keep_extremes=False), self.df.iloc[:500], 100)
+        pd.testing.assert_frame_equal(result, self.df.iloc[:500])
+
+    def assertSameAsNumpy(self, result, values):
+        edges = np.append(result["left"].values, result["right"].values[-1])
+        expected, _ = np.histogram(values, edges)
+        # np.histogram includes the right edge in the last bin.
+        expected[-1] = expected[-1] - np.count_nonzero(values == edges[-1])
+        np.testing.assert_array_equal(result["count"].values, expected)
+
+    def test_histogram(self):
+        result = consume(Histogram("z", bins=50), self.df, 7000)
+        self.assertEqual(result["count"].sum(), len(self.df))
+        self.assertSameAsNumpy(result, self.df["z"].values)
+
+    def test_histogram_with_range(self):
+        result = consume(Histogram("z", bins=20, range=(-1, 1)), self.df, 7000)
+        self.assertEqual(len(result), 20)
+        z = self.df["z"].values
+        self.assertEqual(result["count"].sum(), np.count_nonzero((z >= -1) & (z <= 1)))
+
+    def test_histogram_outlier(self):
+        """
+        An outlier after a narrow first chunk does not extend bins
+            beyond max_bins.
+        """
+        values = np.concatenate([
+            np.linspace(0, 1e-3, 1000), [1e5], np.linspace(0, 1, 1000), [-3e4]])
+        df = pd.DataFrame({"v": values})
+        histogram = Histogram("v", bins=100)
+        result = consume(histogram, df, 1000)
+        self.assertLessEqual(len(result), 400)
+        self.assertEqual(result["count"].sum(), len(values))
+        self.assertLessEqual(result["left"].iloc[0], values.min())
+        self.assertGreater(result["right"].iloc[-1], values.max())
+        self.assertSameAsNumpy(result, values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.data_loader import TableLoader
+from matdat.schema import Schema
+from matdat.table_cache import TableCache
+
+
+class TableCacheTestSuite(unittest.TestCase):
+    """Tables parsed through the on-disk cache."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.csv")
+        pd.DataFrame({
+            "a": np.arange(10) * 0.5,
+            "b": list("xyxyxyxyxy")
+        }).to_csv(self.path, index=False)
+        self.cache = TableCache(
+            os.path.join(self.directory.name, "cache"), format="parquet")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cached_table_equals_parsed_table(self):
+        expected = pd.read_csv(self.path)
+        loader = TableLoader(cache=self.cache)
+        first = loader.read(self.path)
+        second = loader.read(self.path)
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+        self.assertEqual(self.cache.info()["hits"], 1)
+
+    def test_modified_file_is_parsed_again(self):
+        loader = TableLoader(cache=self.cache)
+        loader.read(self.path)
+        pd.DataFrame({"a": [1.5], "b": ["z"]}).to_csv(self.path, index=False)
+        os.utime(self.path, ns=(0, 1))
+        pd.testing.assert_frame_equal(
+            loader.read(self.path), pd.read_csv(self.path))
+
+    def test_schema_settings_are_part_of_key(self):
+        loader = TableLoader(cache=self.cache)
+        as_float32 = loader.read(self.path, schema=Schema(float32=True))
+        as_float64 = loader.read(self.path, schema=Schema(float32=False))
+        self.assertEqual(as_float32["a"].dtype, np.float32)
+        self.assertEqual(as_float64["a"].dtype, np.float64)
+
+        as_category = loader.read(self.path, schema=Schema(category=["b"]))
+        self.assertEqual(as_category["b"].dtype.name, "category")
+
+
+class TableCacheUnitTestSuite(unittest.TestCase):
+    """Keys, storage, and eviction of the cache itself."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.csv")
+        with open(self.path, "w") as f:
+            f.write("a,b\n1,x\n2,y\n")
+        self.df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def cache(self, **kwd):
+        return TableCache(os.path.join(self.directory.name, "cache"), **kwd)
+
+    def test_fingerprint(self):
+        key = TableCache.fingerprint(self.path, {"sep": ","})
+        self.assertRegex(key, r"^[0-9a-f]{40}$")
+        self.assertEqual(key, TableCache.fingerprint(self.path, {"sep": ","}))
+        self.assertNotEqual(key, TableCache.fingerprint(self.path, {"sep": ";"}))
+
+        os.utime(self.path, ns=(0, 1))
+        self.assertNotEqual(key, TableCache.fingerprint(self.path, {"sep": ","}))
+
+    def test_round_trip(self):
+        for format in ["parquet", "feather"]:
+            with self.subTest(format=format):
+                cache = self.cache(format=format)
+                calls = []
+
+                def parse():
+                    calls.append(1)
+                    return self.df
+
+                first = cache.load(self.path, {}, parse)
+                second = cache.load(self.path, {}, parse)
+                pd.testing.assert_frame_equal(first, self.df)
+                pd.testing.assert_frame_equal(second, self.df)
+                self.assertEqual(len(calls), 1)
+                self.assertEqual(cache.info()["files"], 1)
+                cache.clear()
+
+    def test_invalid_format(self):
+        with self.assertRaises(SystemError):
+            self.cache(format="csv")
+
+    def test_not_a_table_is_not_stored(self):
+        cache = self.cache()
+        self.assertEqual(cache.load(self.path, {}, lambda: None), None)
+        self.assertEqual(cache.info()["files"], 0)
+
+    def test_eviction(self):
+        cache = self.cache()
+        cache.put("0" * 40, self.df)
+        size = cache.info()["bytes"]
+        os.utime(cache.cachePath("0" * 40), ns=(0, 0))
+
+        cache.max_bytes = size
+        cache.put("1" * 40, self.df)
+        self.assertFalse(os.path.isfile(cache.cachePath("0" * 40)))
+        self.assertTrue(os.path.isfile(cache.cachePath("1" * 40)))
+
+    def test_pickle(self):
+        cache = self.cache()
+        cache.load(self.path, {}, lambda: self.df)
+        restored = pickle.loads(pickle.dumps(cache))
+        pd.testing.assert_frame_equal(
+            restored.load(self.path, {}, lambda: None), self.df)
+        self.assertEqual(restored.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
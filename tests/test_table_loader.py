@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.data_loader import TableLoader
+from matdat.csv_reader import CsvReader
+
+
+class TableLoaderTestSuite(unittest.TestCase):
+    """Tables loaded by optimized paths are the same as the full read."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(4):
+            path = os.path.join(self.directory.name, f"data{i}.csv")
+            pd.DataFrame({
+                "datetime": pd.date_range(f"2020-01-0{i + 1}", periods=5000, freq="10s")
+                .strftime("%Y/%m/%d %H:%M:%S"),
+                "depth": np.arange(5000) * 0.1 + i,
+                "site": ["a", "b"] * 2500
+            }).to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def full(self, paths=None):
+        return pd.concat([pd.read_csv(p) for p in paths or self.paths])
+
+    def test_parallel_equals_sequential(self):
+        expected = self.full()
+        for loader in [
+            TableLoader(),
+            TableLoader(max_workers=4),
+            TableLoader(max_workers=4, executor="process")
+        ]:
+            pd.testing.assert_frame_equal(loader.read(self.paths), expected)
+
+    def test_order_of_files(self):
+        dfs = TableLoader(max_workers=4).readEach(self.paths)
+        for df, path in zip(dfs, self.paths):
+            pd.testing.assert_frame_equal(df, pd.read_csv(path))
+
+    def test_tail(self):
+        CsvReader.clearTail()
+        loader = TableLoader(tail=True)
+        pd.testing.assert_frame_equal(loader.read(self.paths), self.full())
+        with open(self.paths[1], "a") as f:
+            f.write("2020/01/31 00:00:00,-1,c\n")
+        pd.testing.assert_frame_equal(loader.read(self.paths), self.full())
+        CsvReader.clearTail()
+
+    def test_columns(self):
+        df = TableLoader().read(self.paths, columns={"depth"})
+        pd.testing.assert_frame_equal(df, self.full()[["depth"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
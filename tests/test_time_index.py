@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.data_loader import TableLoader
+from matdat.pipeline import FilterBetween
+from matdat.time_index import TimeIndex, sidecar_suffix
+
+
+class TimeIndexTestSuite(unittest.TestCase):
+    """Rows read through the time index are the same as the full read."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.csv")
+        pd.DataFrame({
+            "datetime": pd.date_range("2020-01-01", periods=5000, freq="10s")
+            .strftime("%Y/%m/%d %H:%M:%S"),
+            "depth": np.arange(5000) * 0.1
+        }).to_csv(self.path, index=False)
+        self.paths = [self.path]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_time_index(self):
+        lower, upper = pd.to_datetime(["2020-01-01 03:00", "2020-01-01 05:00"])
+        window = {"columns": ["datetime"], "lower": lower, "upper": upper}
+        path = self.path
+
+        def read(loader):
+            df = loader.read(path, meta={"parse_dates": ["datetime"]},
+                             time_window=window)
+            return FilterBetween("datetime", lower, upper)(df)
+
+        expected = read(TableLoader())
+        df = TableLoader(time_index=True).read(
+            path, meta={"parse_dates": ["datetime"]}, time_window=window)
+        self.assertTrue(os.path.exists(path + sidecar_suffix))
+        self.assertLess(len(df), 5000)
+        pd.testing.assert_frame_equal(
+            FilterBetween("datetime", lower, upper)(df), expected)
+
+        # The index is rebuilt for the modified file.
+        with open(path, "a") as f:
+            f.write("2020/01/01 04:30:00,-1\n")
+        os.utime(path, ns=(0, 1))
+        pd.testing.assert_frame_equal(
+            read(TableLoader(time_index=True)), read(TableLoader()))
+
+
+    def test_skipped_rows(self):
+        index = TimeIndex.load(self.path, ["datetime"], stride=1000)
+        times = pd.date_range("2020-01-01", periods=5000, freq="10s")
+        for row in [0, 1, 999, 1000, 2500, 4999]:
+            with self.subTest(row=row):
+                skipped = index.skipped_rows(times[row])
+                self.assertLessEqual(skipped, row)
+                start, _ = index.window(times[row])
+                df = pd.read_csv(TimeIndex.slice(index, self.path, times[row]))
+                self.assertEqual(df["depth"].iloc[0], skipped * 0.1)
+                self.assertEqual(start > index.preamble_end, skipped > 0)
+
+
+    def test_saved_sidecar(self):
+        index = TimeIndex.load(self.path, ["datetime"], stride=1000)
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ["data.csv", "data.csv" + sidecar_suffix])
+        loaded = TimeIndex.read(self.path, index.source)
+        self.assertEqual(loaded.offsets.tolist(), index.offsets.tolist())
+        self.assertEqual(loaded.rows, index.rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.collections
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matdat.plot.factor import factor_cache
+import matdat.plot as plot
+
+
+def violin_keys():
+    return [k for _, entries in factor_cache.entries.values()
+            for k in entries.keys() if k[0] == "violin"]
+
+
+class ViolinCacheTestSuite(unittest.TestCase):
+    """Densities of violins are cached only for literal selectors."""
+
+    def setUp(self):
+        factor_cache.clear()
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            "site": rng.choice(["a", "b"], 500),
+            "depth": rng.standard_normal(500)
+        })
+        self.fig, self.ax = plt.subplots()
+
+    def tearDown(self):
+        plt.close(self.fig)
+        factor_cache.clear()
+
+    def draw(self, df, **option):
+        plot.factor_violin()(df, {"x": "site", "y": "depth", **option})(self.ax)
+
+    def test_cached_for_the_same_table(self):
+        self.draw(self.df)
+        self.assertEqual(len(violin_keys()), 2)
+        self.draw(self.df)
+        self.assertEqual(len(violin_keys()), 2)
+
+        # An equal table created again is a different table.
+        copied = self.df.copy()
+        self.draw(copied)
+        self.assertEqual(len(violin_keys()), 4)
+
+    def test_callable_selectors_are_not_cached(self):
+        self.draw(self.df, x=lambda df: df["site"])
+        self.draw(self.df, y=lambda df: df["depth"] * 2)
+        self.draw(self.df, xfactor=lambda d: (d, ["b", "a"]))
+        self.draw(self.df, bw_method=lambda kde: 0.5)
+        self.assertEqual(violin_keys(), [])
+
+    def test_callable_y_is_estimated_for_its_values(self):
+        self.draw(self.df)
+        self.draw(self.df, y=lambda df: df["depth"] * 10)
+        bodies = [c for c in self.ax.collections
+                  if isinstance(c, matplotlib.collections.PolyCollection)]
+        heights = [np.ptp(b.get_paths()[0].vertices[:, 1]) for b in bodies]
+        self.assertTrue(all(h < 10 for h in heights[:2]))
+        self.assertTrue(all(h > 20 for h in heights[2:]))
+
+    def test_xfactor_is_part_of_key(self):
+        self.draw(self.df)
+        self.draw(self.df, xfactor=["b", "a"])
+        self.assertEqual(
+            {k[3] for k in violin_keys()}, {None, ("list", ("b", "a"))})
+
+
+if __name__ == '__main__':
+    unittest.main()